@@ -0,0 +1 @@
+# benchmarks/__init__.py - Performance benchmarks, run with `python -m benchmarks.<name>`
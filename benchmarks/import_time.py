@@ -0,0 +1,80 @@
+# benchmarks/import_time.py - Import-time profile of the app's cold start, checked against a budget
+"""
+Imports what streamlit_app.py needs before a page runs (plus the landing
+or apply page) in a fresh interpreter with `-X importtime`. Reports total
+time and the slowest modules, and fails if a scenario is over its budget
+in import_budget.json or pulls in a module that should only load on demand.
+
+Usage: python -m benchmarks.import_time [--scenario cold_start] [--top 15] [--repeat 3]
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_FILE = Path(__file__).with_name("import_budget.json")
+REPO_ROOT = Path(__file__).resolve().parent.parent
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def profile_imports(modules):
+    """Run a fresh interpreter and return [(module, self_us, cumulative_us, depth)]"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def check_scenario(name, scenario, top, repeat):
+    """Profile one scenario and return a list of budget violations"""
+    # Take the fastest run; the first one also pays for cold disk caches
+    runs = [profile_imports(scenario["modules"]) for _ in range(repeat)]
+    rows = min(runs, key=lambda r: sum(c for _, _, c, depth in r if depth == 0))
+    total_ms = sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1000
+    loaded = {module for module, _, _, _ in rows}
+
+    print(f"\n[{name}] {', '.join(scenario['modules'])}")
+    print(f"total import time: {total_ms:.0f} ms (budget {scenario['budget_ms']} ms), {len(loaded)} modules")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for module, self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {module}")
+
+    violations = []
+    if total_ms > scenario["budget_ms"]:
+        violations.append(f"{name}: {total_ms:.0f} ms exceeds budget of {scenario['budget_ms']} ms")
+    for module in scenario.get("forbidden", []):
+        if module in loaded:
+            violations.append(f"{name}: imports {module} on the cold path")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenario', action='append', help="scenario name from import_budget.json (default: all)")
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    budgets = json.loads(BUDGET_FILE.read_text())
+    violations = []
+    for name in args.scenario or list(budgets):
+        violations += check_scenario(name, budgets[name], args.top, args.repeat)
+
+    if violations:
+        print("\nFAILED:\n  " + "\n  ".join(violations))
+        sys.exit(1)
+    print("\nAll scenarios within budget.")
+
+
+if __name__ == '__main__':
+    main()
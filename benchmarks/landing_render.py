@@ -0,0 +1,70 @@
+# benchmarks/landing_render.py - Cold vs warm renders of the public landing page
+"""
+Renders the landing page (stylesheet plus public_home_page) through
+Streamlit's AppTest. The first run starts with empty caches, and the
+following runs reuse the cached stylesheet, fragments and partner cards.
+
+The partner organization lookup is replaced by a fixed list with a sleep
+that stands in for the database round trip, so the numbers do not depend
+on network access.
+
+Usage: python -m benchmarks.landing_render [--runs 20] [--db-latency-ms 80]
+"""
+
+import argparse
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+
+def landing_app(db_latency):
+    import time
+    import streamlit as st
+    from interfaces.public import landing
+    from utils.assets import inject_stylesheet
+
+    def active_partner_organizations():
+        time.sleep(db_latency)
+        st.session_state["partner_lookups"] = st.session_state.get("partner_lookups", 0) + 1
+        return ["DataCamp", "Coursera", "Udacity", "edX"]
+
+    landing.get_active_partner_organizations = active_partner_organizations
+    inject_stylesheet()
+    landing.public_home_page()
+
+
+def timed_run(app_test):
+    start = time.perf_counter()
+    app_test.run(timeout=60)
+    if app_test.exception:
+        raise RuntimeError(app_test.exception[0].message)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20, help="warm runs after the cold one")
+    parser.add_argument('--db-latency-ms', type=float, default=80)
+    args = parser.parse_args()
+
+    import streamlit as st
+    from utils.assets import load_stylesheet
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    app_test = AppTest.from_function(landing_app, args=(args.db_latency_ms / 1000,))
+    cold = timed_run(app_test)
+    warm = [timed_run(app_test) for _ in range(args.runs)]
+
+    stylesheet = load_stylesheet()
+    print(f"cold render:        {cold * 1000:8.1f} ms")
+    print(f"warm render median: {statistics.median(warm) * 1000:8.1f} ms")
+    print(f"warm render max:    {max(warm) * 1000:8.1f} ms")
+    print(f"partner lookups:    {app_test.session_state['partner_lookups']} over {args.runs + 1} renders")
+    print(f"stylesheet tag:     {len(stylesheet['tag'].encode()) / 1024:8.1f} KB "
+          f"(source {stylesheet['source_size'] / 1024:.1f} KB, hash {stylesheet['hash']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+# benchmarks/load_test.py - Concurrent-session load test with simulated admins, scholars and applicants
+"""
+Simulates N concurrent users against one app instance and reports how
+rerun latency, throughput and backend call rate change as N grows.
+
+Every virtual user is an AppTest session running on its own thread in this
+process. That matches a deployed instance: Streamlit runs each session's
+script on its own thread, all of them share one interpreter (and its GIL)
+and one init_connection client. The database is the in-memory local
+backend filled by benchmarks.synthetic_data, and email goes to the log
+backend, so approvals never send mail.
+
+Click paths, repeated until the level's duration runs out:
+  admin      dashboard, applications, filter by status, search, clear,
+             open a pending application and approve it
+  scholar    dashboard, load more of the certification feed, profile
+  applicant  log in as an approved applicant and submit the MoA
+
+Each level reports p50/p95/p99 rerun latency, reruns per second and backend
+queries per second. The instance "falls over" at the first level whose p95
+exceeds --slo-ms or whose error rate exceeds --max-error-rate.
+
+Usage: python -m benchmarks.load_test [--levels 1 2 4 8 16 32] [--duration 20]
+           [--mix admin=1 scholar=2 applicant=1] [--size 1k] [--think-ms 0]
+           [--db-latency-ms 0] [--slo-ms 2000] [--output load_results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Load tests never touch the real project or send email; set before the app modules read them
+os.environ["DATABASE_BACKEND"] = "local"
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["EMAIL_BACKEND"] = "log"
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.page_bench import ORG_COUNT, BackendMeter, pick_logins
+from benchmarks.synthetic_data import SIZES, load_into_local_client, parse_size
+
+PERSONAS = ("admin", "scholar", "applicant")
+RUN_TIMEOUT = 120
+
+
+def session_app(login):
+    import streamlit as st
+    import interfaces as pg
+    from utils.auth import authenticate_user, init_auth_state, resolve_auth_context, unified_scholar_login
+
+    init_auth_state()
+    if login and not st.session_state.get("user_data"):
+        if login["role"] == "admin":
+            authenticate_user(login["email"], login["password"])
+        else:
+            unified_scholar_login(login["id"], login["email"], login["birthdate"])
+    resolve_auth_context()
+    # The page a virtual user is on is set from outside, the way navigation would
+    getattr(pg, st.session_state["load_test_page"])()
+
+
+def share_runtime():
+    """
+    Give every AppTest session the same runtime, as sessions on one server share it.
+
+    AppTest installs a fresh mock Runtime for each run and clears it when the
+    run ends, which breaks any other session still running. Its module gets a
+    stand-in class to write to instead, and the real one is set once here.
+    """
+    from unittest.mock import MagicMock
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1 import app_test
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    app_test.Runtime = type("Runtime", (), {"_instance": None})
+    # Each run also patches this option on and back off; keep it on for runs that overlap
+    config.set_option("global.appTest", True)
+
+
+class WorkPool:
+    """Records a write action consumes, shared by every virtual user so none is used twice"""
+
+    def __init__(self, items):
+        self._items = list(items)
+        self._lock = threading.Lock()
+
+    def claim(self):
+        with self._lock:
+            return self._items.pop() if self._items else None
+
+    def __len__(self):
+        return len(self._items)
+
+
+class Recorder:
+    """Samples of one load level as (persona, step, milliseconds, error or None)"""
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def add(self, persona, step, ms, error=None):
+        with self._lock:
+            self.samples.append((persona, step, ms, error))
+
+
+class Session:
+    """One virtual user's browser tab: an AppTest session whose reruns are timed"""
+
+    def __init__(self, persona, login, recorder, think):
+        self.persona = persona
+        self.recorder = recorder
+        self.think = think
+        self.app_test = AppTest.from_function(session_app, args=(login,), default_timeout=RUN_TIMEOUT)
+
+    def step(self, name, action=None, page=None):
+        """Run one rerun (a navigation or a widget interaction); False if it failed"""
+        at = self.app_test
+        if page:
+            at.session_state["load_test_page"] = page
+        error = None
+        start = time.perf_counter()
+        try:
+            action(at) if action else at.run()
+            if at.exception:
+                error = at.exception[0].message
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.recorder.add(self.persona, name, (time.perf_counter() - start) * 1000, error)
+        if self.think:
+            time.sleep(self.think)
+        return error is None
+
+
+def _widget(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def admin_path(session, pools):
+    if not (session.step("dashboard", page="admin_dashboard_page")
+            and session.step("applications", page="admin_applications_page")):
+        return False
+    session.step("filter", lambda at: _widget(at.selectbox, "Filter by Status").set_value("All").run())
+    session.step("search", lambda at: _widget(at.text_input, "Search").input("an").run())
+
+    def clear(at):
+        _widget(at.text_input, "Search").input("")
+        _widget(at.selectbox, "Filter by Status").set_value("PENDING").run()
+    session.step("clear filters", clear)
+
+    application_id = pools["pending"].claim()
+    if application_id:
+        # Stands in for selecting the row: AppTest cannot click dataframe selections
+        session.app_test.session_state["open_application_details"] = {application_id: None}
+        if session.step("open details"):
+            session.step("approve", lambda at: at.button(key=f"approve_{application_id}").click().run())
+            # AppTest keeps the closed panel's widgets after the approval's st.rerun(); reload the tab
+            return False
+    return True
+
+
+def scholar_path(session, pools):
+    if not session.step("dashboard", page="scholar_dashboard_page"):
+        return False
+    more = [button for button in session.app_test.button if button.key == "cert_feed_more"]
+    if more:
+        session.step("load more", lambda at: more[0].click().run())
+    return session.step("profile", page="scholar_profile_page")
+
+
+def applicant_path(session, pools):
+    if not session.step("dashboard", page="scholar_dashboard_page"):
+        return False
+
+    def submit(at):
+        for checkbox in at.checkbox:
+            checkbox.check()
+        _widget(at.text_input, "Digital Signature (Type your full name)").input("Load Test Applicant")
+        _widget(at.button, "Submit MoA").click().run()
+    if any(button.label == "Submit MoA" for button in session.app_test.button):
+        return session.step("submit moa", submit)
+    return True
+
+
+# Each path returns False when its session cannot be reused (after an error or an approval)
+PATHS = {"admin": admin_path, "scholar": scholar_path, "applicant": applicant_path}
+
+
+def build_pools(client, org_id):
+    """Pending applications of the admin's org and approved applicants still without an MoA"""
+    pending = client.table("applications").select("application_id").eq(
+        "partner_org_id", org_id).eq("status", "PENDING").execute().data
+    approved = client.table("approved_applicants").select(
+        "approved_applicant_id, applications!inner(email, birthdate), moa_submissions(moa_id)"
+    ).execute().data
+    scholars = {row["approved_applicant_id"] for row in client.table("scholars").select("approved_applicant_id").execute().data}
+    applicants = [
+        {"role": "approved_applicant", "id": row["approved_applicant_id"],
+         "email": row["applications"]["email"], "birthdate": row["applications"]["birthdate"]}
+        for row in approved
+        if not row["moa_submissions"] and row["approved_applicant_id"] not in scholars
+    ]
+    return {"pending": WorkPool(row["application_id"] for row in pending), "applicants": WorkPool(applicants)}
+
+
+def virtual_user(persona, logins, pools, recorder, deadline, think):
+    """Repeat the persona's click path until the deadline, opening a new session when one is spent"""
+    session = None
+    while time.perf_counter() < deadline:
+        if persona == "applicant":
+            # Each applicant submits once; once none are left, the last one keeps checking the dashboard
+            login = pools["applicants"].claim()
+            if login:
+                session = Session(persona, login, recorder, think)
+            elif session is None:
+                break
+        elif session is None:
+            session = Session(persona, logins[persona], recorder, think)
+        if not PATHS[persona](session, pools):
+            session = None
+
+
+def warm_up(logins, pools):
+    """One unrecorded pass of every path, so the first level does not measure cold caches"""
+    for persona in PERSONAS:
+        login = pools["applicants"].claim() if persona == "applicant" else logins[persona]
+        if login:
+            PATHS[persona](Session(persona, login, Recorder(), 0), pools)
+
+
+def personas_for(users, mix):
+    """Spread `users` over personas in proportion to the mix weights"""
+    weighted = [persona for persona in PERSONAS for _ in range(mix.get(persona, 0))]
+    return [weighted[i % len(weighted)] for i in range(users)]
+
+
+def percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def summarize(samples, elapsed, queries):
+    latencies = [ms for _, _, ms, _ in samples]
+    errors = [error for _, _, _, error in samples if error]
+    by_step = defaultdict(list)
+    for persona, step, ms, _ in samples:
+        by_step[f"{persona} {step}"].append(ms)
+    return {
+        "reruns": len(samples),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(samples), 4) if samples else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "reruns_per_s": round(len(samples) / elapsed, 2),
+        "queries_per_s": round(queries / elapsed, 1),
+        "steps_p95_ms": {name: round(percentile(values, 95), 1) for name, values in sorted(by_step.items())},
+        "first_errors": sorted(set(errors))[:5],
+    }
+
+
+def run_level(users, mix, logins, pools, duration, think):
+    from utils.instrumentation import count_queries
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    deadline = start + duration
+    threads = [
+        threading.Thread(target=virtual_user, args=(persona, logins, pools, recorder, deadline, think), daemon=True)
+        for persona in personas_for(users, mix)
+    ]
+    with count_queries() as counter:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return summarize(recorder.samples, time.perf_counter() - start, counter.count)
+
+
+def find_breaking_point(results, slo_ms, max_error_rate):
+    """First level whose p95 or error rate is out of bounds, and the level with the best throughput"""
+    breaking = next(
+        (level for level in results if level["p95_ms"] > slo_ms or level["error_rate"] > max_error_rate), None
+    )
+    peak = max(results, key=lambda level: level["reruns_per_s"])
+    return breaking, peak
+
+
+def parse_mix(values):
+    mix = {}
+    for value in values:
+        persona, _, weight = value.partition("=")
+        if persona not in PERSONAS or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"expected persona=weight with persona in {PERSONAS}, got {value}")
+        mix[persona] = int(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--levels', nargs='+', type=int, default=[1, 2, 4, 8, 16, 32], help="concurrent sessions")
+    parser.add_argument('--duration', type=float, default=20, help="seconds per level")
+    parser.add_argument('--mix', nargs='+', default=["admin=1", "scholar=2", "applicant=1"])
+    parser.add_argument('--size', default="1k", help=f"applications per org: {', '.join(SIZES)} or a number")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--think-ms', type=float, default=0, help="pause after every rerun")
+    parser.add_argument('--db-latency-ms', type=float, default=0, help="simulated round trip per query")
+    parser.add_argument('--slo-ms', type=float, default=2000, help="p95 rerun latency a level must stay under")
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--output', help="write results JSON here")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    import streamlit as st
+    from services.email_service import email_backend
+    from utils.db import init_connection
+
+    if email_backend() != "log":
+        sys.exit("The [email] backend in secrets is not 'log'; refusing to run approvals that would send mail.")
+
+    share_runtime()
+    BackendMeter(args.db_latency_ms / 1000).install()
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    client = init_connection()
+    load_into_local_client(client, parse_size(args.size), ORG_COUNT, args.seed)
+    logins = pick_logins(client)
+    logins["scholar"]["id"] = logins["scholar"]["scholar_id"]
+    org_id = client.table("admins").select("partner_org_id").eq(
+        "email", logins["admin"]["email"]).execute().data[0]["partner_org_id"]
+    pools = build_pools(client, org_id)
+    print(f"{len(pools['pending'])} pending applications and {len(pools['applicants'])} MoA-less applicants to work through")
+
+    warm_up(logins, pools)
+
+    print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'reruns/s':>9} {'queries/s':>10}")
+    results = []
+    for users in args.levels:
+        level = {"sessions": users, **run_level(users, mix, logins, pools, args.duration, args.think_ms / 1000)}
+        results.append(level)
+        print(f"{users:>8} {level['reruns']:>7} {level['errors']:>6} {level['p50_ms']:>8.1f} {level['p95_ms']:>8.1f} "
+              f"{level['p99_ms']:>8.1f} {level['reruns_per_s']:>9.2f} {level['queries_per_s']:>10.1f}")
+
+    breaking, peak = find_breaking_point(results, args.slo_ms, args.max_error_rate)
+    print(f"\nThroughput peaks at {peak['sessions']} sessions ({peak['reruns_per_s']} reruns/s).")
+    if breaking:
+        reasons = []
+        if breaking["p95_ms"] > args.slo_ms:
+            reasons.append(f"p95 {breaking['p95_ms']} ms > {args.slo_ms:g} ms")
+        if breaking["error_rate"] > args.max_error_rate:
+            reasons.append(f"error rate {breaking['error_rate']:.1%}")
+        print(f"Falls over at {breaking['sessions']} sessions: {', '.join(reasons)}.")
+        for error in breaking["first_errors"]:
+            print(f"  {error}")
+    else:
+        print(f"Within the SLO at every level up to {args.levels[-1]} sessions.")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"args": vars(args), "levels": results}, indent=2) + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+# benchmarks/page_bench.py - Per-page render benchmark on synthetic datasets, checked against a baseline
+"""
+Renders the main admin, scholar and public pages through Streamlit's
+AppTest. The database is the in-memory local backend, filled with
+benchmarks.synthetic_data at each requested size.
+
+Each page is measured as a first run (empty data caches, fresh session)
+and as warm reruns. The script records wall time, backend calls, response
+bytes (the JSON size PostgREST would send) and peak Python memory. Memory
+comes from one extra tracemalloc run, so it does not slow the timed ones.
+
+Results are written as JSON and compared with page_baseline.json. The
+script fails if calls or bytes grow, or if time or memory grow past their
+tolerances.
+
+Usage: python -m benchmarks.page_bench [--sizes 1k 50k] [--pages admin_dashboard_page ...]
+           [--reruns 3] [--db-latency-ms 0] [--output page_results.json]
+           [--baseline benchmarks/page_baseline.json] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+# Benchmarks never touch the real project; both must be set before the app modules read them
+os.environ["DATABASE_BACKEND"] = "local"
+os.environ["STORAGE_BACKEND"] = "local"
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic_data import SIZES, load_into_local_client, parse_size
+
+BASELINE_FILE = Path(__file__).with_name("page_baseline.json")
+ORG_COUNT = 2
+
+# page -> who is logged in while it renders
+PAGES = {
+    "admin_dashboard_page": "admin",
+    "admin_applications_page": "admin",
+    "admin_scholars_page": "admin",
+    "admin_moa_page": "admin",
+    "scholar_dashboard_page": "scholar",
+    "public_applications_page": None,
+}
+
+# Allowed growth over the baseline before a metric counts as a regression
+TOLERANCES = {"calls": 0.0, "bytes": 0.05, "peak_kb": 0.25, "first_ms": 0.5, "rerun_ms": 0.5}
+# ...and absolute slack, so millisecond-scale pages do not fail on timer noise
+SLACK = {"peak_kb": 256, "first_ms": 50, "rerun_ms": 50}
+
+
+class BackendMeter:
+    """Counts executed queries and their JSON response size; optionally adds a fixed latency"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def install(self):
+        from utils.local_backend import LocalQuery
+
+        execute = LocalQuery.execute
+        meter = self
+
+        def metered_execute(query):
+            if meter.latency:
+                time.sleep(meter.latency)
+            response = execute(query)
+            size = len(json.dumps(response.data, default=str))
+            with meter._lock:
+                meter.calls += 1
+                meter.bytes += size
+            return response
+
+        LocalQuery.execute = metered_execute
+
+    def snapshot(self):
+        with self._lock:
+            return self.calls, self.bytes
+
+
+def page_app(page_name, login):
+    import streamlit as st
+    import interfaces as pg
+    from utils.auth import authenticate_user, init_auth_state, resolve_auth_context, scholar_login_auth
+
+    init_auth_state()
+    if login and not st.session_state.get("user_data"):
+        if login["role"] == "admin":
+            authenticate_user(login["email"], login["password"])
+        else:
+            scholar_login_auth(login["scholar_id"], login["email"], login["birthdate"])
+    resolve_auth_context()
+    getattr(pg, page_name)()
+
+
+def pick_logins(client):
+    """An admin of the first org and its scholar with the most certifications"""
+    from utils.local_backend import LOCAL_PASSWORD
+
+    org = client.table("partner_organizations").select("partner_org_id").order("display_name").limit(1).execute().data[0]
+    admin = client.table("admins").select("email").eq("partner_org_id", org["partner_org_id"]).limit(1).execute().data[0]
+    scholars = client.table("scholars").select(
+        "scholar_id, applications(email, birthdate), certifications(certification_id)"
+    ).eq("partner_org_id", org["partner_org_id"]).eq("is_active", True).execute().data
+    scholar = max(scholars, key=lambda s: len(s["certifications"]))
+    return {
+        "admin": {"role": "admin", "email": admin["email"], "password": LOCAL_PASSWORD},
+        "scholar": {
+            "role": "scholar",
+            "scholar_id": scholar["scholar_id"],
+            "email": scholar["applications"]["email"],
+            "birthdate": scholar["applications"]["birthdate"],
+        },
+    }
+
+
+def run_once(app_test, meter):
+    """(milliseconds, backend calls, response bytes) for one run"""
+    calls, size = meter.snapshot()
+    start = time.perf_counter()
+    app_test.run(timeout=300)
+    elapsed = time.perf_counter() - start
+    if app_test.exception:
+        raise RuntimeError(app_test.exception[0].message)
+    end_calls, end_size = meter.snapshot()
+    return elapsed * 1000, end_calls - calls, end_size - size
+
+
+def bench_page(page_name, login, meter, reruns):
+    import streamlit as st
+
+    st.cache_data.clear()
+    app_test = AppTest.from_function(page_app, args=(page_name, login))
+    first_ms, first_calls, first_bytes = run_once(app_test, meter)
+    warm = [run_once(app_test, meter) for _ in range(reruns)]
+
+    # Peak memory of a warm rerun, measured separately because tracing slows everything down
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        app_test.run(timeout=300)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "first_ms": round(first_ms, 1),
+        "first_calls": first_calls,
+        "first_bytes": first_bytes,
+        "rerun_ms": round(statistics.median(ms for ms, _, _ in warm), 1),
+        "calls": max(calls for _, calls, _ in warm),
+        "bytes": max(size for _, _, size in warm),
+        "peak_kb": round(peak / 1024),
+    }
+
+
+def bench_size(size_name, pages, meter, reruns, seed):
+    import streamlit as st
+    from utils.db import init_connection
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    client = init_connection()
+    load_into_local_client(client, parse_size(size_name), ORG_COUNT, seed)
+    logins = pick_logins(client)
+
+    results = {}
+    for page_name in pages:
+        role = PAGES[page_name]
+        results[page_name] = bench_page(page_name, logins.get(role), meter, reruns)
+        r = results[page_name]
+        print(f"{size_name:>5} {page_name:26s} {r['first_ms']:>9.1f} {r['rerun_ms']:>9.1f} "
+              f"{r['calls']:>6} {r['bytes'] / 1024:>10.1f} {r['peak_kb']:>9}")
+    return results
+
+
+def compare(results, baseline):
+    """Regressions of results against the baseline, as readable strings"""
+    regressions = []
+    for size_name, pages in results.items():
+        for page_name, metrics in pages.items():
+            reference = baseline.get(size_name, {}).get(page_name)
+            if not reference:
+                continue
+            for metric, tolerance in TOLERANCES.items():
+                allowed = max(reference[metric] * (1 + tolerance), reference[metric] + SLACK.get(metric, 0))
+                if metrics[metric] > allowed:
+                    regressions.append(
+                        f"{size_name} {page_name} {metric}: {metrics[metric]} vs baseline {reference[metric]} "
+                        f"(allowed {allowed:.1f})"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=["1k", "50k"], help=f"{', '.join(SIZES)} or a number")
+    parser.add_argument('--pages', nargs='+', choices=list(PAGES), default=list(PAGES))
+    parser.add_argument('--reruns', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db-latency-ms', type=float, default=0, help="simulated round trip per query")
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE)
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    meter = BackendMeter(args.db_latency_ms / 1000)
+    meter.install()
+
+    print(f"{'size':>5} {'page':26s} {'first ms':>9} {'rerun ms':>9} {'calls':>6} {'KB':>10} {'peak KB':>9}")
+    results = {size_name: bench_size(size_name, args.pages, meter, args.reruns, args.seed) for size_name in args.sizes}
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        for size_name, pages in results.items():
+            baseline.setdefault(size_name, {}).update(pages)
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\nBaseline updated: {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one.")
+        return
+    regressions = compare(results, json.loads(args.baseline.read_text()))
+    if regressions:
+        print("\nREGRESSIONS:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("\nAll pages within baseline.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+# benchmarks/query_budget.py - Backend round trips per query function and per page, checked against budgets
+"""
+Counts backend round trips (executed queries) for the public functions in
+utils.queries and for the main pages. The database is the in-memory local
+backend, filled by benchmarks.synthetic_data at the size set in
+query_budget.json. That size is large enough that a query issued per row
+or per batch shows up as a blown budget.
+
+Every function and page has a declared budget in query_budget.json. Over
+budget, the call sites responsible are listed with how often each one ran.
+Functions that send email (approve_application, approve_moa_submission)
+are not exercised.
+
+Usage: python -m benchmarks.query_budget [--only save_application_to_database ...] [--update-budgets]
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.page_bench import PAGES, page_app, pick_logins
+from benchmarks.synthetic_data import application_form, load_into_local_client
+
+BUDGET_FILE = Path(__file__).with_name("query_budget.json")
+
+
+def build_context(client):
+    """IDs and logins the scenarios need, taken from the first organization"""
+    org = client.table("partner_organizations").select("partner_org_id, display_name").limit(1).execute().data[0]
+    admin = client.table("admins").select("admin_id").eq("partner_org_id", org["partner_org_id"]).limit(1).execute().data[0]
+    pending = client.table("applications").select("application_id").eq(
+        "partner_org_id", org["partner_org_id"]
+    ).eq("status", "PENDING").limit(30).execute().data
+    approved = client.table("approved_applicants").select(
+        "approved_applicant_id, applications!inner(email, birthdate, partner_org_id)"
+    ).eq("applications.partner_org_id", org["partner_org_id"]).limit(1).execute().data[0]
+    logins = pick_logins(client)
+    return {
+        "org_id": org["partner_org_id"],
+        "org_name": org["display_name"],
+        "admin_id": admin["admin_id"],
+        "pending_ids": [row["application_id"] for row in pending],
+        "approved": approved,
+        "scholar": logins["scholar"],
+        "logins": logins,
+    }
+
+
+def _drain(pages):
+    for _ in pages:
+        pass
+
+
+def function_scenarios():
+    """name -> callable(ctx) running one query function the way the pages do"""
+    from utils import queries
+
+    form_data = application_form(random.Random(0), "", 0, datetime.now(timezone.utc))
+
+    def save_application(ctx):
+        form_data["Partner Organization & Data Privacy"]["partner_org"] = ctx["org_name"]
+        assert queries.save_application_to_database(form_data)
+
+    def submit_certification(ctx):
+        assert queries.create_certification(ctx["scholar"]["scholar_id"], {
+            "name": "Budget Check", "issuing_organization": "DataCamp", "issue_month": 1, "issue_year": 2026
+        })
+
+    return {
+        "get_active_partner_organizations": lambda ctx: queries.get_active_partner_organizations(),
+        "save_application_to_database": save_application,
+        "get_applications_for_admin": lambda ctx: queries.get_applications_for_admin(ctx["org_id"]),
+        "get_application_details": lambda ctx: queries.get_application_details(ctx["pending_ids"][0]),
+        "reject_application": lambda ctx: queries.reject_application(ctx["pending_ids"][1], ctx["admin_id"], "budget"),
+        "update_application_status": lambda ctx: queries.update_application_status(
+            ctx["pending_ids"][2], "REJECTED", ctx["admin_id"], "budget"),
+        "bulk_update_applications": lambda ctx: queries.bulk_update_applications(
+            ctx["pending_ids"][3:], "REJECTED", ctx["admin_id"], "budget"),
+        "get_admin_dashboard_metrics": lambda ctx: queries.get_admin_dashboard_metrics(ctx["org_id"]),
+        "get_recent_activities": lambda ctx: queries.get_recent_activities(ctx["org_id"]),
+        "get_application_analytics": lambda ctx: queries.get_application_analytics(ctx["org_id"]),
+        "get_partner_organization_stats": lambda ctx: queries.get_partner_organization_stats(ctx["org_id"]),
+        "get_scholars_for_admin": lambda ctx: queries.get_scholars_for_admin(ctx["org_id"]),
+        "get_moa_submissions_for_admin": lambda ctx: queries.get_moa_submissions_for_admin(ctx["org_id"]),
+        "get_scholar_detailed_info": lambda ctx: queries.get_scholar_detailed_info(ctx["scholar"]["scholar_id"]),
+        "get_scholar_profile_bundle": lambda ctx: queries.get_scholar_profile_bundle(ctx["scholar"]["scholar_id"]),
+        "get_scholar_by_credentials": lambda ctx: queries.get_scholar_by_credentials(
+            ctx["scholar"]["scholar_id"], ctx["scholar"]["email"], ctx["scholar"]["birthdate"]),
+        "get_approved_applicant_by_credentials": lambda ctx: queries.get_approved_applicant_by_credentials(
+            ctx["approved"]["approved_applicant_id"], ctx["approved"]["applications"]["email"],
+            ctx["approved"]["applications"]["birthdate"]),
+        "generate_approved_applicant_id": lambda ctx: queries.generate_approved_applicant_id(),
+        "generate_scholar_id": lambda ctx: queries.generate_scholar_id(),
+        "create_certification": submit_certification,
+        "iter_applications_for_export": lambda ctx: _drain(queries.iter_applications_for_export(ctx["org_id"])),
+        "iter_scholars_for_export": lambda ctx: _drain(queries.iter_scholars_for_export(ctx["org_id"])),
+        "iter_moa_submissions_for_export": lambda ctx: _drain(queries.iter_moa_submissions_for_export(ctx["org_id"])),
+    }
+
+
+def measure_function(scenario, ctx):
+    import streamlit as st
+    from utils.instrumentation import count_queries
+
+    st.cache_data.clear()
+    with count_queries() as counter:
+        scenario(ctx)
+    return counter
+
+
+def measure_page(page_name, ctx):
+    """Round trips of a page render with empty data caches, after a first run that logs in"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    from utils.instrumentation import count_queries
+
+    app_test = AppTest.from_function(page_app, args=(page_name, ctx["logins"].get(PAGES[page_name])))
+    app_test.run(timeout=300)
+    st.cache_data.clear()
+    with count_queries() as counter:
+        app_test.run(timeout=300)
+    if app_test.exception:
+        raise RuntimeError(app_test.exception[0].message)
+    return counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', nargs='+', help="function or page names (default: all)")
+    parser.add_argument('--top', type=int, default=10, help="call sites listed per violation")
+    parser.add_argument('--update-budgets', action='store_true', help="store the measured counts as budgets")
+    args = parser.parse_args()
+
+    import streamlit as st
+    from utils.db import init_connection
+
+    budgets = json.loads(BUDGET_FILE.read_text())
+    dataset = budgets["dataset"]
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    client = init_connection()
+    load_into_local_client(client, dataset["applications_per_org"], dataset["orgs"], dataset["seed"])
+    ctx = build_context(client)
+
+    measurements = {}
+    for name, scenario in function_scenarios().items():
+        if not args.only or name in args.only:
+            measurements[("functions", name)] = measure_function(scenario, ctx)
+    for page_name in PAGES:
+        if not args.only or page_name in args.only:
+            measurements[("pages", page_name)] = measure_page(page_name, ctx)
+
+    violations = []
+    print(f"{'kind':9} {'name':38} {'queries':>7} {'budget':>6}")
+    for (kind, name), counter in measurements.items():
+        budget = budgets[kind].get(name)
+        print(f"{kind:9} {name:38} {counter.count:>7} {budget if budget is not None else '-':>6}")
+        if args.update_budgets:
+            budgets[kind][name] = counter.count
+        elif budget is None:
+            violations.append(f"{kind} {name}: no budget declared in {BUDGET_FILE.name}")
+        elif counter.count > budget:
+            violations.append(f"{kind} {name}: {counter.count} queries, budget {budget}\n{counter.report(args.top)}")
+
+    if args.update_budgets:
+        BUDGET_FILE.write_text(json.dumps(budgets, indent=2) + "\n")
+        print(f"\nBudgets updated: {BUDGET_FILE}")
+        return
+    if violations:
+        print("\nFAILED:\n" + "\n".join(violations))
+        sys.exit(1)
+    print("\nAll functions and pages within budget.")
+
+
+if __name__ == '__main__':
+    main()
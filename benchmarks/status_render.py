@@ -0,0 +1,85 @@
+# benchmarks/status_render.py - Compare Styler status colouring with categorical badges
+"""
+Times how long it takes to turn an admin table into the Arrow payload that
+st.dataframe sends to the browser, for the old per-cell Styler colouring and
+for the categorical badge column.
+
+Usage: python -m benchmarks.status_render [--rows 10000 50000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from streamlit.elements.arrow import marshall
+from streamlit.proto.Arrow_pb2 import Arrow as ArrowProto
+
+from interfaces.admin.moa_view import MOA_STATUS_BADGES
+from utils.table_utils import status_badge_series
+
+LEGACY_COLORS = {
+    'PENDING': 'background-color: #fff3cd',
+    'SUBMITTED': 'background-color: #d1ecf1',
+    'APPROVED': 'background-color: #d4edda'
+}
+
+
+def make_table(rows):
+    """Build a MoA-shaped table with a random status column"""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'ID': [f"{i:08x}" for i in range(rows)],
+        'Scholar Name': [f"Scholar {i}" for i in range(rows)],
+        'Email': [f"scholar{i}@example.com" for i in range(rows)],
+        'Partner': rng.choice(['DataCamp', 'Coursera', 'Udemy'], rows),
+        'Status': rng.choice(list(LEGACY_COLORS), rows),
+        'Submitted': '2024-01-01 10:00'
+    })
+
+
+def render_styler(df):
+    """Old path: Styler.applymap, serialized through Streamlit's Arrow marshaller"""
+    # Styler refuses tables above 262144 cells by default, which a 50k-row admin table exceeds
+    pd.set_option('styler.render.max_elements', df.size)
+    styled = df.style.map(lambda val: LEGACY_COLORS.get(val, ''), subset=['Status'])
+    proto = ArrowProto()
+    marshall(proto, styled, default_uuid="bench")
+    return proto.ByteSize()
+
+
+def render_badges(df):
+    """New path: categorical badge column, serialized through the same marshaller"""
+    display_df = df.copy()
+    display_df['Status'] = status_badge_series(display_df['Status'], MOA_STATUS_BADGES)
+    proto = ArrowProto()
+    marshall(proto, display_df, default_uuid="bench")
+    return proto.ByteSize()
+
+
+def best_of(func, df, repeat):
+    """Return (best seconds, payload bytes) over several runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 50_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'renderer':>8} {'seconds':>9} {'payload KB':>11}")
+    for rows in args.rows:
+        df = make_table(rows)
+        for name, func in (('styler', render_styler), ('badges', render_badges)):
+            seconds, size = best_of(func, df, args.repeat)
+            print(f"{rows:>8} {name:>8} {seconds:>9.3f} {size / 1024:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
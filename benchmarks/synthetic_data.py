@@ -0,0 +1,477 @@
+# benchmarks/synthetic_data.py - Synthetic partner organizations at realistic volume
+"""
+Generates partner organizations, admins, applications (with demographics,
+devices and connectivity), reviews, approved applicants, MoA submissions,
+scholars, certifications and jobs.
+
+Application and scholar rows are built by the same functions the app writes
+with (build_application_record, build_application_detail_records,
+build_scholar_record), so the generated columns match production. Statuses
+depend on application age, countries and answers are weighted, and dates
+skew towards the recent past the way a growing program's do.
+
+Data is produced in batches, so 500k applications per org can be written
+to CSV/Parquet without holding them in memory. Each table is streamed
+through utils.exports.write_export.
+
+Usage: python -m benchmarks.synthetic_data --size 50k [--orgs 2] [--seed 7]
+           [--output local|csv|parquet] [--out-dir synthetic_data]
+
+Run it as a module from the repository root, like the other benchmarks;
+running the file directly cannot import the app's utils package.
+"""
+
+import argparse
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.queries import build_application_detail_records, build_application_record, build_scholar_record
+
+SIZES = {"1k": 1_000, "50k": 50_000, "500k": 500_000}
+BATCH_SIZE = 5_000
+HISTORY_DAYS = 730
+
+Rows = Dict[str, List[Dict[str, Any]]]
+
+# (value, weight) pools; countries carry (region, city) pairs and institutions
+COUNTRIES = [
+    ("Philippines", 55,
+     [("Metro Manila", "Quezon City"), ("Metro Manila", "Manila"), ("Cebu", "Cebu City"),
+      ("Davao del Sur", "Davao City"), ("Laguna", "Santa Rosa"), ("Iloilo", "Iloilo City")],
+     ["University of the Philippines", "Ateneo de Manila University", "De La Salle University",
+      "University of Santo Tomas"]),
+    ("Indonesia", 10, [("Jakarta", "Jakarta"), ("West Java", "Bandung"), ("East Java", "Surabaya")],
+     ["Universitas Indonesia", "Institut Teknologi Bandung"]),
+    ("Vietnam", 8, [("Hanoi", "Hanoi"), ("Ho Chi Minh City", "Ho Chi Minh City")],
+     ["Vietnam National University", "Hanoi University of Science and Technology"]),
+    ("India", 8, [("Maharashtra", "Mumbai"), ("Karnataka", "Bengaluru"), ("Tamil Nadu", "Chennai")],
+     ["University of Mumbai", "Anna University"]),
+    ("Nigeria", 6, [("Lagos", "Lagos"), ("Oyo", "Ibadan"), ("Kaduna", "Zaria")],
+     ["University of Lagos", "University of Ibadan"]),
+    ("Kenya", 5, [("Nairobi", "Nairobi"), ("Mombasa", "Mombasa")], ["University of Nairobi", "Kenyatta University"]),
+    ("Malaysia", 4, [("Selangor", "Shah Alam"), ("Penang", "George Town")],
+     ["Universiti Malaya", "Universiti Sains Malaysia"]),
+    ("Thailand", 4, [("Bangkok", "Bangkok"), ("Chiang Mai", "Chiang Mai")],
+     ["Chulalongkorn University", "Mahidol University"]),
+]
+GENDERS = [("FEMALE", 49), ("MALE", 48), ("OTHER", 3)]
+EDUCATION_STATUSES = [("CURRENTLY_ENROLLED", 45), ("FRESH_GRADUATE", 20), ("GRADUATE", 25), ("GAP_YEAR", 10)]
+PROGRAMMING_EXPERIENCE = [("NONE", 25), ("BEGINNER", 45), ("INTERMEDIATE", 23), ("ADVANCED", 7)]
+DATA_SCIENCE_EXPERIENCE = [("NONE", 35), ("BASIC", 40), ("INTERMEDIATE", 20), ("ADVANCED", 5)]
+TIME_COMMITMENTS = [("1-2", 10), ("3-5", 35), ("6-10", 35), ("11-15", 12), ("16+", 8)]
+DEMOGRAPHICS = [("STUDENT", 40), ("UNEMPLOYED", 18), ("WORKING_STUDENT", 14), ("UNDEREMPLOYED", 12),
+                ("BELOW_POVERTY", 9), ("DISABLED", 3), ("REFUGEE", 2), ("NONPROFIT_SCIENTIST", 2)]
+DEVICES = [("SMARTPHONE", 50), ("LAPTOP", 40), ("DESKTOP", 10)]
+CONNECTIVITY = [("WIFI", 60), ("MOBILE_DATA", 40)]
+FIRST_NAMES = ["Maria", "Jose", "Ana", "Juan", "Grace", "Mark", "Joy", "Paolo", "Siti", "Budi", "Linh", "Minh",
+               "Priya", "Arjun", "Chinedu", "Amina", "Wanjiru", "Kevin", "Nur", "Somchai"]
+LAST_NAMES = ["Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Wijaya", "Nguyen", "Tran", "Sharma",
+              "Patel", "Okafor", "Adeyemi", "Otieno", "Kamau", "Tan", "Lim", "Abdullah", "Srisai", "Dela Cruz"]
+CERTIFICATIONS = [("Data Analyst Associate", "DataCamp"), ("Data Scientist Associate", "DataCamp"),
+                  ("SQL Associate", "DataCamp"), ("Google Data Analytics", "Coursera"),
+                  ("IBM Data Science", "Coursera"), ("AWS Cloud Practitioner", "Amazon Web Services"),
+                  ("Azure Data Fundamentals", "Microsoft"), ("TensorFlow Developer", "Google")]
+JOB_TITLES = ["Data Analyst", "Junior Data Scientist", "Business Intelligence Analyst", "Data Engineer",
+              "Research Assistant", "Machine Learning Engineer"]
+COMPANIES = ["Accenture", "Globe Telecom", "Shopee", "Grab", "UnionBank", "Thinking Machines", "GCash"]
+
+
+def _pick(rng: random.Random, pool: List[Tuple[Any, int]]) -> Any:
+    return rng.choices([value for value, _ in pool], weights=[weight for _, weight in pool])[0]
+
+
+def _pick_some(rng: random.Random, pool: List[Tuple[str, int]], most: int) -> List[str]:
+    """One to `most` distinct weighted picks, as from a multiselect"""
+    wanted = rng.randint(1, most)
+    picked: List[str] = []
+    while len(picked) < wanted:
+        value = _pick(rng, pool)
+        if value not in picked:
+            picked.append(value)
+    return picked
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _unique_id(rng: random.Random, prefix: str, used: set) -> str:
+    """PREFIX + 8 digits, like the app's generated IDs, never repeating within a dataset"""
+    while True:
+        candidate = f"{prefix}{rng.randint(0, 99_999_999):08d}"
+        if candidate not in used:
+            used.add(candidate)
+            return candidate
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.isoformat()
+
+
+def generate_partner_orgs(count: int, rng: random.Random) -> Rows:
+    """Partner organizations with one admin each"""
+    names = ["DataCamp", "Coursera", "Udacity", "edX"]
+    orgs, admins = [], []
+    for index in range(count):
+        name = names[index] if index < len(names) else f"Partner {index + 1}"
+        org_id = _uuid(rng)
+        orgs.append({"partner_org_id": org_id, "display_name": name, "is_active": True, "is_accepting": True})
+        admins.append({
+            "admin_id": _uuid(rng),
+            "partner_org_id": org_id,
+            "email": f"admin-{name.lower().replace(' ', '-')}@datara.local",
+            "first_name": name,
+            "last_name": "Admin",
+            "is_active": True
+        })
+    return {"partner_organizations": orgs, "admins": admins}
+
+
+def application_form(rng: random.Random, org_name: str, serial: int, now: datetime) -> Dict[str, Any]:
+    """Form data as the application page collects it"""
+    country, _, places, institutions = rng.choices(COUNTRIES, weights=[c[1] for c in COUNTRIES])[0]
+    state, city = rng.choice(places)
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    age_days = int(rng.triangular(18, 40, 22) * 365.25)
+    return {
+        "Partner Organization & Data Privacy": {
+            "partner_org": org_name,
+            "email": f"{first_name}.{last_name}.{serial}@example.org".lower().replace(" ", ""),
+        },
+        "Basic Information": {
+            "first_name": first_name,
+            "middle_name": rng.choice(LAST_NAMES) if rng.random() < 0.6 else None,
+            "last_name": last_name,
+            "birthdate": (now.date() - timedelta(days=age_days)),
+            "gender": _pick(rng, GENDERS),
+        },
+        "Geographic Details": {
+            "country": country,
+            "state": state,
+            "city": city,
+            "postal": rng.randint(1000, 9999),
+        },
+        "Education Details": {
+            "education_status": _pick(rng, EDUCATION_STATUSES),
+            "institution_country": country,
+            "institution_name": rng.choice(institutions),
+        },
+        "Interest Details": {
+            "programming_experience": _pick(rng, PROGRAMMING_EXPERIENCE),
+            "data_science_experience": _pick(rng, DATA_SCIENCE_EXPERIENCE),
+            "time_commitment": _pick(rng, TIME_COMMITMENTS),
+            "why_scholarship": "I want to build a career in data and give back to my community.",
+            "career_goals": "Work as a data analyst within two years.",
+        },
+        "Demographic and Connectivity": {
+            "demographic": _pick_some(rng, DEMOGRAPHICS, 2),
+            "devices": _pick_some(rng, DEVICES, 2),
+            "connectivity": _pick_some(rng, CONNECTIVITY, 2),
+        },
+    }
+
+
+def _status_for_age(rng: random.Random, age_days: float) -> str:
+    """Recent applications are mostly still pending; older ones are mostly decided"""
+    if age_days < 14:
+        return "PENDING" if rng.random() < 0.8 else rng.choice(["APPROVED", "REJECTED"])
+    return _pick(rng, [("PENDING", 8), ("APPROVED", 40), ("REJECTED", 52)])
+
+
+def generate_org_batches(org: Dict[str, Any], admin: Dict[str, Any], applications: int, seed: int,
+                         now: Optional[datetime] = None, batch_size: int = BATCH_SIZE,
+                         used_ids: Optional[set] = None) -> Iterator[Rows]:
+    """Rows for one partner org, `batch_size` applications (and everything hanging off them) at a time"""
+    now = now or datetime.now(timezone.utc)
+    used_ids = set() if used_ids is None else used_ids
+    start = now - timedelta(days=HISTORY_DAYS)
+    serial = 0
+
+    for batch_start in range(0, applications, batch_size):
+        # Seeded by name: org ids are fresh UUIDs in every local backend, and results must be reproducible
+        rng = random.Random(f"{seed}:{org['display_name']}:{batch_start}")
+        rows: Rows = {table: [] for table in (
+            "applications", "application_demographics", "application_devices", "application_connectivity",
+            "application_reviews", "approved_applicants", "moa_submissions", "scholars", "certifications", "jobs"
+        )}
+
+        for _ in range(min(batch_size, applications - batch_start)):
+            serial += 1
+            # Triangular towards now: a growing program gets more applications every month
+            applied_at = start + timedelta(days=rng.triangular(0, HISTORY_DAYS, HISTORY_DAYS))
+            age_days = (now - applied_at).total_seconds() / 86400
+
+            form_data = application_form(rng, org["display_name"], serial, now)
+            application = build_application_record(form_data, org["partner_org_id"])
+            application.update({
+                "application_id": _uuid(rng),
+                "applied_at": _timestamp(applied_at),
+                "status": _status_for_age(rng, age_days),
+            })
+            rows["applications"].append(application)
+            for table, detail_rows in build_application_detail_records(application["application_id"], form_data).items():
+                rows[table].extend(detail_rows)
+
+            if application["status"] == "PENDING":
+                continue
+            reviewed_at = applied_at + timedelta(days=rng.uniform(1, min(10, max(age_days - 0.5, 1))))
+            rows["application_reviews"].append({
+                "review_id": _uuid(rng),
+                "application_id": application["application_id"],
+                "admin_id": admin["admin_id"],
+                "action": application["status"],
+                "action_reason": None,
+                "reviewed_at": _timestamp(reviewed_at),
+            })
+            if application["status"] != "APPROVED":
+                continue
+
+            approved_applicant_id = _unique_id(rng, "APP", used_ids)
+            rows["approved_applicants"].append({
+                "approved_applicant_id": approved_applicant_id,
+                "application_id": application["application_id"],
+                "created_at": _timestamp(reviewed_at),
+            })
+            if rng.random() > 0.85:
+                continue
+
+            submitted_at = min(reviewed_at + timedelta(days=rng.expovariate(1 / 4)), now)
+            moa_age_days = (now - submitted_at).total_seconds() / 86400
+            moa_status = "SUBMITTED" if moa_age_days < 5 else _pick(rng, [("APPROVED", 90), ("REJECTED", 4), ("SUBMITTED", 6)])
+            moa_id = _uuid(rng)
+            rows["moa_submissions"].append({
+                "moa_id": moa_id,
+                "approved_applicant_id": approved_applicant_id,
+                "digital_signature": f"{application['first_name']} {application['last_name']}",
+                "status": moa_status,
+                "submitted_at": _timestamp(submitted_at),
+            })
+            if moa_status != "APPROVED":
+                continue
+
+            scholar = build_scholar_record(
+                _unique_id(rng, "SCH", used_ids), moa_id, application["application_id"], org["partner_org_id"]
+            )
+            scholar_since = min(submitted_at + timedelta(days=rng.uniform(1, 5)), now)
+            scholar.update({"created_at": _timestamp(scholar_since), "is_active": rng.random() < 0.92})
+            rows["scholars"].append(scholar)
+
+            # Most scholars post a few certifications; a handful post many
+            for _ in range(min(int(rng.expovariate(1 / 1.5)), 12)):
+                posted_at = scholar_since + timedelta(seconds=rng.uniform(0, (now - scholar_since).total_seconds()))
+                name, issuer = rng.choice(CERTIFICATIONS)
+                expires = rng.random() < 0.3
+                rows["certifications"].append({
+                    "certification_id": _uuid(rng),
+                    "scholar_id": scholar["scholar_id"],
+                    "name": name,
+                    "issuing_organization": issuer,
+                    "issue_month": posted_at.month,
+                    "issue_year": posted_at.year,
+                    "expiration_month": posted_at.month if expires else None,
+                    "expiration_year": posted_at.year + 2 if expires else None,
+                    "credential_url": f"https://credentials.example.org/{rng.getrandbits(48):012x}",
+                    "created_at": _timestamp(posted_at),
+                })
+
+            if rng.random() < 0.3:
+                rows["jobs"].append({
+                    "job_id": _uuid(rng),
+                    "scholar_id": scholar["scholar_id"],
+                    "job_title": rng.choice(JOB_TITLES),
+                    "company_name": rng.choice(COMPANIES),
+                    "is_published": rng.random() < 0.8,
+                    "created_at": _timestamp(min(scholar_since + timedelta(days=rng.uniform(30, 300)), now)),
+                })
+
+        yield rows
+
+
+def generate_dataset(applications_per_org: int, orgs: Rows, seed: int = 42,
+                     batch_size: int = BATCH_SIZE) -> Iterator[Rows]:
+    """Batches for every org in `orgs` (as returned by generate_partner_orgs)"""
+    admins = {admin["partner_org_id"]: admin for admin in orgs["admins"]}
+    now = datetime.now(timezone.utc)
+    used_ids: set = set()
+    for org in orgs["partner_organizations"]:
+        yield from generate_org_batches(
+            org, admins[org["partner_org_id"]], applications_per_org, seed, now, batch_size, used_ids
+        )
+
+
+def load_into_local_client(client, applications_per_org: int, org_count: int = 1, seed: int = 42) -> Dict[str, int]:
+    """
+    Fill a utils.local_backend client. Seeded partner organizations and admins are
+    reused, so their admin logins keep working.
+    """
+    from utils.local_backend import LOCAL_PASSWORD
+
+    orgs = {
+        "partner_organizations": client.table("partner_organizations").select("*").execute().data[:org_count],
+        "admins": client.table("admins").select("*").execute().data,
+    }
+    missing = org_count - len(orgs["partner_organizations"])
+    if missing > 0:
+        extra = generate_partner_orgs(org_count, random.Random(seed))
+        for table in ("partner_organizations", "admins"):
+            new_rows = extra[table][-missing:]
+            client.db.load_rows(table, new_rows)
+            orgs[table].extend(new_rows)
+        for admin in extra["admins"][-missing:]:
+            client.auth.add_user(admin["email"], LOCAL_PASSWORD)
+
+    counts: Dict[str, int] = {}
+    for batch in generate_dataset(applications_per_org, orgs, seed):
+        for table, rows in batch.items():
+            client.db.load_rows(table, rows)
+            counts[table] = counts.get(table, 0) + len(rows)
+    return counts
+
+
+def _column_types(rows: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Export column types from the values in a batch; columns with no values are strings"""
+    types = {}
+    for column in rows[0]:
+        seen = {type(row.get(column)) for row in rows} - {type(None)}
+        if seen == {bool}:
+            types[column] = "bool"
+        elif seen == {int}:
+            types[column] = "int"
+        elif seen and seen <= {int, float}:
+            types[column] = "float"
+        else:
+            types[column] = "string"
+    return types
+
+
+class _TableWriter:
+    """
+    Streams one table's batches through write_export on its own thread. Column types
+    come from the first batch. If the writer fails, the next write or close raises its error.
+    """
+
+    def __init__(self, path: str, rows: List[Dict[str, Any]], format_type: str):
+        from utils.exports import write_export
+
+        self.pages: "queue.Queue" = queue.Queue(maxsize=2)
+        self.fileobj = open(path, "wb")
+        self.error: Optional[BaseException] = None
+        export_columns = [
+            (column, (lambda row, c=column: row.get(c)), column_type)
+            for column, column_type in _column_types(rows).items()
+        ]
+        self.thread = threading.Thread(
+            target=self._run, args=(write_export, iter(self.pages.get, None), export_columns, format_type)
+        )
+        self.thread.start()
+
+    def _run(self, write_export, pages, export_columns, format_type):
+        try:
+            write_export(pages, export_columns, format_type, self.fileobj)
+        except BaseException as e:
+            self.error = e
+
+    def _put(self, item):
+        # A full queue only drains while the writer runs, so check on it instead of blocking forever
+        while self.thread.is_alive():
+            try:
+                self.pages.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        if self.error is None and item is not None:
+            self.error = RuntimeError(f"Writer for {self.fileobj.name} stopped early")
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise RuntimeError(f"Writing {self.fileobj.name} failed: {self.error}") from self.error
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._raise_error()
+        self._put(rows)
+        self._raise_error()
+
+    def close(self):
+        self._put(None)
+        self.thread.join()
+        self.fileobj.close()
+        self._raise_error()
+
+
+def write_files(out_dir: str, format_type: str, applications_per_org: int, org_count: int = 1,
+                seed: int = 42) -> Dict[str, int]:
+    """Write one CSV or Parquet file per table for bulk loading"""
+    from utils.exports import EXPORT_FORMATS
+
+    os.makedirs(out_dir, exist_ok=True)
+    extension = EXPORT_FORMATS[format_type][1]
+    writers: Dict[str, _TableWriter] = {}
+    counts: Dict[str, int] = {}
+
+    def emit(table: str, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        if table not in writers:
+            writers[table] = _TableWriter(os.path.join(out_dir, f"{table}.{extension}"), rows, format_type)
+        writers[table].write(rows)
+        counts[table] = counts.get(table, 0) + len(rows)
+
+    orgs = generate_partner_orgs(org_count, random.Random(seed))
+    try:
+        for table, rows in orgs.items():
+            emit(table, rows)
+        for batch in generate_dataset(applications_per_org, orgs, seed):
+            for table, rows in batch.items():
+                emit(table, rows)
+    finally:
+        # Close every file even if one writer failed, then report the first failure
+        errors = []
+        for writer in writers.values():
+            try:
+                writer.close()
+            except RuntimeError as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+    return counts
+
+
+def parse_size(value: str) -> int:
+    return SIZES.get(value.lower()) or int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=parse_size, default=SIZES["1k"],
+                        help="applications per org: 1k, 50k, 500k or a number")
+    parser.add_argument('--orgs', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', choices=["local", "csv", "parquet"], default="csv")
+    parser.add_argument('--out-dir', default="synthetic_data")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.output == "local":
+        from utils.local_backend import create_local_client
+        counts = load_into_local_client(create_local_client(), args.size, args.orgs, args.seed)
+    else:
+        counts = write_files(args.out_dir, args.output, args.size, args.orgs, args.seed)
+    elapsed = time.perf_counter() - start
+
+    for table, count in counts.items():
+        print(f"{table:26s} {count:>10,}")
+    total = sum(counts.values())
+    print(f"{'total rows':26s} {total:>10,}  in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    if args.output != "local":
+        print(f"files written to {os.path.abspath(args.out_dir)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# components/query_trace_panel.py - Admin-only debug panel with the backend queries of the current page
+import json
+
+import pandas as pd
+import streamlit as st
+
+from utils.instrumentation import export_otlp, session_traces, slowest_calls, summarize_calls, tracing_forced
+
+
+def display_query_trace_panel():
+    """
+    Show the slowest backend calls of the page just rendered, with totals for
+    this session and a download of the traces as OTLP JSON. Tracing starts on
+    the rerun after the toggle is switched on.
+    """
+    with st.expander("Query trace (debug)"):
+        if tracing_forced():
+            st.caption("Tracing is on for every session ([debug] query_tracing).")
+        else:
+            st.toggle("Trace backend queries in this session", key="query_tracing")
+
+        reruns, totals = session_traces()
+        if not reruns:
+            st.caption("No traced reruns yet. Switch tracing on and use the app.")
+            return
+
+        current = reruns[-1]
+        summary = summarize_calls(current["calls"])
+        st.write(f"**{current['page']}** (this rerun)")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Queries", summary["queries"])
+        col2.metric("Backend time", f"{summary['duration_ms']:.0f} ms")
+        col3.metric("Rows", summary["rows"])
+        col4.metric("Response size", f"{summary['bytes'] / 1024:.1f} KB")
+
+        if current["calls"]:
+            st.dataframe(pd.DataFrame([
+                {
+                    "ms": round(call["duration_ms"], 1),
+                    "table": call["table"],
+                    "operation": call["operation"],
+                    "filters": " ".join(call["filters"]),
+                    "columns": call["columns"],
+                    "rows": call["rows"],
+                    "KB": round(call["bytes"] / 1024, 1),
+                    "called from": call["site"],
+                    "error": call["error"] or "",
+                }
+                for call in slowest_calls(current["calls"])
+            ]), hide_index=True, use_container_width=True)
+        else:
+            st.caption("No backend queries on this rerun; everything came from cache.")
+
+        st.write("**This session**")
+        st.caption(
+            f"{totals['reruns']} traced reruns, {totals['queries']} queries, "
+            f"{totals['duration_ms']:.0f} ms backend time, {totals['bytes'] / 1024:.0f} KB"
+        )
+        st.dataframe(pd.DataFrame([
+            {"page": rerun["page"], **{
+                key: round(value, 1) if isinstance(value, float) else value
+                for key, value in summarize_calls(rerun["calls"]).items()
+            }}
+            for rerun in reversed(reruns)
+        ]), hide_index=True, use_container_width=True)
+
+        st.download_button(
+            "Download traces (OTLP JSON)",
+            data=json.dumps(export_otlp(reruns)),
+            file_name="query_traces.json",
+            mime="application/json",
+        )
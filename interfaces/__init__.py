@@ -1,11 +1,29 @@
-from interfaces.public.landing import public_home_page
-from interfaces.public.applications import public_applications_page
-from interfaces.public.scholar_login import public_scholar_login_page
-from interfaces.public.admin_login import org_admin_login
-from interfaces.admin.dashboard import admin_dashboard_page
-from interfaces.admin.applications_view import admin_applications_page
-from interfaces.admin.scholar_view import admin_scholars_page
-from interfaces.admin.moa_view import admin_moa_page
-from interfaces.scholar.home import scholar_dashboard_page
-from interfaces.scholar.scholar_profile import scholar_profile_page
-from interfaces.scholar.help import scholar_help_page
\ No newline at end of file
+# interfaces/__init__.py - Page entry points, each module imported on first visit
+import importlib
+
+
+def _lazy_page(module_name: str, function_name: str):
+    """
+    Return a page callable that imports its module the first time it runs.
+    
+    The wrapper carries the real function's name so st.Page infers the same
+    title and URL path as before.
+    """
+    def page():
+        return getattr(importlib.import_module(module_name), function_name)()
+    
+    page.__name__ = page.__qualname__ = function_name
+    return page
+
+
+public_home_page = _lazy_page("interfaces.public.landing", "public_home_page")
+public_applications_page = _lazy_page("interfaces.public.applications", "public_applications_page")
+public_scholar_login_page = _lazy_page("interfaces.public.scholar_login", "public_scholar_login_page")
+org_admin_login = _lazy_page("interfaces.public.admin_login", "org_admin_login")
+admin_dashboard_page = _lazy_page("interfaces.admin.dashboard", "admin_dashboard_page")
+admin_applications_page = _lazy_page("interfaces.admin.applications_view", "admin_applications_page")
+admin_scholars_page = _lazy_page("interfaces.admin.scholar_view", "admin_scholars_page")
+admin_moa_page = _lazy_page("interfaces.admin.moa_view", "admin_moa_page")
+scholar_dashboard_page = _lazy_page("interfaces.scholar.home", "scholar_dashboard_page")
+scholar_profile_page = _lazy_page("interfaces.scholar.scholar_profile", "scholar_profile_page")
+scholar_help_page = _lazy_page("interfaces.scholar.help", "scholar_help_page")
@@ -2,18 +2,47 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from datetime import datetime
 from utils.auth import require_auth, get_current_user
 from utils.queries import (
     get_applications_for_admin, 
     get_application_details, 
     approve_application, 
     reject_application,
-    get_supabase_client,
-    batch_fetch_demographics
+    extract_demographics,
+    iter_applications_for_export
 )
+from utils.table_utils import (
+    index_rows_by_id,
+    render_selectable_dataframe,
+    open_detail_panel,
+    close_detail_panel,
+    get_open_detail_panels,
+    status_badge_series,
+    get_data_table
+)
+from utils.exports import iter_row_pages, render_streaming_export
+from utils.formatting import format_timestamp_series, DATE_FORMAT
 from components.footer import display_footer
 
+APPLICATION_STATUS_BADGES = {
+    'PENDING': '🟡 PENDING',
+    'APPROVED': '🟢 APPROVED',
+    'REJECTED': '🔴 REJECTED'
+}
+
+APPLICATION_EXPORT_COLUMNS = [
+    ('Application ID', lambda app: app['application_id']),
+    ('Name', lambda app: f"{app['first_name']} {app['last_name']}"),
+    ('Email', lambda app: app['email']),
+    ('Country', lambda app: app['country']),
+    ('Education', lambda app: app['education_status']),
+    ('Programming', lambda app: app['programming_experience']),
+    ('Data Science', lambda app: app['data_science_experience']),
+    ('Demographics', lambda app: ", ".join(app['demographics']) or "N/A"),
+    ('Status', lambda app: app['status']),
+    ('Applied', lambda app: app['applied_at'][:10])
+]
+
 
 def admin_applications_page():
     require_auth('admin')
@@ -30,15 +59,8 @@ def admin_applications_page():
         st.info("No applications found for your organization.")
         return
 
-    # --- Demographics Lookup ---
-    application_ids = [app['application_id'] for app in applications if app.get('application_id')]
-
-    demographics_lookup = {}
-    if application_ids:
-        supabase = get_supabase_client()
-        demographics_lookup = batch_fetch_demographics(supabase, application_ids, batch_size=100)
-    else:
-        demographics_data = []
+    # --- Demographics Lookup (embedded in the applications query) ---
+    demographics_lookup = extract_demographics(applications)
 
     # Top bar: left for spacing, right for Refresh button
     _, top_right = st.columns([8, 1])
@@ -81,33 +103,34 @@ def admin_applications_page():
     # --- Applications CRUD Table ---
     with st.container(key="admin-table"):
         st.header("Applications Table")
-        display_applications_table(filtered_apps, admin_id, demographics_lookup)
+        display_applications_table(filtered_apps, admin_id, demographics_lookup, partner_org_id)
+
+
+def application_filter_table(demographics_lookup):
+    """DataTable filter config: status, name/email/country search and the exact set of demographic groups"""
+    return {
+        'table_id': 'admin_applications',
+        'filters': [
+            {'type': 'selectbox', 'key': 'status', 'label': 'Status'},
+            {'type': 'text_input', 'key': 'search', 'label': 'Search', 'search_fields': [
+                lambda app: f"{app['first_name']} {app['last_name']}", 'email', 'country'
+            ]},
+            {'type': 'selectbox', 'key': 'demographics', 'label': 'Demographics',
+             'field': lambda app: frozenset(demographics_lookup.get(app['application_id'], []))},
+        ]
+    }
 
 
 def filter_applications(applications, status_filter, search_term, sort_by, demographics_lookup, selected_demographics):
     """Filter and sort applications based on criteria"""
-    filtered = applications.copy()
-
-    # Status filter
-    if status_filter != "All":
-        filtered = [app for app in filtered if app['status'] == status_filter]
-
-    # Search filter
-    if search_term:
-        search_lower = search_term.lower()
-        filtered = [
-            app for app in filtered
-            if (search_lower in f"{app['first_name']} {app['last_name']}".lower() or
-                search_lower in app['email'].lower() or
-                search_lower in app['country'].lower())
-        ]
-
-    # Demographics filter (exact match)
-    if selected_demographics:
-        filtered = [
-            app for app in filtered
-            if set(demographics_lookup.get(app['application_id'], [])) == set(selected_demographics)
-        ]
+    # The table and its column indexes persist across reruns while the filtered columns are unchanged
+    table = get_data_table(applications, application_filter_table(demographics_lookup))
+    table.apply_filters({
+        'status': status_filter,
+        'search': search_term,
+        'demographics': frozenset(selected_demographics)
+    })
+    filtered = table.filtered_data
 
     # Sorting
     if sort_by == "Applied Date (Newest)":
@@ -188,7 +211,7 @@ def display_application_statistics(filtered_apps, all_apps):
             st.plotly_chart(fig_country, use_container_width=True)
 
 
-def display_applications_table(applications, admin_id, demographics_lookup):
+def display_applications_table(applications, admin_id, demographics_lookup, partner_org_id):
     """Display applications in an interactive table with CRUD operations"""
     if not applications:
         st.info("No applications match your criteria.")
@@ -197,7 +220,6 @@ def display_applications_table(applications, admin_id, demographics_lookup):
     # Create DataFrame for display
     table_data = []
     for app in applications:
-        applied_date = datetime.fromisoformat(app['applied_at'].replace('Z', '+00:00'))
         demographics = demographics_lookup.get(app['application_id'], [])
         table_data.append({
             'ID': app['application_id'][:8] + '...',
@@ -209,11 +231,14 @@ def display_applications_table(applications, admin_id, demographics_lookup):
             'Data Science': app['data_science_experience'],
             'Demographics': ", ".join(demographics) if demographics else "N/A",
             'Status': app['status'],
-            'Applied': applied_date.strftime('%Y-%m-%d'),
+            'Applied': app['applied_at'],
             'Full ID': app['application_id']  # Hidden column for operations
         })
 
     df = pd.DataFrame(table_data)
+    df['Applied'] = format_timestamp_series(df['Applied'], DATE_FORMAT)
+    row_ids = df['Full ID'].tolist()
+    apps_by_id = index_rows_by_id(applications, 'application_id')
 
     # Display table with selection
     st.write(f"Showing {len(applications)} applications")
@@ -222,42 +247,31 @@ def display_applications_table(applications, admin_id, demographics_lookup):
     table_col, actions_col = st.columns([3, 1])
 
     with table_col:
-        # Display table (without the Full ID column)
+        # Display table (without the Full ID column); clicking a row selects it
         display_df = df.drop(columns=['Full ID'])
-        st.dataframe(
-            display_df,
-            use_container_width=True,
-            hide_index=True,
-            height=400
-        )
+        display_df['Status'] = status_badge_series(display_df['Status'], APPLICATION_STATUS_BADGES)
+        selected_id = render_selectable_dataframe(display_df, row_ids, key="applications_table", height=400)
 
     with actions_col:
         st.subheader("Actions")
 
-        # Application selection
-        selected_name = st.selectbox(
-            "Select Application",
-            options=["None"] + [row['Name'] for _, row in df.iterrows()],
-            key="selected_application"
-        )
-
-        if selected_name != "None":
-            # Find selected application
-            selected_row = df[df['Name'] == selected_name].iloc[0]
-            selected_id = selected_row['Full ID']
+        if selected_id is None:
+            st.caption("Select a row in the table to review an application.")
+        else:
+            selected_app = apps_by_id[selected_id]
 
             # Display selected application info
             st.write("**Selected:**")
-            st.write(f"Name: {selected_row['Name']}")
-            st.write(f"Email: {selected_row['Email']}")
-            st.write(f"Status: {selected_row['Status']}")
+            st.write(f"Name: {selected_app['first_name']} {selected_app['last_name']}")
+            st.write(f"Email: {selected_app['email']}")
+            st.write(f"Status: {selected_app['status']}")
 
             # Action buttons
             if st.button("View Details", use_container_width=True):
-                st.session_state[f"show_details_{selected_id}"] = True
+                open_detail_panel("application_details", selected_id)
                 st.rerun()
 
-            if selected_row['Status'] == 'PENDING':
+            if selected_app['status'] == 'PENDING':
                 if st.button("Quick Approve", use_container_width=True, type="primary"):
                     if approve_application(selected_id, admin_id, "Quick approval via table"):
                         st.success("Application approved!")
@@ -272,25 +286,30 @@ def display_applications_table(applications, admin_id, demographics_lookup):
         st.divider()
         st.subheader("Bulk Actions")
 
-        if st.button("Export CSV", use_container_width=True):
-            csv = df.drop(columns=['Full ID']).to_csv(index=False)
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name=f"applications_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
+        # Exports the filtered view by default; the whole organization is streamed from the database
+        def export_view_pages():
+            for page in iter_row_pages(applications):
+                yield [dict(app, demographics=demographics_lookup.get(app['application_id'], [])) for app in page]
+
+        render_streaming_export(
+            key="applications_export",
+            file_stem="applications",
+            fetch_pages=export_view_pages,
+            columns=APPLICATION_EXPORT_COLUMNS,
+            fetch_all_pages=lambda: iter_applications_for_export(partner_org_id)
+        )
 
     # Show application details if requested
-    for app in applications:
-        if st.session_state.get(f"show_details_{app['application_id']}", False):
-            with st.expander(f"Application Details - {app['first_name']} {app['last_name']}", expanded=True):
-                display_application_details(app['application_id'], admin_id, app['status'])
-
-                if st.button("Close Details", key=f"close_{app['application_id']}"):
-                    st.session_state[f"show_details_{app['application_id']}"] = False
-                    st.rerun()
+    for application_id in get_open_detail_panels("application_details"):
+        app = apps_by_id.get(application_id)
+        if not app:
+            continue
+        with st.expander(f"Application Details - {app['first_name']} {app['last_name']}", expanded=True):
+            display_application_details(application_id, admin_id, app['status'])
+
+            if st.button("Close Details", key=f"close_{application_id}"):
+                close_detail_panel("application_details", application_id)
+                st.rerun()
 
 
 def display_application_details(application_id, admin_id, current_status):
@@ -370,8 +389,7 @@ def display_application_details(application_id, admin_id, current_status):
                     if approve_application(application_id, admin_id, approval_reason):
                         st.success("Application approved successfully!")
                         st.balloons()
-                        if f"show_details_{application_id}" in st.session_state:
-                            del st.session_state[f"show_details_{application_id}"]
+                        close_detail_panel("application_details", application_id)
                         st.rerun()
                     else:
                         st.error("Failed to approve application.")
@@ -390,8 +408,7 @@ def display_application_details(application_id, admin_id, current_status):
                     else:
                         if reject_application(application_id, admin_id, rejection_reason):
                             st.success("Application rejected.")
-                            if f"show_details_{application_id}" in st.session_state:
-                                del st.session_state[f"show_details_{application_id}"]
+                            close_detail_panel("application_details", application_id)
                             st.rerun()
                         else:
                             st.error("Failed to reject application.")
@@ -3,8 +3,8 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-from datetime import datetime, timedelta
 from utils.auth import require_auth, get_current_user
+from utils.formatting import utc_now, days_since
 from utils.queries import (
     get_admin_dashboard_metrics, 
     get_scholars_for_admin,
@@ -237,6 +237,7 @@ def display_scholar_timeline(scholars):
 def display_recent_activity(recent_applications, scholars):
     """Display recent activity and updates"""
     st.header("Recent Activity")
+    now = utc_now()
     
     activity_col1, activity_col2 = st.columns(2)
     
@@ -245,8 +246,7 @@ def display_recent_activity(recent_applications, scholars):
         
         if recent_applications:
             for app in recent_applications[:5]:  # Show last 5
-                applied_date = datetime.fromisoformat(app['applied_at'].replace('Z', '+00:00'))
-                days_ago = (datetime.now().replace(tzinfo=applied_date.tzinfo) - applied_date).days
+                days_ago = days_since(app['applied_at'], now)
                 
                 status_color = {
                     'PENDING': '🟡',
@@ -267,8 +267,7 @@ def display_recent_activity(recent_applications, scholars):
             recent_scholars = sorted(scholars, key=lambda x: x['created_at'], reverse=True)[:5]
             
             for scholar in recent_scholars:
-                created_date = datetime.fromisoformat(scholar['created_at'].replace('Z', '+00:00'))
-                days_ago = (datetime.now().replace(tzinfo=created_date.tzinfo) - created_date).days
+                days_ago = days_since(scholar['created_at'], now)
                 
                 status_icon = '🟢' if scholar['is_active'] else '🔴'
                 
@@ -2,15 +2,51 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from datetime import datetime
 from utils.auth import require_auth, get_current_user
 from utils.queries import (
     get_moa_submissions_for_admin, 
     approve_moa_submission, 
     request_moa_revision, 
-    get_moa_review_history
+    get_moa_review_history,
+    iter_moa_submissions_for_export,
+    get_partner_org_name
 )
+from services.moa_document_service import load_stored_moa_pdf, render_moa_pdf
 from utils.db import get_supabase_client
+from utils.table_utils import (
+    index_rows_by_id,
+    render_selectable_dataframe,
+    open_detail_panel,
+    close_detail_panel,
+    get_open_detail_panels,
+    status_badge_series,
+    get_data_table
+)
+from utils.exports import iter_row_pages, render_streaming_export
+from utils.formatting import (
+    utc_now,
+    days_since,
+    days_since_series,
+    format_datetime,
+    format_timestamp_series
+)
+
+MOA_STATUS_BADGES = {
+    'PENDING': '🟡 PENDING',
+    'SUBMITTED': '🔵 SUBMITTED',
+    'APPROVED': '🟢 APPROVED'
+}
+
+MOA_EXPORT_COLUMNS = [
+    ('MoA ID', lambda moa: moa['moa_id']),
+    ('Name', lambda moa: f"{moa['approved_applicants']['applications']['first_name']} "
+                         f"{moa['approved_applicants']['applications']['last_name']}"),
+    ('Email', lambda moa: moa['approved_applicants']['applications']['email']),
+    ('Country', lambda moa: moa['approved_applicants']['applications']['country']),
+    ('Status', lambda moa: moa['status']),
+    ('Digital Signature', lambda moa: moa['digital_signature']),
+    ('Submitted', lambda moa: moa['submitted_at'][:16].replace('T', ' '))
+]
 
 
 def admin_moa_page():
@@ -63,25 +99,28 @@ def admin_moa_page():
     # MoA CRUD Table
     with st.container(key="admin-table"):
         st.header("MoA Submissions Table")
-        display_moa_table(filtered_moas, admin_id)
+        display_moa_table(filtered_moas, admin_id, partner_org_id)
+
+
+# DataTable filter config: status and name/email search
+MOA_FILTER_TABLE = {
+    'table_id': 'admin_moa',
+    'filters': [
+        {'type': 'selectbox', 'key': 'status', 'label': 'Status'},
+        {'type': 'text_input', 'key': 'search', 'label': 'Search', 'search_fields': [
+            lambda moa: f"{moa['approved_applicants']['applications']['first_name']} {moa['approved_applicants']['applications']['last_name']}",
+            lambda moa: moa['approved_applicants']['applications']['email']
+        ]},
+    ]
+}
 
 
 def filter_moa_submissions(moa_submissions, status_filter, search_term, sort_by):
     """Filter and sort MoA submissions based on criteria"""
-    filtered = moa_submissions.copy()
-    
-    # Status filter
-    if status_filter != "All":
-        filtered = [moa for moa in filtered if moa['status'] == status_filter]
-    
-    # Search filter
-    if search_term:
-        search_lower = search_term.lower()
-        filtered = [
-            moa for moa in filtered
-            if (search_lower in f"{moa['approved_applicants']['applications']['first_name']} {moa['approved_applicants']['applications']['last_name']}".lower() or
-                search_lower in moa['approved_applicants']['applications']['email'].lower())
-        ]
+    # The table and its column indexes persist across reruns while the filtered columns are unchanged
+    table = get_data_table(moa_submissions, MOA_FILTER_TABLE)
+    table.apply_filters({'status': status_filter, 'search': search_term})
+    filtered = table.filtered_data
     
     # Sorting
     if sort_by == "Submitted Date (Newest)":
@@ -172,7 +211,7 @@ def display_moa_statistics(filtered_moas, all_moas):
             st.plotly_chart(fig_timeline, use_container_width=True)
 
 
-def display_moa_table(moa_submissions, admin_id):
+def display_moa_table(moa_submissions, admin_id, partner_org_id):
     """Display MoA submissions in an interactive table with CRUD operations"""
     if not moa_submissions:
         st.info("No MoA submissions match your criteria.")
@@ -182,20 +221,23 @@ def display_moa_table(moa_submissions, admin_id):
     table_data = []
     for moa in moa_submissions:
         applicant = moa['approved_applicants']['applications']
-        submitted_date = datetime.fromisoformat(moa['submitted_at'].replace('Z', '+00:00'))
-        
         table_data.append({
             'MoA ID': moa['moa_id'][:8] + '...',
             'Name': f"{applicant['first_name']} {applicant['last_name']}",
             'Email': applicant['email'],
             'Country': applicant['country'],
             'Status': moa['status'],
-            'Submitted': submitted_date.strftime('%Y-%m-%d %H:%M'),
-            'Days Ago': (datetime.now().replace(tzinfo=submitted_date.tzinfo) - submitted_date).days,
+            'Submitted': moa['submitted_at'],
+            'Days Ago': moa['submitted_at'],
             'Full ID': moa['moa_id']
         })
     
     df = pd.DataFrame(table_data)
+    now = utc_now()
+    df['Days Ago'] = days_since_series(df['Days Ago'], now)
+    df['Submitted'] = format_timestamp_series(df['Submitted'])
+    row_ids = df['Full ID'].tolist()
+    moas_by_id = index_rows_by_id(moa_submissions, 'moa_id')
     
     # Display table with selection
     st.write(f"Showing {len(moa_submissions)} MoA submissions")
@@ -208,51 +250,33 @@ def display_moa_table(moa_submissions, admin_id):
         display_df = df.drop(columns=['Full ID'])
         
         # Color code the status column
-        def highlight_status(val):
-            color_map = {
-                'PENDING': 'background-color: #fff3cd',
-                'SUBMITTED': 'background-color: #d1ecf1', 
-                'APPROVED': 'background-color: #d4edda'
-            }
-            return color_map.get(val, '')
+        display_df['Status'] = status_badge_series(display_df['Status'], MOA_STATUS_BADGES)
         
-        styled_df = display_df.style.applymap(highlight_status, subset=['Status'])
-        
-        st.dataframe(
-            styled_df,
-            use_container_width=True,
-            hide_index=True,
-            height=400
-        )
+        # Clicking a row selects it
+        selected_id = render_selectable_dataframe(display_df, row_ids, key="moa_table", height=400)
     
     with actions_col:
         st.subheader("Actions")
         
-        # MoA selection
-        selected_name = st.selectbox(
-            "Select MoA Submission",
-            options=["None"] + [row['Name'] for _, row in df.iterrows()],
-            key="selected_moa"
-        )
-        
-        if selected_name != "None":
-            # Find selected MoA
-            selected_row = df[df['Name'] == selected_name].iloc[0]
-            selected_id = selected_row['Full ID']
+        if selected_id is None:
+            st.caption("Select a row in the table to review a submission.")
+        else:
+            selected_moa = moas_by_id[selected_id]
+            applicant = selected_moa['approved_applicants']['applications']
             
             # Display selected MoA info
             st.write("**Selected:**")
-            st.write(f"Name: {selected_row['Name']}")
-            st.write(f"Email: {selected_row['Email']}")
-            st.write(f"Status: {selected_row['Status']}")
-            st.write(f"Submitted: {selected_row['Submitted']}")
+            st.write(f"Name: {applicant['first_name']} {applicant['last_name']}")
+            st.write(f"Email: {applicant['email']}")
+            st.write(f"Status: {selected_moa['status']}")
+            st.write(f"Submitted: {format_datetime(selected_moa['submitted_at'])}")
             
             # Action buttons
             if st.button("View Details", use_container_width=True):
-                st.session_state[f"show_moa_details_{selected_id}"] = True
+                open_detail_panel("moa_details", selected_id)
                 st.rerun()
             
-            if selected_row['Status'] in ['PENDING', 'SUBMITTED']:
+            if selected_moa['status'] in ['PENDING', 'SUBMITTED']:
                 if st.button("Quick Approve", use_container_width=True, type="primary"):
                     if approve_moa_submission(selected_id, admin_id):
                         st.success("MoA approved and Scholar activated!")
@@ -267,25 +291,57 @@ def display_moa_table(moa_submissions, admin_id):
         st.divider()
         st.subheader("Bulk Actions")
         
-        if st.button("Export CSV", use_container_width=True):
-            csv = df.drop(columns=['Full ID']).to_csv(index=False)
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name=f"moa_submissions_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
+        # Exports the filtered view by default; the whole organization is streamed from the database
+        render_streaming_export(
+            key="moa_export",
+            file_stem="moa_submissions",
+            fetch_pages=lambda: iter_row_pages(moa_submissions),
+            columns=MOA_EXPORT_COLUMNS,
+            fetch_all_pages=lambda: iter_moa_submissions_for_export(partner_org_id)
+        )
     
     # Show MoA details if requested
-    for moa in moa_submissions:
-        if st.session_state.get(f"show_moa_details_{moa['moa_id']}", False):
-            with st.expander(f"MoA Details - {moa['approved_applicants']['applications']['first_name']} {moa['approved_applicants']['applications']['last_name']}", expanded=True):
-                display_moa_details(moa, admin_id)
-                
-                if st.button("Close Details", key=f"close_moa_{moa['moa_id']}"):
-                    st.session_state[f"show_moa_details_{moa['moa_id']}"] = False
-                    st.rerun()
+    for moa_id in get_open_detail_panels("moa_details"):
+        moa = moas_by_id.get(moa_id)
+        if not moa:
+            continue
+        with st.expander(f"MoA Details - {moa['approved_applicants']['applications']['first_name']} {moa['approved_applicants']['applications']['last_name']}", expanded=True):
+            display_moa_details(moa, admin_id)
+            
+            if st.button("Close Details", key=f"close_moa_{moa_id}"):
+                close_detail_panel("moa_details", moa_id)
+                st.rerun()
+
+
+def get_moa_pdf(moa) -> bytes:
+    """Signed MoA PDF: the stored copy when there is one, else rendered once from the submission"""
+    if moa.get('document_sha256') and moa.get('document_url'):
+        pdf = load_stored_moa_pdf(moa['document_sha256'], moa['document_url'])
+        if pdf:
+            return pdf
+    
+    applicant = moa['approved_applicants']['applications']
+    return render_moa_pdf(
+        get_partner_org_name(applicant['partner_org_id']) or "",
+        {key: applicant[key] for key in ('first_name', 'last_name', 'email')},
+        moa['approved_applicants']['approved_applicant_id'],
+        moa['moa_id'], moa['digital_signature'], moa['submitted_at']
+    )
+
+
+def display_moa_download_button(moa, key: str):
+    """Download button for the signed MoA PDF"""
+    try:
+        st.download_button(
+            "Download MoA (PDF)",
+            data=get_moa_pdf(moa),
+            file_name=f"MoA_{moa['approved_applicants']['approved_applicant_id']}.pdf",
+            mime="application/pdf",
+            key=key,
+            use_container_width=True
+        )
+    except Exception as e:
+        st.error(f"Error loading MoA document: {e}")
 
 
 def display_moa_details(moa, admin_id):
@@ -306,14 +362,14 @@ def display_moa_details(moa, admin_id):
             st.write(f"**Application ID:** {applicant['application_id']}")
         
         with col2:
-            submitted_date = datetime.fromisoformat(moa['submitted_at'].replace('Z', '+00:00'))
-            st.write(f"**Submitted:** {submitted_date.strftime('%Y-%m-%d %H:%M')}")
+            st.write(f"**Submitted:** {format_datetime(moa['submitted_at'])}")
             st.write(f"**Status:** {moa['status']}")
-            st.write(f"**Days Ago:** {(datetime.now().replace(tzinfo=submitted_date.tzinfo) - submitted_date).days}")
+            st.write(f"**Days Ago:** {days_since(moa['submitted_at'])}")
     
     with detail_tabs[1]:
         st.subheader("Digital Signature")
         st.code(moa['digital_signature'], language=None)
+        display_moa_download_button(moa, key=f"download_moa_doc_{moa_id}")
         
         # Verification checklist
         st.subheader("Verification Checklist")
@@ -335,9 +391,8 @@ def display_moa_details(moa, admin_id):
         
         if review_history:
             for review in review_history:
-                review_date = datetime.fromisoformat(review['reviewed_at'].replace('Z', '+00:00'))
                 admin_name = f"{review['admins']['first_name']} {review['admins']['last_name']}"
-                st.write(f"**{review['action']}** by {admin_name} on {review_date.strftime('%Y-%m-%d %H:%M')}")
+                st.write(f"**{review['action']}** by {admin_name} on {format_datetime(review['reviewed_at'])}")
                 if review.get('action_reason'):
                     st.write(f"Reason: {review['action_reason']}")
                 st.divider()
@@ -359,8 +414,7 @@ def display_moa_details(moa, admin_id):
                     if approve_moa_submission(moa_id, admin_id, approval_reason):
                         st.success("MoA approved successfully! Scholar has been activated and notification email sent.")
                         st.balloons()
-                        if f"show_moa_details_{moa_id}" in st.session_state:
-                            del st.session_state[f"show_moa_details_{moa_id}"]
+                        close_detail_panel("moa_details", moa_id)
                         st.rerun()
                     else:
                         st.error("Failed to approve MoA.")
@@ -379,16 +433,14 @@ def display_moa_details(moa, admin_id):
                     else:
                         if request_moa_revision(moa_id, admin_id, revision_reason):
                             st.success("Revision request sent.")
-                            if f"show_moa_details_{moa_id}" in st.session_state:
-                                del st.session_state[f"show_moa_details_{moa_id}"]
+                            close_detail_panel("moa_details", moa_id)
                             st.rerun()
                         else:
                             st.error("Failed to request revision.")
             
             with col3:
                 st.write("**Quick Actions:**")
-                if st.button("Download MoA", use_container_width=True):
-                    st.info("MoA download feature coming soon.")
+                display_moa_download_button(moa, key=f"download_moa_action_{moa_id}")
                 
                 if st.button("Contact Applicant", use_container_width=True):
                     st.info(f"Contact: {applicant['email']}")
@@ -2,7 +2,6 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from datetime import datetime, timedelta
 from utils.auth import require_auth, get_current_user
 from utils.queries import (
     get_scholars_for_admin,
@@ -11,9 +10,44 @@ from utils.queries import (
     get_scholar_employment_status,
     get_scholar_certifications,
     get_scholar_jobs,
-    batch_fetch_demographics
+    extract_demographics,
+    iter_scholars_for_export
 )
-from utils.db import get_supabase_client
+from services.thumbnail_service import get_certificate_thumbnails
+from utils.table_utils import (
+    index_rows_by_id,
+    render_selectable_dataframe,
+    open_detail_panel,
+    close_detail_panel,
+    get_open_detail_panels,
+    status_badge_series,
+    get_data_table
+)
+from utils.exports import iter_row_pages, render_streaming_export
+from utils.formatting import (
+    days_since,
+    days_since_series,
+    format_date,
+    format_timestamp_series,
+    DATE_FORMAT
+)
+
+SCHOLAR_STATUS_BADGES = {
+    'Active': '🟢 Active',
+    'Inactive': '🔴 Inactive'
+}
+
+SCHOLAR_EXPORT_COLUMNS = [
+    ('Scholar ID', lambda scholar: scholar['scholar_id']),
+    ('Name', lambda scholar: f"{scholar['applications']['first_name']} {scholar['applications']['last_name']}"),
+    ('Email', lambda scholar: scholar['applications']['email']),
+    ('Country', lambda scholar: scholar['applications']['country']),
+    ('Status', lambda scholar: 'Active' if scholar['is_active'] else 'Inactive'),
+    ('Certifications', lambda scholar: scholar['certifications_count'], 'int'),
+    ('Employment', lambda scholar: scholar['employment_status']),
+    ('Joined', lambda scholar: scholar['created_at'][:10]),
+    ('Demographics', lambda scholar: ", ".join(scholar['demographics']) or "N/A")
+]
 
 
 def admin_scholars_page():
@@ -32,14 +66,8 @@ def admin_scholars_page():
         st.write("Scholars will appear here when applications are approved and MoA documents are processed.")
         return
     
-    # After fetching scholars
-    application_ids = [
-        s['applications']['application_id']
-        for s in scholars
-        if s.get('applications') and s['applications'].get('application_id')
-    ]
-    supabase = get_supabase_client()
-    demographics_lookup = batch_fetch_demographics(supabase, application_ids, batch_size=100)
+    # Demographics come embedded in each scholar's application
+    demographics_lookup = extract_demographics([s['applications'] for s in scholars if s.get('applications')])
 
     # Top bar: left for spacing, right for Refresh button
     _, top_right = st.columns([8, 1])
@@ -83,36 +111,38 @@ def admin_scholars_page():
     # Scholars CRUD Table
     with st.container(key="admin-table"):
         st.header("Scholars Directory Table")
-        display_scholars_table(filtered_scholars, demographics_lookup)
+        display_scholars_table(filtered_scholars, demographics_lookup, partner_org_id)
+
+
+def scholar_filter_table(demographics_lookup):
+    """DataTable filter config: active status, name/email/ID search and the exact set of demographic groups"""
+    return {
+        'table_id': 'admin_scholars',
+        'filters': [
+            {'type': 'selectbox', 'key': 'status', 'label': 'Status',
+             'field': lambda s: "Active" if s['is_active'] else "Inactive"},
+            {'type': 'text_input', 'key': 'search', 'label': 'Search', 'search_fields': [
+                lambda s: f"{s['applications']['first_name']} {s['applications']['last_name']}",
+                lambda s: s['applications']['email'],
+                'scholar_id'
+            ]},
+            {'type': 'selectbox', 'key': 'demographics', 'label': 'Demographics',
+             'field': lambda s: frozenset(demographics_lookup.get(s['applications']['application_id'], []))},
+        ]
+    }
 
 
 def filter_scholars(scholars, status_filter, search_term, sort_by, demographics_lookup, selected_demographics):
     """Filter and sort scholars based on criteria"""
-    filtered = scholars.copy()
-    
-    # Status filter
-    if status_filter == "Active":
-        filtered = [s for s in filtered if s['is_active']]
-    elif status_filter == "Inactive":
-        filtered = [s for s in filtered if not s['is_active']]
-    
-    # Search filter
-    if search_term:
-        search_lower = search_term.lower()
-        filtered = [
-            s for s in filtered
-            if (search_lower in f"{s['applications']['first_name']} {s['applications']['last_name']}".lower() or
-                search_lower in s['applications']['email'].lower() or
-                search_lower in s['scholar_id'].lower())
-        ]
-    
-    # Demographics filter
-    if selected_demographics:
-        filtered = [
-            s for s in filtered
-            if set(demographics_lookup.get(s['applications']['application_id'], [])) == set(selected_demographics)
-        ]
-    
+    # The table and its column indexes persist across reruns while the filtered columns are unchanged
+    table = get_data_table(scholars, scholar_filter_table(demographics_lookup))
+    table.apply_filters({
+        'status': status_filter,
+        'search': search_term,
+        'demographics': frozenset(selected_demographics)
+    })
+    filtered = table.filtered_data
+        
     # Sorting
     if sort_by == "Newest First":
         filtered.sort(key=lambda x: x['created_at'], reverse=True)
@@ -149,12 +179,8 @@ def display_scholar_statistics(filtered_scholars, all_scholars):
     with col4:
         # Calculate average days as scholar
         if all_scholars:
-            avg_days = sum([
-                (datetime.now().replace(tzinfo=datetime.fromisoformat(s['created_at'].replace('Z', '+00:00')).tzinfo) - 
-                 datetime.fromisoformat(s['created_at'].replace('Z', '+00:00'))).days
-                for s in all_scholars
-            ]) / len(all_scholars)
-            st.metric("Avg. Days Active", int(avg_days))
+            avg_days = days_since_series([s['created_at'] for s in all_scholars]).mean()
+            st.metric("Avg. Days Active", "N/A" if pd.isna(avg_days) else int(avg_days))
     
     # Charts
     if len(all_scholars) > 0:
@@ -209,35 +235,15 @@ def display_scholar_statistics(filtered_scholars, all_scholars):
             st.plotly_chart(fig_country, use_container_width=True)
 
 
-def display_scholars_table(scholars, demographics_lookup):
+def display_scholars_table(scholars, demographics_lookup, partner_org_id):
     """Display scholars in an interactive table with CRUD operations"""
     if not scholars:
         st.info("No scholars match your criteria.")
         return
 
-    # --- Batch fetch certifications count ---
-    scholar_ids = [s['scholar_id'] for s in scholars]
-    supabase = get_supabase_client()
-
-    # Batch fetch certifications
-    certs = supabase.table("certifications").select("scholar_id").in_("scholar_id", scholar_ids).execute().data
-    certs_count_lookup = {}
-    for row in certs:
-        certs_count_lookup[row['scholar_id']] = certs_count_lookup.get(row['scholar_id'], 0) + 1
-
-    # Batch fetch employment (current jobs)
-    jobs = supabase.table("jobs").select("scholar_id").eq("is_published", True).in_("scholar_id", scholar_ids).execute().data
-    employment_lookup = {row['scholar_id']: "Employed" for row in jobs}
-
-    # Create DataFrame for display
+    # Certification counts and employment come embedded in the scholars query
     table_data = []
     for scholar in scholars:
-        created_date = datetime.fromisoformat(scholar['created_at'].replace('Z', '+00:00'))
-        days_active = (datetime.now().replace(tzinfo=created_date.tzinfo) - created_date).days
-
-        certifications_count = certs_count_lookup.get(scholar['scholar_id'], 0)
-        employment_status = employment_lookup.get(scholar['scholar_id'], "Seeking")
-
         # Demographics
         demographics = demographics_lookup.get(scholar['applications']['application_id'], [])
 
@@ -247,15 +253,18 @@ def display_scholars_table(scholars, demographics_lookup):
             'Email': scholar['applications']['email'],
             'Country': scholar['applications']['country'],
             'Status': 'Active' if scholar['is_active'] else 'Inactive',
-            'Days Active': days_active,
-            'Certifications': certifications_count,
-            'Employment': employment_status,
-            'Joined': created_date.strftime('%Y-%m-%d'),
-            'Demographics': ", ".join(demographics) if demographics else "N/A",
-            'Full Data': scholar  # Hidden column for operations
+            'Days Active': scholar['created_at'],
+            'Certifications': scholar['certifications_count'],
+            'Employment': scholar['employment_status'],
+            'Joined': scholar['created_at'],
+            'Demographics': ", ".join(demographics) if demographics else "N/A"
         })
 
     df = pd.DataFrame(table_data)
+    df['Days Active'] = days_since_series(df['Days Active'])
+    df['Joined'] = format_timestamp_series(df['Joined'], DATE_FORMAT)
+    row_ids = df['Scholar ID'].tolist()
+    scholars_by_id = index_rows_by_id(scholars, 'scholar_id')
 
     # Display table with selection
     st.write(f"Showing {len(scholars)} scholars")
@@ -263,92 +272,87 @@ def display_scholars_table(scholars, demographics_lookup):
     table_col, actions_col = st.columns([3, 1])
 
     with table_col:
-        display_df = df.drop(columns=['Full Data'])
-
-        def highlight_status(val):
-            if val == 'Active':
-                return 'background-color: #d4edda'
-            elif val == 'Inactive':
-                return 'background-color: #f8d7da'
-            return ''
-
-        styled_df = display_df.style.applymap(highlight_status, subset=['Status'])
-
-        st.dataframe(
-            styled_df,
-            use_container_width=True,
-            hide_index=True,
-            height=400
-        )
+        display_df = df.copy()
+        display_df['Status'] = status_badge_series(display_df['Status'], SCHOLAR_STATUS_BADGES)
+
+        # Clicking a row selects it
+        selected_id = render_selectable_dataframe(display_df, row_ids, key="scholars_table", height=400)
 
     with actions_col:
         st.subheader("Actions")
-        selected_name = st.selectbox(
-            "Select Scholar",
-            options=["None"] + [row['Name'] for _, row in df.iterrows()],
-            key="selected_scholar"
-        )
 
-        if selected_name != "None":
-            selected_row = df[df['Name'] == selected_name].iloc[0]
-            selected_scholar = selected_row['Full Data']
+        if selected_id is None:
+            st.caption("Select a row in the table to manage a scholar.")
+        else:
+            selected_scholar = scholars_by_id[selected_id]
 
             st.write("**Selected:**")
-            st.write(f"Name: {selected_row['Name']}")
-            st.write(f"ID: {selected_row['Scholar ID']}")
-            st.write(f"Status: {selected_row['Status']}")
-            st.write(f"Certifications: {selected_row['Certifications']}")
+            st.write(f"Name: {selected_scholar['applications']['first_name']} {selected_scholar['applications']['last_name']}")
+            st.write(f"ID: {selected_id}")
+            st.write(f"Status: {'Active' if selected_scholar['is_active'] else 'Inactive'}")
+            st.write(f"Certifications: {selected_scholar['certifications_count']}")
 
             if st.button("View Profile", use_container_width=True):
-                st.session_state[f"show_scholar_profile_{selected_scholar['scholar_id']}"] = True
+                open_detail_panel("scholar_profile", selected_id)
                 st.rerun()
 
             if st.button("View Certifications", use_container_width=True):
-                st.session_state[f"show_certs_{selected_scholar['scholar_id']}"] = True
+                open_detail_panel("scholar_certs", selected_id)
                 st.rerun()
 
             if selected_scholar['is_active']:
                 if st.button("Deactivate", use_container_width=True):
-                    if toggle_scholar_status(selected_scholar['scholar_id'], False):
+                    if toggle_scholar_status(selected_id, False):
                         st.success("Scholar deactivated")
                         st.rerun()
             else:
                 if st.button("Reactivate", use_container_width=True, type="primary"):
-                    if toggle_scholar_status(selected_scholar['scholar_id'], True):
+                    if toggle_scholar_status(selected_id, True):
                         st.success("Scholar reactivated")
                         st.rerun()
 
         st.divider()
         st.subheader("Bulk Actions")
 
-        if st.button("Export CSV", use_container_width=True):
-            csv = df.drop(columns=['Full Data']).to_csv(index=False)
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name=f"scholars_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
+        # Exports the filtered view by default; the whole organization is streamed from the database
+        def export_view_pages():
+            for page in iter_row_pages(scholars):
+                yield [
+                    dict(scholar, demographics=demographics_lookup.get(scholar['applications']['application_id'], []))
+                    for scholar in page
+                ]
+
+        render_streaming_export(
+            key="scholars_export",
+            file_stem="scholars",
+            fetch_pages=export_view_pages,
+            columns=SCHOLAR_EXPORT_COLUMNS,
+            fetch_all_pages=lambda: iter_scholars_for_export(partner_org_id)
+        )
 
         if st.button("Send Bulk Email", use_container_width=True):
             st.info("Bulk email feature coming soon")
 
     # Show scholar profiles if requested
-    for scholar in scholars:
-        if st.session_state.get(f"show_scholar_profile_{scholar['scholar_id']}", False):
-            with st.expander(f"Scholar Profile - {scholar['applications']['first_name']} {scholar['applications']['last_name']}", expanded=True):
-                display_scholar_profile(scholar)
-                if st.button("Close Profile", key=f"close_profile_{scholar['scholar_id']}"):
-                    st.session_state[f"show_scholar_profile_{scholar['scholar_id']}"] = False
-                    st.rerun()
-
-        if st.session_state.get(f"show_certs_{scholar['scholar_id']}", False):
-            with st.expander(f"Certifications - {scholar['applications']['first_name']} {scholar['applications']['last_name']}", expanded=True):
-                display_scholar_certifications(scholar['scholar_id'])
-                if st.button("Close Certifications", key=f"close_certs_{scholar['scholar_id']}"):
-                    st.session_state[f"show_certs_{scholar['scholar_id']}"] = False
-                    st.rerun()
+    for scholar_id in get_open_detail_panels("scholar_profile"):
+        scholar = scholars_by_id.get(scholar_id)
+        if not scholar:
+            continue
+        with st.expander(f"Scholar Profile - {scholar['applications']['first_name']} {scholar['applications']['last_name']}", expanded=True):
+            display_scholar_profile(scholar)
+            if st.button("Close Profile", key=f"close_profile_{scholar_id}"):
+                close_detail_panel("scholar_profile", scholar_id)
+                st.rerun()
+
+    for scholar_id in get_open_detail_panels("scholar_certs"):
+        scholar = scholars_by_id.get(scholar_id)
+        if not scholar:
+            continue
+        with st.expander(f"Certifications - {scholar['applications']['first_name']} {scholar['applications']['last_name']}", expanded=True):
+            display_scholar_certifications(scholar_id)
+            if st.button("Close Certifications", key=f"close_certs_{scholar_id}"):
+                close_detail_panel("scholar_certs", scholar_id)
+                st.rerun()
 
     missing_app_id_count = sum(
         1 for s in scholars if not (s.get('applications') and s['applications'].get('application_id'))
@@ -374,14 +378,12 @@ def display_scholar_profile(scholar):
             st.write(f"**Country:** {scholar['applications']['country']}")
         
         with col2:
-            created_date = datetime.fromisoformat(scholar['created_at'].replace('Z', '+00:00'))
-            days_active = (datetime.now().replace(tzinfo=created_date.tzinfo) - created_date).days
             
             status_func = st.success if scholar['is_active'] else st.error
             status_func(f"Status: {'Active' if scholar['is_active'] else 'Inactive'}")
             
-            st.write(f"**Joined:** {created_date.strftime('%Y-%m-%d')}")
-            st.write(f"**Days Active:** {days_active}")
+            st.write(f"**Joined:** {format_date(scholar['created_at'])}")
+            st.write(f"**Days Active:** {days_since(scholar['created_at'])}")
             st.write(f"**Partner Org:** {scholar['partner_organizations']['display_name']}")
     
     with profile_tabs[1]:
@@ -459,7 +461,9 @@ def display_scholar_certifications(scholar_id):
     # Create table of certifications
     cert_data = []
     for cert in certifications:
+        thumbnails = get_certificate_thumbnails(cert)
         cert_data.append({
+            'Preview': thumbnails['thumbnail'] if thumbnails else None,
             'Name': cert['name'],
             'Issuing Organization': cert['issuing_organization'],
             'Issue Date': f"{cert['issue_month']}/{cert['issue_year']}",
@@ -469,4 +473,7 @@ def display_scholar_certifications(scholar_id):
         })
     
     df = pd.DataFrame(cert_data)
-    st.dataframe(df, use_container_width=True, hide_index=True)
\ No newline at end of file
+    st.dataframe(
+        df, use_container_width=True, hide_index=True,
+        column_config={"Preview": st.column_config.ImageColumn("Preview", width="small")}
+    )
\ No newline at end of file
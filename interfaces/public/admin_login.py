@@ -1,6 +1,7 @@
 # interfaces/public/admin_login.py
 import streamlit as st
 from utils.auth import authenticate_user, is_authenticated, is_admin
+from utils.rate_limit import acquire_login_attempt, record_login_success, format_retry_after
 
 def org_admin_login():
     # Redirect if already authenticated as admin
@@ -25,10 +26,16 @@ def org_admin_login():
                         st.error("Please fill in all fields")
                         return
                     
+                    wait = acquire_login_attempt("admin", email)
+                    if wait:
+                        st.error(f"Too many login attempts. Please try again in {format_retry_after(wait)}.")
+                        return
+                    
                     with st.spinner("Authenticating..."):
                         user_data = authenticate_user(email, password)
                     
                     if user_data and user_data['role'] == 'admin':
+                        record_login_success("admin", email)
                         st.success("Login successful!")
                         st.rerun()
                     elif user_data and user_data['role'] == 'scholar':
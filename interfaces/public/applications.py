@@ -6,7 +6,7 @@ import random
 import time
 
 from utils.applications import get_countries, get_provinces, get_universities_by_country
-from utils.queries import check_email_in_scholars, check_email_in_applications, get_active_partner_organizations, save_application_to_database
+from utils.queries import check_application_eligibility, get_active_partner_organizations, save_application_to_database
 from services.email_service import send_otp_email
 
 @st.fragment
@@ -99,11 +99,16 @@ def public_applications_page():
                 
             if next_clicked:
                 # Check email validations
-                if check_email_in_scholars(email, partner_org_choice):
+                eligibility = check_application_eligibility(email, partner_org_choice)
+                if eligibility["rate_limited"]:
+                    st.error("Too many attempts. Please wait a minute and try again.")
+                    return
+                
+                if eligibility["is_scholar"]:
                     st.error("This email is already registered as a scholar. You cannot apply again.")
                     return
                 
-                application_status = check_email_in_applications(email, partner_org_choice)
+                application_status = eligibility["application_status"]
                 if application_status in ['PENDING', 'APPROVED']:
                     st.error(f"You already have a {application_status.lower()} application for {partner_org_choice}.")
                     return
@@ -1,6 +1,7 @@
 # interfaces/public/scholar_login.py - Enhanced with unified login
 import streamlit as st
 from utils.auth import unified_scholar_login, is_authenticated, is_scholar, is_approved_applicant
+from utils.rate_limit import acquire_login_attempt, record_login_success, format_retry_after
 from datetime import date
 
 def public_scholar_login_page():
@@ -49,9 +50,12 @@ def public_scholar_login_page():
                         st.error("Please enter a valid ID (format: SCH12345678 or APP12345678)")
                     elif len(scholar_id) != 11:
                         st.error("ID must be 11 characters (3 letters + 8 digits)")
+                    elif wait := acquire_login_attempt("scholar", scholar_id):
+                        st.error(f"Too many login attempts. Please try again in {format_retry_after(wait)}.")
                     else:
                         with st.spinner("Verifying credentials..."):
                             if unified_scholar_login(scholar_id, email, str(birth_date)):
+                                record_login_success("scholar", scholar_id)
                                 st.success("Login successful!")
                                 st.rerun()
                             else:
@@ -2,7 +2,11 @@
 import streamlit as st
 from utils.auth import require_auth, get_current_user, is_approved_applicant
 from utils.db import get_supabase_client
-from utils.queries import generate_scholar_id
+from utils.queries import generate_scholar_id, add_certification_to_profile_bundle
+from services.certification_feed import get_certification_feed, FEED_PAGE_SIZE
+from services.storage_service import store_file
+from services.thumbnail_service import get_thumbnail_service
+from services.moa_document_service import moa_text, generate_moa_document
 from typing import Dict, Any, Optional
 
 
@@ -83,35 +87,8 @@ def display_moa_submission_form(approved_applicant_id: str, application_data: di
     with st.form("moa_submission_form"):
         st.subheader("Memorandum of Agreement Terms")
         
-        # MoA content
-        moa_content = f"""MEMORANDUM OF AGREEMENT - {partner_org} Data Science Scholarship
-
-Applicant: {application_data['first_name']} {application_data['last_name']}
-Email: {application_data['email']}
-Approved Applicant ID: {approved_applicant_id}
-
-TERMS AND CONDITIONS:
-1. I agree to actively participate in the {partner_org} data science program
-2. I commit to completing assigned coursework and projects
-3. I will follow all community guidelines and code of conduct
-4. I will work towards program completion within the designated timeframe
-5. I understand that failure to participate may result in program termination
-
-BENEFITS:
-- Free access to premium {partner_org} courses
-- Industry-recognized certifications
-- Career support and job placement assistance
-- Access to scholar community and networking opportunities
-- Personalized learning paths and mentorship
-
-RESPONSIBILITIES:
-- Regular participation in courses and assignments
-- Professional conduct in all program interactions
-- Honest reporting of progress and challenges
-- Active engagement with the scholar community
-- Commitment to sharing success stories and helping future scholars
-
-By signing below, I acknowledge that I have read, understood, and agree to all terms and conditions outlined in this Memorandum of Agreement."""
+        # MoA content; the terms part is built once per partner org
+        moa_content = moa_text(partner_org, application_data, approved_applicant_id)
         
         st.text_area("MoA Terms", value=moa_content, height=300, disabled=True)
         
@@ -144,7 +121,7 @@ By signing below, I acknowledge that I have read, understood, and agree to all t
                 st.error("Please provide your digital signature")
             else:
                 # Submit MoA
-                if submit_moa_document(approved_applicant_id, digital_signature.strip()):
+                if submit_moa_document(approved_applicant_id, digital_signature.strip(), application_data, partner_org):
                     st.success("MoA submitted successfully!")
                     st.balloons()
                     st.info("Your MoA is now under review. You'll receive an email notification within 2-3 business days.")
@@ -153,8 +130,9 @@ By signing below, I acknowledge that I have read, understood, and agree to all t
                     st.error("Failed to submit MoA. Please try again.")
 
 
-def submit_moa_document(approved_applicant_id: str, digital_signature: str) -> bool:
-    """Submit MoA document to database"""
+def submit_moa_document(approved_applicant_id: str, digital_signature: str,
+                        application_data: dict, partner_org: str) -> bool:
+    """Submit MoA document to database and store the signed PDF"""
     supabase = get_supabase_client()
     
     try:
@@ -165,9 +143,21 @@ def submit_moa_document(approved_applicant_id: str, digital_signature: str) -> b
             "status": "SUBMITTED"
         }).execute()
         
-        if moa_response.data:
-            return True
-        return False
+        if not moa_response.data:
+            return False
+        
+        # Render the signed agreement once, with the submission timestamp from the database
+        moa = moa_response.data[0]
+        try:
+            document = generate_moa_document(moa, application_data, partner_org)
+            supabase.table("moa_submissions").update({
+                "document_url": document["url"],
+                "document_sha256": document["sha256"]
+            }).eq("moa_id", moa["moa_id"]).execute()
+        except Exception as e:
+            # The submission stands; admins get the PDF rendered from the row instead
+            st.warning(f"MoA submitted, but the PDF copy could not be stored: {e}")
+        return True
         
     except Exception as e:
         st.error(f"Error submitting MoA: {e}")
@@ -283,20 +273,22 @@ def display_active_scholar_dashboard(scholar_data, application_data, scholar_id,
     display_scholar_cert_feed(scholar_id)
 
 
+def show_more_feed_items(current_scholar_id: str):
+    """Load more button callback: show another page, fetching older items if the cache runs out"""
+    feed = get_certification_feed()
+    visible = st.session_state.get("cert_feed_visible", FEED_PAGE_SIZE) + FEED_PAGE_SIZE
+    if len(feed.items_for(current_scholar_id)) < visible:
+        feed.load_more()
+    st.session_state.cert_feed_visible = visible
+
+
 def display_scholar_cert_feed(current_scholar_id):
-    """Show a feed of recent certifications from all scholars except the current user, in 3 columns per row."""
-    supabase = get_supabase_client()
+    """Show the shared feed of recent certifications from other scholars, in two columns."""
     try:
-        response = supabase.table("certifications").select(
-            """
-            name, issuing_organization, issue_month, issue_year, credential_url, scholar_id,
-            scholars!inner(
-                application_id,
-                applications!inner(first_name, last_name)
-            )
-            """
-        ).order("created_at", desc=True).limit(30).execute()  # Fetch more for more rows
-        certs = response.data
+        feed = get_certification_feed()
+        feed.refresh()
+        visible = st.session_state.get("cert_feed_visible", FEED_PAGE_SIZE)
+        certs = feed.items_for(current_scholar_id, visible)
 
         if not certs:
             st.info("No recent certifications from other scholars yet.")
@@ -304,49 +296,28 @@ def display_scholar_cert_feed(current_scholar_id):
 
         # Create margin and content columns (just like scholar_profile.py)
         _, left_col, _, right_col, _ = st.columns([0.03, 0.8, 0.08, 0.8, 0.03])
-
-        # Use left_col and right_col for your two feed columns
-        with left_col:
-            # First column of certifications
-            for i, cert in enumerate(certs):
-                if i % 2 == 0 and cert["scholar_id"] != current_scholar_id:
-                    scholar = cert.get("scholars", {})
-                    application = scholar.get("applications", {})
-                    full_name = f"{application.get('first_name', '')} {application.get('last_name', '')}".strip()
-                    st.markdown(
-                        f'<div class="cert-feed-post">'
-                        f'<div class="cert-feed-header"><b>{full_name} just posted a new certification!</b></div>'
-                        f'<div class="cert-feed-body">'
-                        f'Certification: <b>{cert["name"]}</b><br>'
-                        f'Issued by: {cert["issuing_organization"]}<br>'
-                        f'Issued at: {cert["issue_month"]}/{cert["issue_year"]}'
-                        f'</div>',
-                        unsafe_allow_html=True
-                    )
-                    if cert.get("credential_url"):
-                        st.link_button("View", cert["credential_url"], use_container_width=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
-
-        with right_col:
-            # Second column of certifications
-            for i, cert in enumerate(certs):
-                if i % 2 == 1 and cert["scholar_id"] != current_scholar_id:
-                    scholar = cert.get("scholars", {})
-                    application = scholar.get("applications", {})
-                    full_name = f"{application.get('first_name', '')} {application.get('last_name', '')}".strip()
-                    st.markdown(
-                        f'<div class="cert-feed-post">'
-                        f'<div class="cert-feed-header"><b>{full_name} just posted a new certification!</b></div>'
-                        f'<div class="cert-feed-body">'
-                        f'Certification: <b>{cert["name"]}</b><br>'
-                        f'Issued by: {cert["issuing_organization"]}<br>'
-                        f'Issued at: {cert["issue_month"]}/{cert["issue_year"]}'
-                        f'</div>',
-                        unsafe_allow_html=True
-                    )
-                    if cert.get("credential_url"):
-                        st.link_button("View", cert["credential_url"], use_container_width=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
+        feed_cols = [left_col, right_col]
+
+        for i, cert in enumerate(certs):
+            with feed_cols[i % 2]:
+                application = cert.get("scholars", {}).get("applications", {})
+                full_name = f"{application.get('first_name', '')} {application.get('last_name', '')}".strip()
+                st.markdown(
+                    f'<div class="cert-feed-post">'
+                    f'<div class="cert-feed-header"><b>{full_name} just posted a new certification!</b></div>'
+                    f'<div class="cert-feed-body">'
+                    f'Certification: <b>{cert["name"]}</b><br>'
+                    f'Issued by: {cert["issuing_organization"]}<br>'
+                    f'Issued at: {cert["issue_month"]}/{cert["issue_year"]}'
+                    f'</div>',
+                    unsafe_allow_html=True
+                )
+                if cert.get("credential_url"):
+                    st.link_button("View", cert["credential_url"], use_container_width=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+
+        if feed.has_more(visible, current_scholar_id):
+            st.button("Load more", key="cert_feed_more", on_click=show_more_feed_items, args=(current_scholar_id,))
     except Exception as e:
         st.error(f"Error loading certification feed: {e}")
 
@@ -355,10 +326,12 @@ def upload_certification(scholar_id: str, cert_data: Dict[str, Any]) -> bool:
     supabase = get_supabase_client()
     
     try:
-        # First, upload the file to Supabase Storage (if you have it configured)
-        file_url = None
+        # First, upload the file so its URL, size and type go into the same insert
+        stored_file = {}
         if cert_data.get('file'):
-            file_url = upload_certification_file(cert_data['file'], scholar_id)
+            stored_file = upload_certification_file(cert_data['file'], scholar_id)
+            if not stored_file:
+                return False
         
         # Insert certification record
         certification_record = {
@@ -369,24 +342,34 @@ def upload_certification(scholar_id: str, cert_data: Dict[str, Any]) -> bool:
             'issue_year': cert_data['issue_date'].year,
             'expiration_month': cert_data['expiry_date'].month if cert_data['expiry_date'] else None,
             'expiration_year': cert_data['expiry_date'].year if cert_data['expiry_date'] else None,
-            'certificate_file_url': file_url,
+            'certificate_file_url': stored_file.get('url'),
             'credential_url': cert_data.get('credential_url', None)
         }
+        if stored_file:
+            certification_record.update({
+                'certificate_file_size': stored_file['size'],
+                'certificate_mime_type': stored_file['mime_type'],
+                'certificate_sha256': stored_file['sha256']
+            })
         
         response = supabase.table("certifications").insert(certification_record).execute()
         
-        return len(response.data) > 0
+        if not response.data:
+            return False
+        add_certification_to_profile_bundle(response.data[0])
+        get_certification_feed().invalidate()
+        return True
     except Exception as e:
         st.error(f"Error uploading certification: {e}")
         return False
 
-def upload_certification_file(uploaded_file, scholar_id: str) -> Optional[str]:
-    """Upload certification file to storage"""
+def upload_certification_file(uploaded_file, scholar_id: str) -> Optional[Dict[str, Any]]:
+    """Upload certification file to storage; identical files are stored once"""
     try:
-        # Placeholder implementation
-        file_name = f"cert_{scholar_id}_{uploaded_file.name}"
-        st.info(f"File upload feature coming soon. File: {file_name}")
-        return f"placeholder_url/{file_name}"
+        stored_file = store_file(uploaded_file, uploaded_file.name, "certificates", uploaded_file.type)
+        # Thumbnails are rendered in the background from the upload already in memory
+        get_thumbnail_service().submit(stored_file['sha256'], stored_file['mime_type'], source=uploaded_file)
+        return stored_file
     except Exception as e:
         st.error(f"Error uploading file: {e}")
         return None
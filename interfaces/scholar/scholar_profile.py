@@ -1,19 +1,27 @@
 import streamlit as st
 from datetime import datetime, date
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from utils.auth import require_auth, get_current_user
 from utils.db import get_supabase_client
+from utils.queries import get_profile_bundle, PROFILE_BUNDLE_KEY
+from services.certification_feed import get_certification_feed
+from services.thumbnail_service import get_certificate_thumbnails
 from utils.applications import get_countries, get_provinces, get_universities_by_country  # Add university function
 
 def scholar_profile_page():
     """Main profile page function with side-by-side layout"""
     require_auth('scholar')
     user = get_current_user()
-    
-    scholar_data = user['data']
-    application_data = scholar_data['applications']
     scholar_id = user['scholar_id']
     
+    bundle = get_profile_bundle(scholar_id)
+    if not bundle:
+        st.error("Could not load your profile. Please try again later.")
+        return
+    
+    scholar_data = bundle['scholar']
+    application_data = bundle['application']
+    
     st.title("My Profile")
     
     # Two-column layout: Profile on left, Certifications on right
@@ -23,7 +31,7 @@ def scholar_profile_page():
         display_profile_section(scholar_data, application_data, scholar_id)
     
     with cert_col:
-        display_certifications_section(scholar_id)
+        display_certifications_section(bundle['certifications'])
 
 def display_profile_section(scholar_data, application_data, scholar_id):
     """Display profile information and editing on the left side"""
@@ -64,13 +72,13 @@ def display_profile_section(scholar_data, application_data, scholar_id):
     if st.session_state.edit_mode:
         st.success("**Edit Mode Active** - Only editable fields are shown below for easier editing.")
         # Show only editable fields when in edit mode
-        display_editable_fields_only(scholar_data, application_data, scholar_id)
+        display_editable_fields_only(application_data)
     else:
         st.info("**View Mode** - All profile information is displayed below.")
         # Show all fields in read-only mode
         display_all_profile_fields(scholar_data, application_data, age, scholar_since, duration)
 
-def display_editable_fields_only(scholar_data, application_data, scholar_id):
+def display_editable_fields_only(application_data):
     """Display only the editable fields when in edit mode"""
     
     st.markdown("### Editable Information")
@@ -109,7 +117,7 @@ def display_editable_fields_only(scholar_data, application_data, scholar_id):
         if current_state and current_state in provinces:
             state_index = provinces.index(current_state)
         
-        state = st.selectbox(
+        st.selectbox(
             "State/Province", 
             options=provinces, 
             index=state_index, 
@@ -119,7 +127,7 @@ def display_editable_fields_only(scholar_data, application_data, scholar_id):
 
     col1, col2 = st.columns(2)
     with col1:
-        city = st.text_input("City", value=application_data.get('city', ''), help="Enter your city")
+        st.text_input("City", value=application_data.get('city', ''), help="Enter your city", key="edit_city")
     with col2:
         # Handle postal code properly
         postal_value = application_data.get('postal_code', '')
@@ -128,18 +136,19 @@ def display_editable_fields_only(scholar_data, application_data, scholar_id):
         else:
             postal_value = str(postal_value) if postal_value else ''
         
-        postal = st.text_input("Postal Code", value=postal_value, help="Enter your postal code")
+        st.text_input("Postal Code", value=postal_value, help="Enter your postal code", key="edit_postal")
     
     st.divider()
 
     # Education Information - moved to top in edit mode
     st.markdown("**Education Information**")
 
-    education_status = st.selectbox(
+    st.selectbox(
         "Education Status",
         options=["CURRENTLY_ENROLLED", "FRESH_GRADUATE", "GRADUATE", "GAP_YEAR"],
         index=["CURRENTLY_ENROLLED", "FRESH_GRADUATE", "GRADUATE", "GAP_YEAR"].index(application_data.get('education_status', 'CURRENTLY_ENROLLED')),
-        help="Select your current education status"
+        help="Select your current education status",
+        key="edit_education_status"
     )
     
     # Institution Country - dropdown using get_countries()
@@ -159,9 +168,6 @@ def display_editable_fields_only(scholar_data, application_data, scholar_id):
         key="edit_institution_country"
     )
     
-    # Initialize institution_name to None at the start
-    institution_name = None
-    
     # Check if the institution country has changed
     if 'previous_institution_country' not in st.session_state:
         st.session_state.previous_institution_country = current_institution_country
@@ -223,19 +229,17 @@ def display_editable_fields_only(scholar_data, application_data, scholar_id):
             
             # If user selects "Type manually...", show text input
             if selected_university == "Type manually...":
-                institution_name = st.text_input(
+                st.text_input(
                     "Enter University Name", 
                     value=current_institution if current_institution else "",
                     help="Type your university name manually",
                     key="edit_institution_manual"
                 )
-            else:
-                institution_name = selected_university
                 
         else:
             # Fallback to manual input when API fails or no universities found
             st.info("University lookup unavailable. Please enter manually.")
-            institution_name = st.text_input(
+            st.text_input(
                 "University/Institution", 
                 value=current_institution if current_institution else "",
                 help="Enter your university name",
@@ -243,7 +247,7 @@ def display_editable_fields_only(scholar_data, application_data, scholar_id):
             )
     else:
         st.info("Please select the institution country first to load available universities.")
-        institution_name = st.text_input(
+        st.text_input(
             "University/Institution", 
             value="",  # Always empty when no country selected
             disabled=True,
@@ -255,46 +259,62 @@ def display_editable_fields_only(scholar_data, application_data, scholar_id):
     # Save and Cancel buttons
     col1, col2 = st.columns(2)
     
+    # Both buttons act in callbacks, before the page renders again, so no extra rerun is needed
     with col1:
-        if st.button("Save Changes", type="primary", use_container_width=True):
-            # Validate required fields
-            if not institution_country:
-                st.error("Institution Country is required")
-                return
-            if not institution_name:
-                st.error("University/Institution name is required")
-                return
-                
-            # Update editable fields
-            update_data = {
-                'country': country,
-                'state_region_province': state,
-                'city': city,
-                'postal_code': postal,
-                'education_status': education_status,
-                'institution_name': institution_name,
-                'institution_country': institution_country
-            }
-            
-            if update_scholar_profile(update_data, scholar_id):
-                st.success("Profile updated successfully!")
-                # Clear university cache and tracking after successful update
-                if 'university_cache' in st.session_state:
-                    del st.session_state.university_cache
-                if 'previous_institution_country' in st.session_state:
-                    del st.session_state.previous_institution_country
-                st.session_state.edit_mode = False
-                st.rerun()
-            else:
-                st.error("Failed to update profile")
+        st.button(
+            "Save Changes", type="primary", use_container_width=True,
+            on_click=save_profile_changes, args=(application_data['application_id'],)
+        )
     
     with col2:
-        if st.button("Cancel", use_container_width=True):
-            # Clear tracking state on cancel
-            if 'previous_institution_country' in st.session_state:
-                del st.session_state.previous_institution_country
-            st.session_state.edit_mode = False
-            st.rerun()
+        st.button("Cancel", use_container_width=True, on_click=leave_edit_mode)
+
+def selected_institution_name() -> Optional[str]:
+    """Institution name from whichever university widget was shown in edit mode"""
+    dropdown = st.session_state.get("edit_institution_dropdown")
+    if dropdown and dropdown != "Type manually...":
+        return dropdown
+    return st.session_state.get("edit_institution_manual") or st.session_state.get("edit_institution_text")
+
+def leave_edit_mode():
+    """Switch back to view mode and forget the university lookups made while editing"""
+    for key in ('university_cache', 'previous_institution_country'):
+        if key in st.session_state:
+            del st.session_state[key]
+    st.session_state.edit_mode = False
+
+def save_profile_changes(application_id: str):
+    """Save button callback: write the editable fields and update the cached bundle in place"""
+    institution_country = st.session_state.get("edit_institution_country")
+    institution_name = selected_institution_name()
+    
+    # Validate required fields
+    if not institution_country:
+        st.error("Institution Country is required")
+        return
+    if not institution_name:
+        st.error("University/Institution name is required")
+        return
+    
+    # Update editable fields
+    update_data = {
+        'country': st.session_state.get("edit_country"),
+        'state_region_province': st.session_state.get("edit_state"),
+        'city': st.session_state.get("edit_city"),
+        'postal_code': st.session_state.get("edit_postal"),
+        'education_status': st.session_state.get("edit_education_status"),
+        'institution_name': institution_name,
+        'institution_country': institution_country
+    }
+    
+    if update_scholar_profile(update_data, application_id):
+        bundle = st.session_state.get(PROFILE_BUNDLE_KEY)
+        if bundle:
+            bundle['application'].update(update_data)
+        leave_edit_mode()
+        st.success("Profile updated successfully!")
+    else:
+        st.error("Failed to update profile")
 
 def display_all_profile_fields(scholar_data, application_data, age, scholar_since, duration):
     """Display all profile fields in read-only mode"""
@@ -365,31 +385,30 @@ def display_all_profile_fields(scholar_data, application_data, age, scholar_sinc
     with col2:
         st.text_input("University/Institution", value=application_data.get('institution_name', ''), disabled=True, help="Toggle 'Edit Mode' to change")
 
-def display_certifications_section(scholar_id):
+def display_certifications_section(certifications: List[Dict[str, Any]]):
     """Display certifications section on the right side"""
     
     st.subheader("Certifications")
     
     # Display existing certifications - more compact
-    display_existing_certifications_compact(scholar_id)
+    display_existing_certifications_compact(certifications)
 
-def display_existing_certifications_compact(scholar_id: str):
-    """Display existing certifications in a compact format"""
-    supabase = get_supabase_client()
-    
+def display_existing_certifications_compact(certifications: List[Dict[str, Any]]):
+    """Display existing certifications from the profile bundle in a compact format"""
     try:
-        response = supabase.table("certifications").select("*").eq("scholar_id", scholar_id).execute()
-        certifications = response.data
-        
         if certifications:
             st.markdown(f"**Your Certifications ({len(certifications)})**")
             
             for i, cert in enumerate(certifications):
+                # Only the small WebP is sent to the page; it appears once the worker has made it
+                thumbnails = get_certificate_thumbnails(cert)
                 with st.container():
                     # Create a row: left for cert info, right for buttons
                     row_col1, row_col2 = st.columns([3, 1], gap="small", vertical_alignment="center")
                     
                     with row_col1:
+                        if thumbnails:
+                            st.image(thumbnails['thumbnail'], width=120)
                         st.markdown(f"**{cert['name']}**")
                         st.caption(f"Issued by: {cert['issuing_organization']}")
                         st.caption(f"Issued: {cert['issue_month']}/{cert['issue_year']}")
@@ -403,10 +422,12 @@ def display_existing_certifications_compact(scholar_id: str):
                         # Place buttons at the top right
                         if cert.get('credential_url'):
                             st.link_button("View", cert['credential_url'], use_container_width=True)
-                        if st.button("Delete", key=f"delete_cert_{cert['certification_id']}", type="secondary", use_container_width=True):
-                            if delete_certification(cert['certification_id']):
-                                st.success("Deleted!")
-                                st.rerun()
+                        if thumbnails:
+                            st.link_button("Preview", thumbnails['preview'], use_container_width=True)
+                        st.button(
+                            "Delete", key=f"delete_cert_{cert['certification_id']}", type="secondary",
+                            use_container_width=True, on_click=remove_certification, args=(cert['certification_id'],)
+                        )
                 st.divider()
         else:
             st.info("No certifications yet.")
@@ -451,16 +472,11 @@ def calculate_age(birth_date) -> int:
     except Exception:
         return 0
 
-def update_scholar_profile(profile_data: Dict[str, Any], scholar_id: str) -> bool:
-    """Update scholar profile information"""
+def update_scholar_profile(profile_data: Dict[str, Any], application_id: str) -> bool:
+    """Update scholar profile information on the scholar's application"""
     supabase = get_supabase_client()
     
     try:
-        # Get application_id for this scholar
-        application_id = get_application_id_by_scholar_id(scholar_id)
-        if not application_id:
-            return False
-        
         # Update the applications table (where profile data is stored)
         response = supabase.table("applications").update(profile_data).eq(
             "application_id", application_id
@@ -471,20 +487,6 @@ def update_scholar_profile(profile_data: Dict[str, Any], scholar_id: str) -> boo
         st.error(f"Error updating profile: {e}")
         return False
 
-def get_application_id_by_scholar_id(scholar_id: str) -> Optional[str]:
-    """Get application_id for a scholar"""
-    supabase = get_supabase_client()
-    
-    try:
-        response = supabase.table("scholars").select("application_id").eq("scholar_id", scholar_id).execute()
-        
-        if response.data:
-            return response.data[0]["application_id"]
-        return None
-    except Exception as e:
-        st.error(f"Error fetching application ID: {e}")
-        return None
-
 def delete_certification(certification_id: str) -> bool:
     """Delete a certification"""
     supabase = get_supabase_client()
@@ -496,3 +498,13 @@ def delete_certification(certification_id: str) -> bool:
         st.error(f"Error deleting certification: {e}")
         return False
 
+def remove_certification(certification_id: str):
+    """Delete button callback: delete the certification and drop it from the cached bundle"""
+    if delete_certification(certification_id):
+        get_certification_feed().remove(certification_id)
+        bundle = st.session_state.get(PROFILE_BUNDLE_KEY)
+        if bundle:
+            bundle['certifications'] = [
+                cert for cert in bundle['certifications'] if cert['certification_id'] != certification_id
+            ]
+        st.toast("Deleted!")
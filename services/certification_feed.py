@@ -0,0 +1,122 @@
+# services/certification_feed.py - Shared recent-certifications feed for the scholar dashboard
+import streamlit as st
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from utils.db import get_supabase_client
+
+# The feed is the same for every scholar, so one copy per process serves all sessions
+FEED_TTL_SECONDS = 30
+FEED_PAGE_SIZE = 30
+FEED_MAX_ITEMS = 300
+
+FEED_COLUMNS = (
+    "certification_id, name, issuing_organization, issue_month, issue_year, credential_url, "
+    "scholar_id, created_at, scholars!inner(applications!inner(first_name, last_name))"
+)
+
+
+def _keyset_filter(op: str, cert: Dict[str, Any]) -> str:
+    """PostgREST or= filter for rows before (lt) or after (gt) cert in (created_at, certification_id) order"""
+    created_at = cert["created_at"]
+    cert_id = cert["certification_id"]
+    return (
+        f'created_at.{op}."{created_at}",'
+        f'and(created_at.eq."{created_at}",certification_id.{op}.{cert_id})'
+    )
+
+
+class CertificationFeed:
+    """
+    Newest-first certifications, cached once per process.
+
+    refresh() only asks for rows newer than the cached head (the high-water mark),
+    load_more() pages backwards from the cached tail, and sessions filter the
+    shared list themselves instead of querying per user.
+    """
+
+    def __init__(self, ttl_seconds: float = FEED_TTL_SECONDS, page_size: int = FEED_PAGE_SIZE,
+                 max_items: int = FEED_MAX_ITEMS):
+        self.ttl_seconds = ttl_seconds
+        self.page_size = page_size
+        self.max_items = max_items
+        self.items: List[Dict[str, Any]] = []
+        self.exhausted = False
+        self.refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fetch(self, keyset: Optional[str] = None) -> List[Dict[str, Any]]:
+        supabase = get_supabase_client()
+        query = supabase.table("certifications").select(FEED_COLUMNS)
+        if keyset:
+            query = query.or_(keyset)
+        return query.order("created_at", desc=True).order(
+            "certification_id", desc=True
+        ).limit(self.page_size).execute().data
+
+    def refresh(self, force: bool = False):
+        """Pull certifications newer than the high-water mark once the TTL has passed"""
+        if not force and time.time() - self.refreshed_at < self.ttl_seconds:
+            return
+        with self._lock:
+            # Another session may have refreshed while this one waited for the lock
+            if not force and time.time() - self.refreshed_at < self.ttl_seconds:
+                return
+            if not self.items:
+                rows = self._fetch()
+                self.items = rows
+                self.exhausted = len(rows) < self.page_size
+            else:
+                rows = self._fetch(_keyset_filter("gt", self.items[0]))
+                if len(rows) == self.page_size:
+                    # A full page of new rows may leave a gap; start over from the newest page
+                    self.items = rows
+                    self.exhausted = False
+                elif rows:
+                    self.items = (rows + self.items)[:self.max_items]
+            self.refreshed_at = time.time()
+
+    def load_more(self) -> bool:
+        """Append the next older page; returns False once there is nothing older"""
+        with self._lock:
+            if self.exhausted or len(self.items) >= self.max_items:
+                return False
+            if not self.items:
+                rows = self._fetch()
+            else:
+                rows = self._fetch(_keyset_filter("lt", self.items[-1]))
+            self.items = self.items + rows
+            self.exhausted = len(rows) < self.page_size
+            return bool(rows)
+
+    def has_more(self, visible: int, scholar_id: Optional[str] = None) -> bool:
+        """Whether a session showing `visible` items could show more"""
+        cached = len(self.items_for(scholar_id))
+        return visible < cached or not (self.exhausted or len(self.items) >= self.max_items)
+
+    def items_for(self, scholar_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The cached feed without the given scholar's own certifications"""
+        items = [cert for cert in self.items if cert["scholar_id"] != scholar_id]
+        return items if limit is None else items[:limit]
+
+    def invalidate(self):
+        """Make the next read check for new certifications, e.g. after one is added"""
+        self.refreshed_at = 0.0
+
+    def remove(self, certification_id: str):
+        """Drop a deleted certification; the high-water mark never sees deletions"""
+        with self._lock:
+            self.items = [cert for cert in self.items if cert["certification_id"] != certification_id]
+
+    def clear(self):
+        """Forget everything, e.g. after a certification is edited"""
+        with self._lock:
+            self.items = []
+            self.exhausted = False
+            self.refreshed_at = 0.0
+
+
+@st.cache_resource(show_spinner=False)
+def get_certification_feed() -> CertificationFeed:
+    """Process-wide certification feed"""
+    return CertificationFeed()
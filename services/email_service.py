@@ -14,10 +14,24 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def email_backend():
+    """'smtp' (default) or 'log', from [email] backend in secrets or EMAIL_BACKEND"""
+    try:
+        backend = st.secrets.get("email", {}).get("backend")
+    except Exception:
+        backend = None
+    return backend or os.environ.get("EMAIL_BACKEND", "smtp")
+
+
 class EmailService:
     """Gmail SMTP email service"""
     
     def __init__(self):
+        self.backend = email_backend()
+        if self.backend == "log":
+            # Load tests and local runs: emails are logged, never sent
+            self.sender_email = "noreply@localhost"
+            return
         self.smtp_server = st.secrets.email["smtp_server"]
         self.smtp_port = st.secrets.email["smtp_port"]
         self.sender_email = st.secrets.email["sender_email"]
@@ -25,6 +39,9 @@ class EmailService:
     
     def send_email(self, to_email: str, subject: str, html_content: str, text_content: str = None) -> bool:
         """Send email using Gmail SMTP"""
+        if self.backend == "log":
+            logger.info(f"Email not sent (log backend) to {to_email}: {subject}")
+            return True
         try:
             message = MIMEMultipart("alternative")
             message["Subject"] = subject
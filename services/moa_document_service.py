@@ -0,0 +1,173 @@
+# services/moa_document_service.py - Signed MoA text and PDF rendering, stored by content hash
+import streamlit as st
+import io
+import logging
+import textwrap
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from services.storage_service import get_storage_backend, store_file
+from utils.formatting import format_timestamp, LONG_DATETIME_FORMAT
+
+logger = logging.getLogger(__name__)
+
+MOA_FOLDER = "moa"
+
+# Letter size in points, 10pt Helvetica
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN = 54
+FONT_SIZE = 10
+LINE_HEIGHT = 14
+WRAP_WIDTH = 95
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+
+@lru_cache(maxsize=32)
+def moa_terms(partner_org: str) -> str:
+    """Terms, benefits and responsibilities; identical for every applicant of a partner org"""
+    return f"""TERMS AND CONDITIONS:
+1. I agree to actively participate in the {partner_org} data science program
+2. I commit to completing assigned coursework and projects
+3. I will follow all community guidelines and code of conduct
+4. I will work towards program completion within the designated timeframe
+5. I understand that failure to participate may result in program termination
+
+BENEFITS:
+- Free access to premium {partner_org} courses
+- Industry-recognized certifications
+- Career support and job placement assistance
+- Access to scholar community and networking opportunities
+- Personalized learning paths and mentorship
+
+RESPONSIBILITIES:
+- Regular participation in courses and assignments
+- Professional conduct in all program interactions
+- Honest reporting of progress and challenges
+- Active engagement with the scholar community
+- Commitment to sharing success stories and helping future scholars
+
+By signing below, I acknowledge that I have read, understood, and agree to all terms and conditions outlined in this Memorandum of Agreement."""
+
+
+def moa_text(partner_org: str, applicant: Dict[str, Any], approved_applicant_id: str) -> str:
+    """Full MoA text shown to the applicant before signing"""
+    return f"""MEMORANDUM OF AGREEMENT - {partner_org} Data Science Scholarship
+
+Applicant: {applicant['first_name']} {applicant['last_name']}
+Email: {applicant['email']}
+Approved Applicant ID: {approved_applicant_id}
+
+{moa_terms(partner_org)}"""
+
+
+def signed_moa_text(partner_org: str, applicant: Dict[str, Any], approved_applicant_id: str,
+                    moa_id: str, digital_signature: str, submitted_at: str) -> str:
+    """MoA text with the signature block, as stored in the PDF"""
+    return f"""{moa_text(partner_org, applicant, approved_applicant_id)}
+
+SIGNATURE:
+Digital Signature: {digital_signature}
+Signed: {format_timestamp(submitted_at, LONG_DATETIME_FORMAT)}
+MoA ID: {moa_id}"""
+
+
+def _pdf_string(line: str) -> str:
+    # Base-14 fonts only cover WinAnsi; anything else is replaced rather than failing the submission
+    line = line.encode("cp1252", "replace").decode("latin-1")
+    return "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def render_pdf(text: str, title: str = "") -> bytes:
+    """
+    Render plain text as a paginated PDF with a built-in font.
+
+    The output is deterministic (no creation date), so the same signed MoA
+    always hashes to the same stored file.
+    """
+    lines: List[str] = []
+    for paragraph in text.splitlines():
+        lines.extend(textwrap.wrap(paragraph, WRAP_WIDTH) or [""])
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    # Objects 1-3 are the catalog, page tree and font; each page adds a page and a content stream
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] /Count {len(pages)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        body = " T* ".join(f"{_pdf_string(line)} Tj" for line in page_lines)
+        stream = (
+            f"BT /F1 {FONT_SIZE} Tf {LINE_HEIGHT} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td {body} ET"
+        ).encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        )
+        objects.append(stream)
+    if title:
+        objects.append(f"<< /Title {_pdf_string(title)} >>")
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        if isinstance(obj, bytes):
+            output.write(f"{number} 0 obj\n<< /Length {len(obj)} >>\nstream\n".encode("latin-1"))
+            output.write(obj + b"\nendstream\nendobj\n")
+        else:
+            output.write(f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1"))
+
+    xref_offset = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    info = f" /Info {len(objects)} 0 R" if title else ""
+    output.write(
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R{info} >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("latin-1")
+    )
+    return output.getvalue()
+
+
+def generate_moa_document(moa: Dict[str, Any], applicant: Dict[str, Any], partner_org: str) -> Dict[str, Any]:
+    """
+    Render a submitted MoA to PDF once and store it under its content hash.
+
+    Returns url, path, sha256, size and mime_type for the moa_submissions row.
+    """
+    text = signed_moa_text(
+        partner_org, applicant, moa["approved_applicant_id"],
+        moa["moa_id"], moa["digital_signature"], moa["submitted_at"]
+    )
+    pdf = render_pdf(text, title=f"Memorandum of Agreement - {moa['approved_applicant_id']}")
+    return store_file(io.BytesIO(pdf), "moa.pdf", MOA_FOLDER, "application/pdf")
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _read_stored_moa_pdf(document_sha256: str, path: str) -> bytes:
+    """Stored MoA PDF bytes; keyed by content hash, so cached copies never go stale"""
+    return get_storage_backend().read(path)
+
+
+def load_stored_moa_pdf(document_sha256: str, document_url: str) -> Optional[bytes]:
+    """
+    Stored MoA PDF bytes, or None when the URL is not ours or the read fails.
+    Misses are not cached, so a document that shows up later is picked up on the next call.
+    """
+    path = get_storage_backend().path_from_url(document_url)
+    if not path:
+        return None
+    try:
+        return _read_stored_moa_pdf(document_sha256, path)
+    except Exception as e:
+        logger.warning(f"Could not read stored MoA {document_sha256}: {e}")
+        return None
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_moa_pdf(partner_org: str, applicant: Dict[str, Any], approved_applicant_id: str,
+                   moa_id: str, digital_signature: str, submitted_at: str) -> bytes:
+    """PDF for an MoA submitted before documents were stored; rendered once per submission"""
+    text = signed_moa_text(partner_org, applicant, approved_applicant_id, moa_id, digital_signature, submitted_at)
+    return render_pdf(text, title=f"Memorandum of Agreement - {approved_applicant_id}")
@@ -0,0 +1,196 @@
+# services/storage_service.py - Certificate file storage on Supabase Storage or the local filesystem
+import streamlit as st
+import hashlib
+import io
+import mimetypes
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+from utils.assets import STATIC_DIR
+from utils.db import get_supabase_client
+
+CHUNK_SIZE = 1024 * 1024
+CERTIFICATE_BUCKET = "certificates"
+
+# Served by Streamlit static serving (enableStaticServing in .streamlit/config.toml)
+LOCAL_UPLOAD_DIR = STATIC_DIR / "uploads"
+LOCAL_UPLOAD_URL = "/app/static/uploads"
+
+
+def _iter_chunks(fileobj: BinaryIO):
+    """Yield the file in CHUNK_SIZE pieces; in-memory uploads are sliced without copying"""
+    if hasattr(fileobj, "getbuffer"):
+        buffer = fileobj.getbuffer()
+        for start in range(0, len(buffer), CHUNK_SIZE):
+            yield buffer[start:start + CHUNK_SIZE]
+        return
+    fileobj.seek(0)
+    while chunk := fileobj.read(CHUNK_SIZE):
+        yield chunk
+
+
+def hash_file(fileobj: BinaryIO) -> Tuple[str, int]:
+    """SHA-256 hex digest and size of a file, read chunk by chunk"""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in _iter_chunks(fileobj):
+        digest.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+# Leading bytes of the file types the app accepts, with their MIME type and extension
+FILE_SIGNATURES = [
+    (b"%PDF-", "application/pdf", ".pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", ".png"),
+    (b"\xff\xd8\xff", "image/jpeg", ".jpg"),
+]
+
+
+def sniff_file_type(fileobj: BinaryIO) -> Optional[Tuple[str, str]]:
+    """(MIME type, extension) read from the file's first bytes, or None for other types"""
+    fileobj.seek(0)
+    head = fileobj.read(16)
+    fileobj.seek(0)
+    for signature, mime_type, extension in FILE_SIGNATURES:
+        if head.startswith(signature):
+            return mime_type, extension
+    return None
+
+
+def content_path(folder: str, sha256: str, extension: str = "") -> str:
+    """
+    Storage path derived from the content only, so identical files share one object
+    whatever they were called. The extension comes from the sniffed type, because
+    static serving picks the Content-Type from it.
+    """
+    return f"{folder}/{sha256[:2]}/{sha256}{extension}"
+
+
+class SupabaseStorage:
+    """Objects in a Supabase Storage bucket"""
+
+    def __init__(self, bucket: str = CERTIFICATE_BUCKET):
+        self.bucket = bucket
+
+    def save(self, path: str, fileobj: BinaryIO, mime_type: str):
+        """Upload unless the object exists; the file is streamed from its buffer, not copied"""
+        storage = get_supabase_client().storage.from_(self.bucket)
+        try:
+            # storage3 only streams BufferedReader/FileIO objects; wrapping the upload avoids a bytes copy
+            storage.upload(path, _as_reader(fileobj), {"content-type": mime_type, "upsert": "false"})
+        except Exception as e:
+            # Content-addressed paths mean an existing object already holds these bytes
+            if "Duplicate" not in str(e) and "already exists" not in str(e):
+                raise
+
+    def url(self, path: str) -> str:
+        return get_supabase_client().storage.from_(self.bucket).get_public_url(path)
+
+    def exists(self, path: str) -> bool:
+        return get_supabase_client().storage.from_(self.bucket).exists(path)
+
+    def read(self, path: str) -> bytes:
+        return get_supabase_client().storage.from_(self.bucket).download(path)
+
+    def path_from_url(self, url: str) -> Optional[str]:
+        """Object path inside the bucket for a URL returned by url(), or None for foreign URLs"""
+        marker = f"/public/{self.bucket}/"
+        if marker not in url:
+            return None
+        return url.split(marker, 1)[1].split("?", 1)[0]
+
+
+class LocalStorage:
+    """Files under static/uploads, for development without Supabase Storage"""
+
+    def __init__(self, root: Path = LOCAL_UPLOAD_DIR, base_url: str = LOCAL_UPLOAD_URL):
+        self.root = Path(root)
+        self.base_url = base_url
+
+    def save(self, path: str, fileobj: BinaryIO, mime_type: str):
+        """Write through a temporary file and rename, so readers never see a partial file"""
+        target = self.root / path
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=target.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in _iter_chunks(fileobj):
+                    out.write(chunk)
+            os.replace(temp_path, target)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+        finally:
+            fileobj.seek(0)
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path}"
+
+    def exists(self, path: str) -> bool:
+        return (self.root / path).exists()
+
+    def read(self, path: str) -> bytes:
+        return (self.root / path).read_bytes()
+
+    def path_from_url(self, url: str) -> Optional[str]:
+        """File path under the upload root for a URL returned by url(), or None for foreign URLs"""
+        prefix = f"{self.base_url}/"
+        return url[len(prefix):] if url.startswith(prefix) else None
+
+
+class _UploadReader(io.BufferedReader):
+    """BufferedReader over an in-memory upload that leaves the upload open when it is discarded"""
+
+    def close(self):
+        pass
+
+
+def _as_reader(fileobj: BinaryIO) -> BinaryIO:
+    """Readable buffered view of an uploaded file for storage3's multipart upload"""
+    fileobj.seek(0)
+    if hasattr(fileobj, "getbuffer"):
+        return _UploadReader(fileobj, CHUNK_SIZE)
+    return fileobj
+
+
+@st.cache_resource(show_spinner=False)
+def get_storage_backend():
+    """Storage backend from [storage] backend in secrets or STORAGE_BACKEND: 'supabase' (default) or 'local'"""
+    try:
+        backend = st.secrets.get("storage", {}).get("backend")
+    except Exception:
+        backend = None
+    backend = backend or os.environ.get("STORAGE_BACKEND", "supabase")
+    if backend == "local":
+        return LocalStorage()
+    return SupabaseStorage()
+
+
+def store_file(fileobj: BinaryIO, filename: str, folder: str, mime_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Store an uploaded file under its content hash.
+
+    Returns url, path, sha256, size and mime_type for the database row.
+    """
+    sha256, size = hash_file(fileobj)
+    sniffed = sniff_file_type(fileobj)
+    if sniffed:
+        mime_type, extension = sniffed
+    else:
+        mime_type, extension = mime_type or mimetypes.guess_type(filename)[0] or "application/octet-stream", ""
+    path = content_path(folder, sha256, extension)
+
+    backend = get_storage_backend()
+    backend.save(path, fileobj, mime_type)
+    return {
+        "url": backend.url(path),
+        "path": path,
+        "sha256": sha256,
+        "size": size,
+        "mime_type": mime_type
+    }
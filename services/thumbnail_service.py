@@ -0,0 +1,163 @@
+# services/thumbnail_service.py - Background WebP thumbnails and previews for certificate files
+import streamlit as st
+import io
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+from services.storage_service import get_storage_backend
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (240, 240)
+PREVIEW_SIZE = (1024, 1024)
+WEBP_QUALITY = 80
+THUMBNAIL_WORKERS = 2
+THUMBNAIL_FOLDER = "thumbnails"
+
+PENDING, READY, FAILED = "pending", "ready", "failed"
+
+# Failed hashes are tried again after this long (storage hiccups, pypdfium2 installed later)
+FAILED_RETRY_SECONDS = 600
+# Oldest settled entries are forgotten past this many; a forgotten READY hash is re-marked
+# on its next request without rendering, since the files are already in storage
+MAX_TRACKED_FILES = 10000
+
+
+def thumbnail_paths(sha256: str) -> Dict[str, str]:
+    """Storage paths of the thumbnail and preview for a file hash"""
+    base = f"{THUMBNAIL_FOLDER}/{sha256[:2]}/{sha256}"
+    return {"thumbnail": f"{base}-thumb.webp", "preview": f"{base}-preview.webp"}
+
+
+def _open_image(source: Union[bytes, BinaryIO], mime_type: str, size):
+    """First page or frame of a certificate file as a PIL image, or None if the type is not supported"""
+    from PIL import Image, ImageOps
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    source.seek(0)
+
+    if mime_type == "application/pdf":
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            # PDF previews need pypdfium2; without it PDFs simply get no thumbnail
+            return None
+        page = pdfium.PdfDocument(source)[0]
+        scale = max(size) / max(page.get_size())
+        return page.render(scale=scale).to_pil()
+
+    if not mime_type.startswith("image/"):
+        return None
+    image = Image.open(source)
+    # JPEGs can be decoded at a fraction of full resolution, which is most of the cost
+    image.draft("RGB", size)
+    return ImageOps.exif_transpose(image)
+
+
+def _encode_webp(image, size) -> io.BytesIO:
+    resized = image.copy()
+    resized.thumbnail(size)
+    if resized.mode not in ("RGB", "RGBA"):
+        resized = resized.convert("RGBA" if "A" in resized.getbands() else "RGB")
+    output = io.BytesIO()
+    resized.save(output, "WEBP", quality=WEBP_QUALITY)
+    output.seek(0)
+    return output
+
+
+class ThumbnailService:
+    """
+    Generates a thumbnail and a first-page preview per file hash on a small thread pool.
+
+    Results are stored next to the uploads and tracked in memory, so each hash is
+    rendered once per deployment and pages only ever reference the small WebP files.
+    """
+
+    def __init__(self, workers: int = THUMBNAIL_WORKERS, max_tracked: int = MAX_TRACKED_FILES):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnails")
+        # sha256 -> (status, time it was set), oldest first
+        self._status: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._max_tracked = max_tracked
+        self._lock = threading.RLock()
+
+    def _set_status(self, sha256: str, status: str):
+        with self._lock:
+            self._status[sha256] = (status, time.monotonic())
+            self._status.move_to_end(sha256)
+            if len(self._status) > self._max_tracked:
+                # In-flight entries stay, so a hash is never queued twice at once
+                for key in [key for key, (state, _) in self._status.items() if state != PENDING]:
+                    if len(self._status) <= self._max_tracked:
+                        break
+                    del self._status[key]
+
+    def _generate(self, sha256: str, source: Union[bytes, BinaryIO, None], mime_type: str, source_path: Optional[str]):
+        backend = get_storage_backend()
+        try:
+            paths = thumbnail_paths(sha256)
+            if not backend.exists(paths["thumbnail"]):
+                if source is None:
+                    source = backend.read(source_path)
+                image = _open_image(source, mime_type, PREVIEW_SIZE)
+                if image is None:
+                    self._set_status(sha256, FAILED)
+                    return
+                backend.save(paths["preview"], _encode_webp(image, PREVIEW_SIZE), "image/webp")
+                backend.save(paths["thumbnail"], _encode_webp(image, THUMBNAIL_SIZE), "image/webp")
+            self._set_status(sha256, READY)
+        except Exception as e:
+            logger.error(f"Error generating thumbnail for {sha256}: {e}")
+            self._set_status(sha256, FAILED)
+
+    def submit(self, sha256: str, mime_type: str, source: Union[bytes, BinaryIO, None] = None,
+               source_path: Optional[str] = None):
+        """
+        Queue generation from the file itself, or from storage when only its path is known.
+        Hashes already pending or ready are skipped; failed ones once FAILED_RETRY_SECONDS pass.
+        """
+        with self._lock:
+            status, changed_at = self._status.get(sha256, (None, 0.0))
+            if status in (PENDING, READY) or (
+                status == FAILED and time.monotonic() - changed_at < FAILED_RETRY_SECONDS
+            ):
+                return
+            self._set_status(sha256, PENDING)
+        self._executor.submit(self._generate, sha256, source, mime_type, source_path)
+
+    def urls(self, sha256: str) -> Optional[Dict[str, str]]:
+        """Thumbnail and preview URLs once they exist, else None"""
+        if self._status.get(sha256, (None,))[0] != READY:
+            return None
+        backend = get_storage_backend()
+        return {kind: backend.url(path) for kind, path in thumbnail_paths(sha256).items()}
+
+
+@st.cache_resource(show_spinner=False)
+def get_thumbnail_service() -> ThumbnailService:
+    """Process-wide thumbnail worker pool"""
+    return ThumbnailService()
+
+
+def get_certificate_thumbnails(cert: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Thumbnail and preview URLs for a certification row, or None while they are not ready.
+
+    Files uploaded before this process started are queued the first time a page asks for them;
+    generation skips straight to READY when the WebP files are already in storage.
+    """
+    sha256 = cert.get("certificate_sha256")
+    file_url = cert.get("certificate_file_url")
+    if not sha256 or not file_url:
+        return None
+
+    service = get_thumbnail_service()
+    urls = service.urls(sha256)
+    if urls is None:
+        source_path = get_storage_backend().path_from_url(file_url)
+        if source_path:
+            service.submit(sha256, cert.get("certificate_mime_type") or "", source_path=source_path)
+    return urls
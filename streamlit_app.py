@@ -1,10 +1,12 @@
 # streamlit_app.py - Enhanced version with unified authentication
 import streamlit as st
-import os
 import interfaces as pg
-from utils.auth import is_authenticated, is_admin, is_scholar, is_approved_applicant, get_current_user, logout
+from utils.auth import resolve_auth_context, is_authenticated, is_admin, is_scholar, is_approved_applicant, get_current_user, logout
 
 from components.footer import display_footer
+from utils.assets import inject_stylesheet
+from utils.instrumentation import begin_rerun_trace, end_rerun_trace, stop_tracing, tracing_forced
+from utils.profiling import PageProfile, display_profile_summary, profiling_mode
 
 
 st.set_page_config(
@@ -13,19 +15,12 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Initialize authentication state on startup
-from utils.auth import init_auth_state
-init_auth_state()
+# Resolve who is logged in once for this run; every auth check below reuses it
+auth = resolve_auth_context()
+role = auth['role']
 
-# Load custom CSS
-parent_dir = os.path.dirname(os.path.abspath(__file__))
-css_path = os.path.join(parent_dir, "static", "styles.css")
-
-try:
-    with open(css_path) as css:
-        st.markdown(f'<style>{css.read()}</style>', unsafe_allow_html=True)
-except FileNotFoundError:
-    pass
+# Load custom CSS (read once per process, identical bytes on every rerun)
+inject_stylesheet()
 
 # Define all pages
 public_home = st.Page(page=pg.public_home_page, title='Home')
@@ -45,7 +40,7 @@ scholar_profile = st.Page(page=pg.scholar_profile_page, title='Profile')
 scholar_help = st.Page(page=pg.scholar_help_page, title='Help')
 
 # Main navigation logic
-if not is_authenticated():
+if role is None:
     # === PUBLIC NAVIGATION ===
     pg_nav = st.navigation({
         "Public Access": [public_home, public_applications, public_scholar_login, public_admin_login]
@@ -81,9 +76,9 @@ if not is_authenticated():
                         st.switch_page(public_applications)
         
 
-elif is_admin():
+elif role == 'admin':
     # === ADMIN NAVIGATION ===
-    user = get_current_user()
+    user = auth['user']
     
     if not user:
         st.error("Session expired. Please log in again.")
@@ -142,9 +137,9 @@ elif is_admin():
                             st.rerun()
         
 
-elif is_scholar() or is_approved_applicant():
+elif role in ('scholar', 'approved_applicant'):
     # === SCHOLAR & APPROVED APPLICANT NAVIGATION ===
-    user = get_current_user()
+    user = auth['user']
     
     if not user:
         st.error("Session expired. Please log in again.")
@@ -152,7 +147,7 @@ elif is_scholar() or is_approved_applicant():
         st.rerun()
     
     # Handle both scholars and approved applicants
-    if is_scholar():
+    if role == 'scholar':
         scholar_data = user['data']
         application_data = scholar_data['applications']
         scholar_name = application_data['first_name']
@@ -180,7 +175,7 @@ elif is_scholar() or is_approved_applicant():
             st.caption(f"ID: {scholar_id}")
         
         with scholar_header_col2:
-            if is_scholar():
+            if role == 'scholar':
                 st.success("Active Scholar")
             else:
                 st.warning("MoA Submission Required")
@@ -201,7 +196,7 @@ elif is_scholar() or is_approved_applicant():
 
                 with scholar_nav[2]:
                     if st.button("Help", use_container_width=True):
-                        if is_scholar():
+                        if role == 'scholar':
                             st.switch_page(scholar_help)
                         else:
                             st.info("Available after MoA approval")
@@ -218,8 +213,21 @@ elif is_scholar() or is_approved_applicant():
                             st.success("Logged out successfully!")
                             st.rerun()
 
+# Query tracing: switched on per session from the admin debug panel, or for everyone by secret
+tracing = (role == 'admin' and st.session_state.get("query_tracing")) or tracing_forced()
+if tracing:
+    begin_rerun_trace(pg_nav.title)
+else:
+    stop_tracing()
+
+# Page profiling: ?profile=1 (admins) or [debug] page_profiling in secrets
+profile_mode = profiling_mode(role)
+profile = PageProfile(pg_nav.title, profile_mode) if profile_mode else None
+
 # Run the navigation
 try:
+    if profile:
+        profile.start()
     pg_nav.run()
     display_footer()
 except Exception as e:
@@ -237,4 +245,17 @@ except Exception as e:
             user = get_current_user()
             if user:
                 st.write(f"User role: {user.get('role')}")
-                st.write(f"User email: {user.get('email')}")
\ No newline at end of file
+                st.write(f"User email: {user.get('email')}")
+finally:
+    # Also runs when the page stops early with st.rerun() or st.switch_page()
+    if tracing:
+        end_rerun_trace()
+    if profile:
+        profile.stop()
+
+if profile:
+    display_profile_summary(profile)
+
+if role == 'admin':
+    from components.query_trace_panel import display_query_trace_panel
+    display_query_trace_panel()
\ No newline at end of file
@@ -0,0 +1,14 @@
+-- supabase/migrations/20261019000000_applications_email_lower.sql - Indexed case-insensitive email lookups
+-- The application eligibility check filters on email_lower with eq. PostgREST exposes
+-- the function below as a computed column; it is inlined, so the planner uses the index.
+
+create or replace function public.email_lower(public.applications)
+returns text
+language sql
+immutable
+as $$
+    select lower($1.email)
+$$;
+
+create index if not exists applications_partner_org_email_lower_idx
+    on public.applications (partner_org_id, lower(email));
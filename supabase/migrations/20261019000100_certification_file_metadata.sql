@@ -0,0 +1,8 @@
+-- supabase/migrations/20261019000100_certification_file_metadata.sql - Stored certificate file metadata
+-- Filled only when a certificate file is uploaded. certificate_sha256 is the content hash that
+-- names the stored object and keys its thumbnails.
+
+alter table public.certifications
+    add column if not exists certificate_file_size bigint,
+    add column if not exists certificate_mime_type text,
+    add column if not exists certificate_sha256 text;
@@ -0,0 +1,7 @@
+-- supabase/migrations/20261019000200_moa_submission_documents.sql - Stored signed MoA PDFs
+-- Set right after a submission once its PDF is stored; rows submitted earlier stay null and
+-- the admin view renders their PDF from the submission instead.
+
+alter table public.moa_submissions
+    add column if not exists document_url text,
+    add column if not exists document_sha256 text;
@@ -0,0 +1,50 @@
+# tests/test_credential_lookup.py - Scholar and applicant logins must match the email exactly
+import pytest
+
+import utils.queries as queries
+from utils.local_backend import create_local_client
+
+EMAIL = "Ada.Lovelace@example.com"
+BIRTHDATE = "2000-01-31"
+
+
+@pytest.fixture
+def accounts(monkeypatch):
+    """A scholar and an approved applicant (not yet a scholar) on a fresh local backend"""
+    client = create_local_client()
+    monkeypatch.setattr(queries, "get_supabase_client", lambda: client)
+    partner_org_id = client.db.rows("partner_organizations")[0]["partner_org_id"]
+
+    def applicant(email):
+        application = client.db.load_rows("applications", [{
+            "partner_org_id": partner_org_id, "email": email, "birthdate": BIRTHDATE,
+            "first_name": "Ada", "last_name": "Lovelace", "status": "APPROVED",
+        }])[0]
+        return client.db.load_rows("approved_applicants", [{
+            "approved_applicant_id": f"APP{len(client.db.rows('approved_applicants')):08d}",
+            "application_id": application["application_id"],
+        }])[0]
+
+    scholar_source = applicant(EMAIL)
+    scholar = client.db.load_rows("scholars", [{
+        "scholar_id": "SCH00000001",
+        "application_id": scholar_source["application_id"],
+        "partner_org_id": partner_org_id,
+    }])[0]
+    return {"scholar_id": scholar["scholar_id"], "approved_applicant_id": applicant(EMAIL)["approved_applicant_id"]}
+
+
+def test_scholar_login_matches_email_case_insensitively(accounts):
+    found = queries.get_scholar_by_credentials(accounts["scholar_id"], "  ada.lovelace@EXAMPLE.com ", BIRTHDATE)
+    assert found and found["scholar_id"] == accounts["scholar_id"]
+
+
+def test_applicant_login_matches_email_case_insensitively(accounts):
+    found = queries.get_approved_applicant_by_credentials(accounts["approved_applicant_id"], EMAIL.upper(), BIRTHDATE)
+    assert found and found["approved_applicant_id"] == accounts["approved_applicant_id"]
+
+
+@pytest.mark.parametrize("email", ["*", "%", "ada%", "*@example.com", "ada.lovelace@example.co_", "_%"])
+def test_wildcard_emails_are_rejected(accounts, email):
+    assert queries.get_scholar_by_credentials(accounts["scholar_id"], email, BIRTHDATE) is None
+    assert queries.get_approved_applicant_by_credentials(accounts["approved_applicant_id"], email, BIRTHDATE) is None
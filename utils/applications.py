@@ -1,17 +1,18 @@
 # utils/applications.py - Enhanced version with better error handling
 import requests
-import pycountry
 import smtplib
 import streamlit as st
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Optional
 from services.email_service import send_otp_email as send_email_otp
+from utils.formatting import format_timestamp_series, LONG_DATE_FORMAT
 
 
 
 def _find_code(chosen_country: str) -> Optional[str]:
     """Find country code for the given country name"""
+    import pycountry
     try:
         for country in pycountry.countries:
             if country.name == chosen_country:
@@ -23,6 +24,7 @@ def _find_code(chosen_country: str) -> Optional[str]:
 
 def get_countries() -> List[str]:
     """Get list of all countries"""
+    import pycountry
     try:
         countries = [country.name for country in pycountry.countries]
         # Sort alphabetically for better UX
@@ -42,6 +44,7 @@ def get_countries() -> List[str]:
 
 def get_provinces(selected_country: str) -> List[str]:
     """Get provinces/states for the selected country"""
+    import pycountry
     try:
         country_code = _find_code(selected_country)
         if not country_code:
@@ -251,26 +254,6 @@ def get_application_status_emoji(status: str) -> str:
     return status_emojis.get(status, '⚫')
 
 
-def format_date_display(date_string: str) -> str:
-    """Format date string for display"""
-    try:
-        from datetime import datetime
-        dt = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
-        return dt.strftime('%B %d, %Y')
-    except Exception:
-        return date_string
-
-
-def format_datetime_display(datetime_string: str) -> str:
-    """Format datetime string for display"""
-    try:
-        from datetime import datetime
-        dt = datetime.fromisoformat(datetime_string.replace('Z', '+00:00'))
-        return dt.strftime('%B %d, %Y at %I:%M %p')
-    except Exception:
-        return datetime_string
-
-
 def clean_text_input(text: str, max_length: Optional[int] = None) -> str:
     """Clean and validate text input"""
     if not text:
@@ -352,12 +335,14 @@ def export_applications_to_csv(applications: List[dict], filename: str = "applic
                 'Country': app.get('country', ''),
                 'Education Status': app.get('education_status', ''),
                 'Programming Experience': app.get('programming_experience', ''),
-                'Data Science Experience': app.get('data_science_experience', ''),
-                'Applied Date': format_date_display(app.get('applied_at', ''))
+                'Data Science Experience': app.get('data_science_experience', '')
             }
             export_data.append(row)
         
         df = pd.DataFrame(export_data)
+        df['Applied Date'] = format_timestamp_series(
+            [app.get('applied_at', '') for app in applications], LONG_DATE_FORMAT
+        ).values
         return df.to_csv(index=False)
         
     except Exception as e:
@@ -0,0 +1,61 @@
+# utils/assets.py - Stylesheet loading, read and hashed once per process
+import streamlit as st
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+_CSS_STRING = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+
+def minify_css(css: str) -> str:
+    """
+    Strip comments and redundant whitespace from a stylesheet.
+    
+    Quoted strings are left untouched. Spaces before ':' and around '+'/'-'
+    are kept because they matter in selectors and calc().
+    """
+    strings = []
+    
+    def stash(match):
+        strings.append(match.group(0))
+        return f"\x00{len(strings) - 1}\x00"
+    
+    css = _CSS_STRING.sub(stash, css)
+    css = _CSS_COMMENT.sub("", css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}").strip()
+    return re.sub("\x00(\\d+)\x00", lambda m: strings[int(m.group(1))], css)
+
+
+@st.cache_resource(show_spinner=False)
+def load_stylesheet(name: str = "styles.css") -> Dict[str, str]:
+    """
+    Read, minify and hash a stylesheet from static/ once per process.
+    
+    The tag is byte-identical on every rerun, so Streamlit's message cache
+    sends the browser a hash reference instead of the stylesheet again.
+    """
+    source = (STATIC_DIR / name).read_text(encoding="utf-8")
+    css = minify_css(source)
+    content_hash = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+    return {
+        "css": css,
+        "hash": content_hash,
+        "source_size": len(source.encode("utf-8")),
+        "tag": f'<style data-stylesheet="{name}" data-hash="{content_hash}">{css}</style>'
+    }
+
+
+def inject_stylesheet(name: str = "styles.css"):
+    """Add the cached stylesheet to the page; a missing file is ignored"""
+    try:
+        stylesheet = load_stylesheet(name)
+    except FileNotFoundError:
+        return
+    st.markdown(stylesheet["tag"], unsafe_allow_html=True)
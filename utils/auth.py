@@ -1,33 +1,46 @@
 # utils/auth.py - Fixed authentication with correct table relationships
 import streamlit as st
 from utils.db import get_supabase_client
+from utils.queries import get_scholar_by_credentials, get_approved_applicant_by_credentials
 from typing import Optional, Dict, Any, Literal
 import json
 import time
 
 
+# Roles are re-verified against the database at this interval
+DEFAULT_ROLE_RECHECK_SECONDS = 300
+
+
+def _role_recheck_seconds() -> int:
+    """Role re-check interval, configurable as [auth] role_recheck_seconds in secrets"""
+    try:
+        return int(st.secrets.get("auth", {}).get("role_recheck_seconds", DEFAULT_ROLE_RECHECK_SECONDS))
+    except Exception:
+        return DEFAULT_ROLE_RECHECK_SECONDS
+
+
 def init_auth_state():
     """Initialize authentication state if not exists"""
     if 'auth_initialized' not in st.session_state:
         st.session_state.auth_initialized = True
         st.session_state.user_data = None
         st.session_state.auth_timestamp = None
-        
-        # Try to restore session from Supabase session
-        restore_supabase_session()
+        st.session_state.auth_role_checked_at = None
 
 
 def save_auth_session(user_data: Dict[str, Any]):
     """Save authentication session"""
     st.session_state.user_data = user_data
     st.session_state.auth_timestamp = time.time()
+    st.session_state.auth_role_checked_at = time.time()
+    st.session_state._auth_context = _build_auth_context(user_data)
 
 
 def clear_auth_session():
     """Clear authentication session"""
     keys_to_clear = [
-        'user_data', 'auth_timestamp', 'auth_session_token', 
-        'scholar_id', 'authenticated', 'auth_initialized'
+        'user_data', 'auth_timestamp', 'auth_role_checked_at',
+        'scholar_id', 'authenticated', 'auth_initialized', '_auth_context', '_profile_bundle'
     ]
     
     for key in keys_to_clear:
@@ -35,34 +48,64 @@ def clear_auth_session():
             del st.session_state[key]
 
 
-def restore_supabase_session():
-    """Attempt to restore authentication session from Supabase"""
+def _recheck_role(user_data: Dict[str, Any]) -> bool:
+    """Confirm the logged-in account still has its role; returns False if access was revoked"""
     try:
-        supabase = get_supabase_client()
-        session = supabase.auth.get_session()
+        if user_data.get('auth_user'):
+            role_data = get_user_role_and_data(user_data['email'])
+            return bool(role_data) and role_data['role'] == user_data['role']
         
-        if session and session.user:
-            user_email = session.user.email
-            user_role_data = get_user_role_and_data(user_email)
-            
-            if user_role_data:
-                session_data = {
-                    'auth_user': session.user,
-                    'role': user_role_data['role'],
-                    'data': user_role_data['data'],
-                    'partner_org_id': user_role_data['partner_org_id'],
-                    'permissions': user_role_data['permissions'],
-                    'email': user_email
-                }
-                
-                st.session_state.user_data = session_data
-                st.session_state.auth_timestamp = time.time()
-                return True
-    
+        if user_data['role'] == 'scholar':
+            supabase = get_supabase_client()
+            response = supabase.table("scholars").select("scholar_id").eq(
+                "scholar_id", user_data['scholar_id']
+            ).eq("is_active", True).execute()
+            return bool(response.data)
     except Exception:
-        pass
+        # Keep the session on transient errors; the next interval will check again
+        return True
     
-    return False
+    return True
+
+
+def _build_auth_context(user_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        'user': user_data,
+        'role': user_data.get('role') if user_data else None
+    }
+
+
+def resolve_auth_context() -> Dict[str, Any]:
+    """
+    Work out who is logged in, once per script run.
+    
+    streamlit_app.py calls this at the top of every run; the auth checks
+    below read the stored result instead of resolving again.
+    """
+    init_auth_state()
+    user_data = st.session_state.user_data
+    now = time.time()
+    
+    # A login lives as long as this browser session; there is no token to restore after a reload
+    if user_data is not None and now - (st.session_state.auth_role_checked_at or 0) >= _role_recheck_seconds():
+        if _recheck_role(user_data):
+            st.session_state.auth_role_checked_at = now
+        else:
+            clear_auth_session()
+            init_auth_state()
+            user_data = None
+    
+    context = _build_auth_context(user_data)
+    st.session_state._auth_context = context
+    return context
+
+
+def get_auth_context() -> Dict[str, Any]:
+    """The auth context for this run, resolving it if streamlit_app.py has not yet"""
+    context = st.session_state.get('_auth_context')
+    if context is None:
+        context = resolve_auth_context()
+    return context
 
 
 def get_user_role_and_data(user_email: str) -> Optional[Dict[str, Any]]:
@@ -141,9 +184,7 @@ def authenticate_user(email: str, password: str) -> Optional[Dict[str, Any]]:
                     'email': email
                 }
                 
-                st.session_state.user_data = session_data
-                st.session_state.auth_timestamp = time.time()
-                
+                save_auth_session(session_data)
                 return session_data
             else:
                 supabase.auth.sign_out()
@@ -158,8 +199,6 @@ def unified_scholar_login(identifier: str, email: str, birth_date: str) -> bool:
     """
     Unified login for both scholars and approved applicants
     """
-    supabase = get_supabase_client()
-    
     try:
         # First check if it's a scholar ID (starts with SCH)
         if identifier.startswith("SCH"):
@@ -182,37 +221,22 @@ def scholar_login_auth(scholar_id: str, email: str, birth_date: str) -> bool:
     """
     Authentication for scholars using ID, email, and birth date
     """
-    supabase = get_supabase_client()
-    
     try:
-        response = supabase.table("scholars").select(
-            "scholar_id, partner_org_id, is_active, created_at, "
-            "applications!inner(email, birthdate, first_name, last_name, country, education_status, institution_name, institution_country, state_region_province, city, postal_code), "  # Add empty fields in needed
-            "partner_organizations!inner(display_name)"
-        ).eq("scholar_id", scholar_id).eq("is_active", True).execute()
+        scholar_data = get_scholar_by_credentials(scholar_id, email, birth_date)
         
-        if response.data:
-            scholar_data = response.data[0]
-            application_data = scholar_data['applications']
+        if scholar_data:
+            session_data = {
+                'auth_user': None,
+                'role': 'scholar',
+                'data': scholar_data,
+                'partner_org_id': scholar_data['partner_org_id'],
+                'permissions': ['view_profile', 'update_profile', 'submit_moa', 'view_certifications'],
+                'email': email,
+                'scholar_id': scholar_id
+            }
             
-            # Verify email and birth date
-            if (application_data['email'].lower() == email.lower() and 
-                str(application_data['birthdate']) == str(birth_date)):
-                
-                session_data = {
-                    'auth_user': None,
-                    'role': 'scholar',
-                    'data': scholar_data,
-                    'partner_org_id': scholar_data['partner_org_id'],
-                    'permissions': ['view_profile', 'update_profile', 'submit_moa', 'view_certifications'],
-                    'email': email,
-                    'scholar_id': scholar_id
-                }
-                
-                st.session_state.user_data = session_data
-                st.session_state.auth_timestamp = time.time()
-                
-                return True
+            save_auth_session(session_data)
+            return True
         
         return False
         
@@ -224,63 +248,40 @@ def scholar_login_auth(scholar_id: str, email: str, birth_date: str) -> bool:
 def approved_applicant_login_auth(approved_applicant_id: str, email: str, birth_date: str) -> bool:
     """
     Authentication for approved applicants using ID, email, and birth date
-    FIXED: Correct table relationships
     """
-    supabase = get_supabase_client()
-    
     try:
-        # Fixed query: Use proper table relationships
-        response = supabase.table("approved_applicants").select(
-            """
-            approved_applicant_id, application_id, created_at,
-            applications!inner(
-                email, birthdate, first_name, last_name, country, education_status, institution_name, institution_country, state_region_province, city, postal_code,
-                partner_org_id,
-                partner_organizations!inner(display_name)
-            )
-            """
-        ).eq("approved_applicant_id", approved_applicant_id).execute()
+        applicant_data = get_approved_applicant_by_credentials(approved_applicant_id, email, birth_date)
         
-        if response.data:
-            applicant_data = response.data[0]
-            application_data = applicant_data['applications']
-            
-            # Verify email and birth date
-            if (application_data['email'].lower() == email.lower() and 
-                str(application_data['birthdate']) == str(birth_date)):
-                
-                # Check if they haven't become a scholar yet
-                scholar_check = supabase.table("scholars").select("scholar_id").eq("application_id", applicant_data['application_id']).execute()
-                
-                if scholar_check.data:
-                    # They're already a scholar, redirect them
-                    st.error("You are already a scholar! Please use Scholar Login instead.")
-                    st.info(f"Your Scholar ID: {scholar_check.data[0]['scholar_id']}")
-                    return False
-                
-                # Create session data with correct structure
-                session_data = {
-                    'auth_user': None,
-                    'role': 'approved_applicant',
-                    'data': {
-                        'approved_applicant_id': applicant_data['approved_applicant_id'],
-                        'application_id': applicant_data['application_id'],
-                        'created_at': applicant_data['created_at'],
-                        'applications': application_data,
-                        'partner_organizations': application_data['partner_organizations']
-                    },
-                    'partner_org_id': application_data['partner_org_id'],
-                    'permissions': ['submit_moa', 'view_moa_status'],
-                    'email': email,
-                    'approved_applicant_id': approved_applicant_id
-                }
-                
-                st.session_state.user_data = session_data
-                st.session_state.auth_timestamp = time.time()
-                
-                return True
+        if not applicant_data:
+            return False
         
-        return False
+        if applicant_data.get('error') == 'already_scholar':
+            # They're already a scholar, redirect them
+            st.error("You are already a scholar! Please use Scholar Login instead.")
+            st.info(f"Your Scholar ID: {applicant_data['scholar_id']}")
+            return False
+        
+        application_data = applicant_data['applications']
+        
+        # Create session data with correct structure
+        session_data = {
+            'auth_user': None,
+            'role': 'approved_applicant',
+            'data': {
+                'approved_applicant_id': applicant_data['approved_applicant_id'],
+                'application_id': applicant_data['application_id'],
+                'created_at': applicant_data['created_at'],
+                'applications': application_data,
+                'partner_organizations': application_data['partner_organizations']
+            },
+            'partner_org_id': application_data['partner_org_id'],
+            'permissions': ['submit_moa', 'view_moa_status'],
+            'email': email,
+            'approved_applicant_id': approved_applicant_id
+        }
+        
+        save_auth_session(session_data)
+        return True
         
     except Exception as e:
         st.error(f"Approved applicant login failed: {e}")
@@ -290,43 +291,27 @@ def approved_applicant_login_auth(approved_applicant_id: str, email: str, birth_
 # Authentication state checks
 def is_authenticated() -> bool:
     """Check if user is authenticated"""
-    init_auth_state()
-    
-    if st.session_state.user_data and st.session_state.auth_timestamp:
-        if time.time() - st.session_state.auth_timestamp < 86400:
-            return True
-        else:
-            clear_auth_session()
-    
-    if restore_supabase_session():
-        return True
-    
-    return False
+    return get_auth_context()['user'] is not None
 
 
 def is_admin() -> bool:
     """Check if current user is an admin"""
-    return (is_authenticated() and 
-            st.session_state.user_data.get('role') == 'admin')
+    return get_auth_context()['role'] == 'admin'
 
 
 def is_scholar() -> bool:
     """Check if current user is a scholar"""
-    return (is_authenticated() and 
-            st.session_state.user_data.get('role') == 'scholar')
+    return get_auth_context()['role'] == 'scholar'
 
 
 def is_approved_applicant() -> bool:
     """Check if current user is an approved applicant"""
-    return (is_authenticated() and 
-            st.session_state.user_data.get('role') == 'approved_applicant')
+    return get_auth_context()['role'] == 'approved_applicant'
 
 
 def get_current_user() -> Optional[Dict[str, Any]]:
     """Get current user data"""
-    if is_authenticated():
-        return st.session_state.user_data
-    return None
+    return get_auth_context()['user']
 
 
 def logout():
@@ -344,8 +329,6 @@ def require_auth(role: Optional[Literal['admin', 'scholar', 'approved_applicant'
     """
     Require authentication with optional role check
     """
-    init_auth_state()
-    
     if not is_authenticated():
         st.error("Please log in to access this page.")
         st.info("Use the navigation menu to access the login page.")
@@ -355,7 +338,3 @@ def require_auth(role: Optional[Literal['admin', 'scholar', 'approved_applicant'
         st.error(f"Access denied. {role.replace('_', ' ').title()} role required.")
         st.info("You don't have permission to access this page.")
         st.stop()
-
-
-# Auto-initialize auth state when module is imported
-init_auth_state()
\ No newline at end of file
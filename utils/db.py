@@ -1,11 +1,37 @@
+import os
 import streamlit as st
 from supabase import create_client, Client
+from utils.instrumentation import instrument_client
+
+def database_backend():
+    """'supabase' (default) or 'local', from [database] backend in secrets or DATABASE_BACKEND"""
+    try:
+        backend = st.secrets.get("database", {}).get("backend")
+    except Exception:
+        backend = None
+    return backend or os.environ.get("DATABASE_BACKEND", "supabase")
 
 @st.cache_resource
 def init_connection():
+    # Queries are only counted while a budget check is listening; otherwise the wrapper just forwards
+    if database_backend() == "local":
+        # In-memory stand-in for benchmarks and CI; no network and no credentials
+        from utils.local_backend import create_local_client
+        return instrument_client(create_local_client())
     url = st.secrets.connections.supabase["SUPABASE_URL"]
     key = st.secrets.connections.supabase["SUPABASE_KEY"]
-    return create_client(url, key)
+    return instrument_client(create_client(url, key))
 
 def get_supabase_client():
     return init_connection()
+
+def iter_query_pages(build_query, page_size=1000):
+    """Yield result pages of a query using range(); build_query returns a fresh query builder"""
+    start = 0
+    while True:
+        rows = build_query().range(start, start + page_size - 1).execute().data
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        start += page_size
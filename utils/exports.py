@@ -0,0 +1,200 @@
+# utils/exports.py - Streaming CSV, Excel and Parquet exports
+import streamlit as st
+import csv
+import glob
+import io
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+
+# format key -> (label, file extension, MIME type)
+EXPORT_FORMATS = {
+    'csv': ("CSV", "csv", "text/csv"),
+    'excel': ("Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'parquet': ("Parquet", "parquet", "application/vnd.apache.parquet")
+}
+
+# (column label, function that extracts the value from a source row[, value type])
+# The type is 'string' (default), 'int', 'float' or 'bool'; Parquet files use it as the column schema
+ExportColumn = Tuple[str, Callable[[Dict[str, Any]], Any]]
+
+EXPORT_FILE_PREFIX = "datara_export_"
+# Generated files older than this are removed, even if their Download button was never clicked
+EXPORT_FILE_TTL = 30 * 60
+
+
+def iter_row_pages(rows: List[Dict[str, Any]], page_size: int = 1000):
+    """Yield an in-memory list of rows in export-sized pages"""
+    for start in range(0, len(rows), page_size):
+        yield rows[start:start + page_size]
+
+
+def write_export(pages: Iterable[List[Dict[str, Any]]], columns: List[ExportColumn],
+                 format_type: str, fileobj) -> int:
+    """
+    Write pages of rows to a binary file object one page at a time.
+    
+    Only the current page is held in memory. Returns the number of rows written.
+    """
+    writers = {
+        'csv': _write_csv,
+        'excel': _write_excel,
+        'parquet': _write_parquet
+    }
+    if format_type not in writers:
+        raise ValueError(f"Unsupported export format: {format_type}")
+    
+    rows = ([column[1](item) for column in columns] for page in pages for item in page)
+    labels = [column[0] for column in columns]
+    types = [column[2] if len(column) > 2 else 'string' for column in columns]
+    return writers[format_type](rows, labels, types, fileobj)
+
+
+def _write_csv(rows, labels, types, fileobj) -> int:
+    text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='', write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(labels)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    text.detach()
+    return count
+
+
+def _write_excel(rows, labels, types, fileobj) -> int:
+    # openpyxl is only needed for Excel exports
+    from openpyxl import Workbook
+    
+    # Write-only workbooks stream rows to disk instead of building the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Export")
+    sheet.append(labels)
+    count = 0
+    for row in rows:
+        sheet.append(row)
+        count += 1
+    workbook.save(fileobj)
+    return count
+
+
+def _write_parquet(rows, labels, types, fileobj, batch_size: int = 5000) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    arrow_types = {'string': pa.string(), 'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_()}
+    converters = {'string': str, 'int': int, 'float': float, 'bool': bool}
+    # The schema comes from the column spec, so a column that starts out null cannot fix the wrong type
+    schema = pa.schema([(label, arrow_types[kind]) for label, kind in zip(labels, types)])
+    convert = [converters[kind] for kind in types]
+    
+    count = 0
+    batch = []
+    with pq.ParquetWriter(fileobj, schema) as writer:
+        def flush():
+            columns = [
+                [None if value is None or (value == '' and kind != 'string') else fn(value) for value in values]
+                for values, fn, kind in zip(zip(*batch), convert, types)
+            ]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            batch.clear()
+        
+        for row in rows:
+            batch.append(row)
+            count += 1
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    return count
+
+
+def export_to_tempfile(pages: Iterable[List[Dict[str, Any]]], columns: List[ExportColumn],
+                       format_type: str) -> str:
+    """Write an export to a temporary file on disk and return its path"""
+    extension = EXPORT_FORMATS[format_type][1]
+    _remove_stale_exports()
+    fd, path = tempfile.mkstemp(prefix=EXPORT_FILE_PREFIX, suffix=f".{extension}")
+    try:
+        with os.fdopen(fd, 'wb') as fileobj:
+            write_export(pages, columns, format_type, fileobj)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def _remove_stale_exports(max_age: float = EXPORT_FILE_TTL):
+    """Delete export files left behind by sessions that never downloaded them"""
+    cutoff = time.time() - max_age
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), f"{EXPORT_FILE_PREFIX}*")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _discard_export(state_key: str):
+    """Remove a generated export file once it has been handed to the browser"""
+    export = st.session_state.pop(state_key, None)
+    if export and os.path.exists(export['path']):
+        os.remove(export['path'])
+
+
+def render_streaming_export(key: str, file_stem: str,
+                            fetch_pages: Callable[[], Iterable[List[Dict[str, Any]]]],
+                            columns: List[ExportColumn],
+                            fetch_all_pages: Optional[Callable[[], Iterable[List[Dict[str, Any]]]]] = None):
+    """
+    Render an export format picker with a Generate button and, once generated, a download button.
+    
+    fetch_pages yields the rows the admin is looking at (filters and sort
+    applied). When fetch_all_pages is given, the admin can instead export every
+    record of the organization, streamed from the database page by page.
+    Rows are fetched and written only when Generate is clicked, so normal
+    reruns never touch the export query.
+    """
+    state_key = f"_export_{key}"
+    format_type = st.selectbox(
+        "Export format",
+        options=list(EXPORT_FORMATS),
+        format_func=lambda f: EXPORT_FORMATS[f][0],
+        key=f"{key}_format"
+    )
+    export_all = False
+    if fetch_all_pages:
+        export_all = st.radio(
+            "Rows to export",
+            options=[False, True],
+            format_func=lambda everything: "Entire organization" if everything else "Current filtered view",
+            key=f"{key}_scope",
+            horizontal=True
+        )
+    
+    if st.button("Export", key=f"{key}_generate", use_container_width=True):
+        _discard_export(state_key)
+        try:
+            with st.spinner("Preparing export..."):
+                pages = fetch_all_pages() if export_all else fetch_pages()
+                path = export_to_tempfile(pages, columns, format_type)
+            st.session_state[state_key] = {'path': path, 'format': format_type}
+        except Exception as e:
+            st.error(f"Error generating export: {e}")
+    
+    export = st.session_state.get(state_key)
+    if export and os.path.exists(export['path']):
+        label, extension, mime = EXPORT_FORMATS[export['format']]
+        with open(export['path'], 'rb') as fileobj:
+            st.download_button(
+                label=f"Download {label}",
+                data=fileobj,
+                file_name=f"{file_stem}_{datetime.now().strftime('%Y%m%d')}.{extension}",
+                mime=mime,
+                key=f"{key}_download",
+                on_click=_discard_export,
+                args=(state_key,),
+                use_container_width=True
+            )
@@ -0,0 +1,130 @@
+# utils/formatting.py - Shared date/time parsing and display formatting
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DATE_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+LONG_DATE_FORMAT = "%B %d, %Y"
+LONG_DATETIME_FORMAT = "%B %d, %Y at %I:%M %p"
+
+
+def utc_now() -> datetime:
+    """Current time as an aware UTC datetime; take it once per render and pass it down"""
+    return datetime.now(timezone.utc)
+
+
+# ============================================================================
+# SCALAR HELPERS - LRU cached, the same timestamps repeat across reruns
+# ============================================================================
+
+@lru_cache(maxsize=4096)
+def parse_iso(value: str) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp from the database, or None if it is empty or invalid"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(value: str, format_string: str = DATETIME_FORMAT, empty: str = "N/A") -> str:
+    """Format an ISO timestamp; empty values give `empty`, unparseable ones are returned as-is"""
+    if not value:
+        return empty
+    dt = parse_iso(value)
+    return dt.strftime(format_string) if dt else value
+
+
+def format_datetime(dt_string: str, format_string: str = DATETIME_FORMAT) -> str:
+    """Format datetime string for display"""
+    return format_timestamp(dt_string, format_string)
+
+
+def format_date(date_string: str) -> str:
+    """Format date string for display"""
+    return format_timestamp(date_string, DATE_FORMAT)
+
+
+def format_date_display(date_string: str) -> str:
+    """Format date string for display, e.g. 'January 05, 2024'"""
+    return format_timestamp(date_string, LONG_DATE_FORMAT, empty=date_string)
+
+
+def format_datetime_display(datetime_string: str) -> str:
+    """Format datetime string for display, e.g. 'January 05, 2024 at 09:30 AM'"""
+    return format_timestamp(datetime_string, LONG_DATETIME_FORMAT, empty=datetime_string)
+
+
+def days_since(value: str, now: Optional[datetime] = None) -> Optional[int]:
+    """Whole days between an ISO timestamp and now, or None if it cannot be parsed"""
+    dt = parse_iso(value)
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return ((now or utc_now()) - dt).days
+
+
+def humanize_days(days: Optional[int]) -> str:
+    """Turn a day count into 'Today', 'Yesterday' or 'N days ago'"""
+    if days is None:
+        return "Unknown"
+    if days == 0:
+        return "Today"
+    if days == 1:
+        return "Yesterday"
+    return f"{days} days ago"
+
+
+def format_days_ago(dt_string: str, now: Optional[datetime] = None) -> str:
+    """Calculate and format days ago"""
+    if not dt_string:
+        return "N/A"
+    return humanize_days(days_since(dt_string, now))
+
+
+# ============================================================================
+# SERIES HELPERS - one vectorized parse per column for tables
+# pandas is imported on first use so public pages don't pay for it
+# ============================================================================
+
+def parse_iso_series(values: Iterable[str]) -> "pd.Series":
+    """Parse a column of ISO timestamps to UTC datetimes; invalid values become NaT"""
+    import pandas as pd
+    return pd.to_datetime(pd.Series(values, dtype=object), format='ISO8601', utc=True, errors='coerce')
+
+
+# Everything before a trailing UTC offset, so offset timestamps keep their own wall time like format_timestamp
+_WALL_TIME_PATTERN = r'^(.*[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)(?:Z|[+-]\d{2}:?\d{2})$'
+
+
+def format_timestamp_series(values: Iterable[str], format_string: str = DATETIME_FORMAT) -> "pd.Series":
+    """Vectorized format_timestamp; empty values give 'N/A', unparseable ones are kept as-is"""
+    import pandas as pd
+    raw = pd.Series(values, dtype=object)
+    wall_time = raw.str.extract(_WALL_TIME_PATTERN, expand=False).fillna(raw)
+    parsed = pd.to_datetime(wall_time, format='ISO8601', errors='coerce')
+    return parsed.dt.strftime(format_string).where(parsed.notna(), raw.mask(raw.isna() | (raw == ""), "N/A"))
+
+
+def days_since_series(values: Iterable[str], now: Optional[datetime] = None) -> "pd.Series":
+    """Vectorized days_since; unparseable values give <NA>"""
+    import pandas as pd
+    parsed = parse_iso_series(values)
+    return (pd.Timestamp(now or utc_now()) - parsed).dt.days.astype('Int64')
+
+
+def format_days_ago_series(values: Iterable[str], now: Optional[datetime] = None) -> "pd.Series":
+    """Vectorized format_days_ago"""
+    import pandas as pd
+    raw = pd.Series(values, dtype=object)
+    days = days_since_series(raw, now)
+    labels = days.astype(str) + " days ago"
+    labels = labels.mask(days == 0, "Today").mask(days == 1, "Yesterday")
+    return labels.mask(days.isna(), "Unknown").mask(raw.isna() | (raw == ""), "N/A")
@@ -0,0 +1,374 @@
+# utils/instrumentation.py - Backend round-trip counting and per-session query tracing
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Frames in these files are plumbing; the call site is the first app frame above them
+_SKIPPED_FILES = {
+    os.path.join(REPO_ROOT, "utils", "instrumentation.py"),
+    os.path.join(REPO_ROOT, "utils", "db.py"),
+    os.path.join(REPO_ROOT, "utils", "local_backend.py"),
+}
+
+_active_counters: List["QueryCounter"] = []
+_counters_lock = threading.Lock()
+
+# Query tracing: session id -> the rerun being traced, and each traced session's recent reruns
+_open_reruns: Dict[str, Dict[str, Any]] = {}
+_session_traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_traces_lock = threading.Lock()
+MAX_TRACED_RERUNS = 20
+MAX_TRACED_SESSIONS = 50
+
+_OPERATIONS = {"select", "insert", "update", "delete", "upsert"}
+
+
+def call_site() -> str:
+    """'path:line function' of the app code that issued the current query"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(REPO_ROOT) and filename not in _SKIPPED_FILES and "site-packages" not in filename:
+            return f"{os.path.relpath(filename, REPO_ROOT)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<outside app code>"
+
+
+class QueryCounter:
+    """Round trips recorded while the counter is active, as (table, call site) pairs"""
+
+    def __init__(self):
+        self.calls: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def record(self, table: str, site: str):
+        with self._lock:
+            self.calls.append((table, site))
+
+    @property
+    def count(self) -> int:
+        return len(self.calls)
+
+    def by_site(self) -> Counter:
+        return Counter(self.calls)
+
+    def report(self, top: int = 10) -> str:
+        """Busiest call sites, one per line"""
+        return "\n".join(
+            f"{count:>6}x {site} ({table})" for (table, site), count in self.by_site().most_common(top)
+        )
+
+
+@contextmanager
+def count_queries():
+    """
+    Count backend round trips made by any thread while the block runs.
+
+    Used by the budget checks, which run one page or function at a time;
+    sessions running concurrently would be counted together.
+    """
+    counter = QueryCounter()
+    with _counters_lock:
+        _active_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        with _counters_lock:
+            _active_counters.remove(counter)
+
+
+def _session_id() -> Optional[str]:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def _short(value: Any) -> str:
+    if isinstance(value, (list, tuple, set)) and len(value) > 3:
+        return f"[{len(value)} values]"
+    text = str(value)
+    return text if len(text) <= 60 else text[:57] + "..."
+
+
+def _describe(ops: Tuple) -> Tuple[str, str, List[str]]:
+    """(operation, columns, filters) of a builder chain; written payloads are reduced to their columns"""
+    operation, columns, filters, negate = "select", "*", [], False
+    for name, args, kwargs in ops:
+        if name in _OPERATIONS:
+            operation = name
+            payload = args[0] if args else kwargs.get("json", "*")
+            if name == "select":
+                columns = ", ".join(map(str, args)) or "*"
+            elif isinstance(payload, list):
+                columns = ", ".join(payload[0]) if payload else ""
+            elif isinstance(payload, dict):
+                columns = ", ".join(payload)
+        elif name == "not_":
+            negate = True
+        else:
+            arguments = [_short(arg) for arg in args] + [f"{key}={_short(value)}" for key, value in kwargs.items()]
+            filters.append(f"{'not.' if negate else ''}{name}({', '.join(arguments)})")
+            negate = False
+    return operation, columns, filters
+
+
+def _record_trace(rerun: Dict[str, Any], table: str, ops: Tuple, site: str,
+                  started_ns: int, elapsed: float, response: Any, error: Optional[str]):
+    operation, columns, filters = _describe(ops)
+    data = getattr(response, "data", None)
+    call = {
+        "table": table,
+        "operation": operation,
+        "columns": columns,
+        "filters": filters,
+        "site": site,
+        "started_ns": started_ns,
+        "duration_ms": elapsed * 1000,
+        "rows": len(data) if isinstance(data, list) else int(bool(data)),
+        # What PostgREST would send back, the same measure the page benchmark uses
+        "bytes": len(json.dumps(data, default=str)) if data is not None else 0,
+        "error": error,
+    }
+    rerun["calls"].append(call)
+    with _traces_lock:
+        totals = rerun["session_totals"]
+        totals["queries"] += 1
+        totals["duration_ms"] += call["duration_ms"]
+        totals["bytes"] += call["bytes"]
+
+
+class _QueryProxy:
+    """Wraps a request builder; builders it returns are wrapped too, and execute() is counted and traced"""
+
+    __slots__ = ("_builder", "_table", "_ops")
+
+    def __init__(self, builder: Any, table: str, ops: Tuple = ()):
+        self._builder = builder
+        self._table = table
+        # (method, args, kwargs) of the chain so far, for traces
+        self._ops = ops
+
+    def execute(self):
+        if not _active_counters and not _open_reruns:
+            return self._builder.execute()
+        site = call_site()
+        rerun = _open_reruns.get(_session_id()) if _open_reruns else None
+        started_ns = time.time_ns()
+        start = time.perf_counter()
+        response, error = None, None
+        try:
+            response = self._builder.execute()
+            return response
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            for counter in list(_active_counters):
+                counter.record(self._table, site)
+            if rerun is not None:
+                _record_trace(rerun, self._table, self._ops, site, started_ns, elapsed, response, error)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        if hasattr(attr, "execute"):
+            # Properties such as not_ return a builder directly
+            return _QueryProxy(attr, self._table, self._ops + ((name, (), {}),))
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                return _QueryProxy(result, self._table, self._ops + ((name, args, kwargs),))
+            return result
+        return call
+
+
+class InstrumentedClient:
+    """Supabase client whose table queries are counted; everything else passes through"""
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def table(self, name: str) -> _QueryProxy:
+        return _QueryProxy(self._client.table(name), name)
+
+    def from_(self, name: str) -> _QueryProxy:
+        return self.table(name)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+def instrument_client(client: Any) -> InstrumentedClient:
+    return client if isinstance(client, InstrumentedClient) else InstrumentedClient(client)
+
+
+def tracing_forced() -> bool:
+    """Trace every session, from [debug] query_tracing in secrets or QUERY_TRACING"""
+    import streamlit as st
+
+    try:
+        forced = st.secrets.get("debug", {}).get("query_tracing")
+    except Exception:
+        forced = None
+    if forced is None:
+        forced = os.environ.get("QUERY_TRACING", "").lower() in ("1", "true", "yes")
+    return bool(forced)
+
+
+def begin_rerun_trace(page: str):
+    """Start tracing the current session's rerun; its queries are recorded until end_rerun_trace()"""
+    session_id = _session_id()
+    if session_id is None:
+        return
+    with _traces_lock:
+        session = _session_traces.pop(session_id, None) or {
+            "reruns": deque(maxlen=MAX_TRACED_RERUNS),
+            "totals": {"reruns": 0, "queries": 0, "duration_ms": 0.0, "bytes": 0},
+        }
+        # Most recently active last, so the longest idle session is dropped first
+        _session_traces[session_id] = session
+        while len(_session_traces) > MAX_TRACED_SESSIONS:
+            stale_id, _ = _session_traces.popitem(last=False)
+            _open_reruns.pop(stale_id, None)
+        session["totals"]["reruns"] += 1
+        rerun = {
+            "page": page,
+            "session_id": session_id,
+            "trace_id": uuid.uuid4().hex,
+            "span_id": uuid.uuid4().hex[:16],
+            "started_ns": time.time_ns(),
+            "ended_ns": None,
+            "calls": [],
+            "session_totals": session["totals"],
+        }
+        session["reruns"].append(rerun)
+        _open_reruns[session_id] = rerun
+
+
+def end_rerun_trace() -> Optional[Dict[str, Any]]:
+    """Close the current session's traced rerun and log its summary"""
+    rerun = _open_reruns.pop(_session_id(), None)
+    if rerun is None:
+        return None
+    rerun["ended_ns"] = time.time_ns()
+    summary = summarize_calls(rerun["calls"])
+    logger.info(
+        f"Query trace {rerun['page']}: {summary['queries']} queries, {summary['duration_ms']:.1f} ms, "
+        f"{summary['rows']} rows, {summary['bytes']} bytes"
+    )
+    return rerun
+
+
+def stop_tracing():
+    """Stop tracing the current session and drop its traces"""
+    session_id = _session_id()
+    with _traces_lock:
+        _open_reruns.pop(session_id, None)
+        _session_traces.pop(session_id, None)
+
+
+def session_traces() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Recent traced reruns of the current session, oldest first, and its running totals"""
+    session = _session_traces.get(_session_id())
+    if session is None:
+        return [], {}
+    return list(session["reruns"]), dict(session["totals"])
+
+
+def summarize_calls(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "queries": len(calls),
+        "duration_ms": sum(call["duration_ms"] for call in calls),
+        "rows": sum(call["rows"] for call in calls),
+        "bytes": sum(call["bytes"] for call in calls),
+        "errors": sum(1 for call in calls if call["error"]),
+    }
+
+
+def slowest_calls(calls: List[Dict[str, Any]], top: int = 15) -> List[Dict[str, Any]]:
+    return sorted(calls, key=lambda call: call["duration_ms"], reverse=True)[:top]
+
+
+def _otlp_attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """OTLP/JSON key-value list; int values are strings in that encoding"""
+    attributes = []
+    for key, value in values.items():
+        if isinstance(value, bool):
+            encoded = {"boolValue": value}
+        elif isinstance(value, int):
+            encoded = {"intValue": str(value)}
+        elif isinstance(value, float):
+            encoded = {"doubleValue": value}
+        elif isinstance(value, list):
+            encoded = {"arrayValue": {"values": [{"stringValue": str(item)} for item in value]}}
+        else:
+            encoded = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": encoded})
+    return attributes
+
+
+def export_otlp(reruns: List[Dict[str, Any]], service_name: str = "datara") -> Dict[str, Any]:
+    """
+    Traced reruns as an OTLP/JSON trace export.
+
+    Each rerun is one trace with a root span for the page and a client span
+    per query, so the file loads into any OpenTelemetry collector or viewer.
+    """
+    spans = []
+    for rerun in reruns:
+        calls = rerun["calls"]
+        ended_ns = rerun["ended_ns"] or max(
+            (call["started_ns"] + int(call["duration_ms"] * 1e6) for call in calls), default=rerun["started_ns"]
+        )
+        spans.append({
+            "traceId": rerun["trace_id"],
+            "spanId": rerun["span_id"],
+            "name": f"rerun {rerun['page']}",
+            "kind": 1,
+            "startTimeUnixNano": str(rerun["started_ns"]),
+            "endTimeUnixNano": str(ended_ns),
+            "attributes": _otlp_attributes({"datara.page": rerun["page"], "session.id": rerun["session_id"]}),
+            "status": {"code": 0},
+        })
+        for call in calls:
+            spans.append({
+                "traceId": rerun["trace_id"],
+                "spanId": uuid.uuid4().hex[:16],
+                "parentSpanId": rerun["span_id"],
+                "name": f"{call['operation']} {call['table']}",
+                "kind": 3,
+                "startTimeUnixNano": str(call["started_ns"]),
+                "endTimeUnixNano": str(call["started_ns"] + int(call["duration_ms"] * 1e6)),
+                "attributes": _otlp_attributes({
+                    "db.system.name": "postgresql",
+                    "db.collection.name": call["table"],
+                    "db.operation.name": call["operation"],
+                    "db.response.returned_rows": call["rows"],
+                    "datara.columns": call["columns"],
+                    "datara.filters": call["filters"],
+                    "datara.response_bytes": call["bytes"],
+                    "code.function": call["site"],
+                }),
+                "status": {"code": 2, "message": call["error"]} if call["error"] else {"code": 0},
+            })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+            "scopeSpans": [{"scope": {"name": "utils.instrumentation"}, "spans": spans}],
+        }]
+    }
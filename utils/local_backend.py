@@ -0,0 +1,685 @@
+# utils/local_backend.py - In-memory stand-in for the Supabase client, for offline benchmarks and CI
+import re
+import threading
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# The password every seeded and synthetic auth user gets
+LOCAL_PASSWORD = "local-password"
+
+NOW = object()  # default marker: current UTC timestamp
+
+# Tables the app uses, their primary keys, defaults and foreign keys (column -> table).
+# Foreign keys listed under unique embed as an object from the other side, like PostgREST.
+# Computed columns (PostgREST computed fields in supabase/migrations) are kept up to date on each row.
+SCHEMA: Dict[str, Dict[str, Any]] = {
+    "partner_organizations": {
+        "primary_key": "partner_org_id",
+        "defaults": {"is_active": True, "is_accepting": True, "created_at": NOW},
+        "foreign_keys": {},
+    },
+    "admins": {
+        "primary_key": "admin_id",
+        "defaults": {"is_active": True, "created_at": NOW},
+        "foreign_keys": {"partner_org_id": "partner_organizations"},
+    },
+    "applications": {
+        "primary_key": "application_id",
+        "defaults": {"status": "PENDING", "applied_at": NOW},
+        "foreign_keys": {"partner_org_id": "partner_organizations"},
+        "computed": {"email_lower": lambda row: (row.get("email") or "").lower() or None},
+    },
+    "application_demographics": {
+        "primary_key": "demographic_id",
+        "defaults": {},
+        "foreign_keys": {"application_id": "applications"},
+    },
+    "application_devices": {
+        "primary_key": "device_id",
+        "defaults": {},
+        "foreign_keys": {"application_id": "applications"},
+    },
+    "application_connectivity": {
+        "primary_key": "connectivity_id",
+        "defaults": {},
+        "foreign_keys": {"application_id": "applications"},
+    },
+    "application_reviews": {
+        "primary_key": "review_id",
+        "defaults": {"reviewed_at": NOW},
+        "foreign_keys": {"application_id": "applications", "admin_id": "admins"},
+    },
+    "approved_applicants": {
+        "primary_key": "approved_applicant_id",
+        "defaults": {"created_at": NOW},
+        "foreign_keys": {"application_id": "applications"},
+        "unique": ["application_id"],
+    },
+    "moa_submissions": {
+        "primary_key": "moa_id",
+        "defaults": {"status": "SUBMITTED", "submitted_at": NOW},
+        "foreign_keys": {"approved_applicant_id": "approved_applicants"},
+    },
+    "moa_reviews": {
+        "primary_key": "review_id",
+        "defaults": {"reviewed_at": NOW},
+        "foreign_keys": {"moa_id": "moa_submissions", "admin_id": "admins"},
+    },
+    "scholars": {
+        "primary_key": "scholar_id",
+        "defaults": {"is_active": True, "created_at": NOW},
+        "foreign_keys": {
+            "application_id": "applications",
+            "partner_org_id": "partner_organizations",
+            "moa_id": "moa_submissions",
+        },
+        "unique": ["application_id"],
+    },
+    "certifications": {
+        "primary_key": "certification_id",
+        "defaults": {"created_at": NOW},
+        "foreign_keys": {"scholar_id": "scholars"},
+    },
+    "jobs": {
+        "primary_key": "job_id",
+        "defaults": {"is_published": False, "created_at": NOW},
+        "foreign_keys": {"scholar_id": "scholars"},
+    },
+}
+
+SEED_PARTNER_ORGS = ["DataCamp", "Coursera", "Udacity", "edX"]
+
+
+class LocalAPIError(Exception):
+    """Raised where PostgREST would answer with an error"""
+
+
+def _duplicate_key(table: str, column: str) -> "LocalAPIError":
+    return LocalAPIError(f'duplicate key value violates unique constraint "{table}_{column}_key"')
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ============================================================================
+# SELECT PARSING - "col, rel!inner(col, nested(col))" into a tree
+# ============================================================================
+
+def _split_top_level(text: str, separator: str = ",") -> List[str]:
+    """Split on separator outside parentheses and double quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == separator and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_select(columns: str) -> List[Dict[str, Any]]:
+    """Parse a PostgREST select string into column and embed nodes"""
+    nodes = []
+    for item in _split_top_level(columns):
+        if "(" in item:
+            head, inner = item.split("(", 1)
+            alias, _, relation = head.rpartition(":")
+            relation, _, hint = relation.partition("!")
+            nodes.append({
+                "embed": relation.strip(),
+                "alias": (alias or relation).strip(),
+                "inner": hint.strip() == "inner",
+                "children": parse_select(inner[:-1]),
+            })
+        else:
+            alias, _, column = item.rpartition(":")
+            nodes.append({"column": column.strip(), "alias": (alias or column).strip()})
+    return nodes
+
+
+# ============================================================================
+# FILTERS
+# ============================================================================
+
+def _coerce(row_value: Any, value: Any) -> Any:
+    """Bring a filter value (often a string from a URL-style filter) to the row value's type"""
+    if isinstance(value, str):
+        if isinstance(row_value, bool):
+            return value.lower() == "true"
+        if isinstance(row_value, (int, float)):
+            try:
+                return type(row_value)(value)
+            except ValueError:
+                return value
+        return value
+    if isinstance(row_value, str) and not isinstance(value, str):
+        return str(value).lower() if isinstance(value, bool) else str(value)
+    return value
+
+
+@lru_cache(maxsize=256)
+def _like_pattern(pattern: str, case_insensitive: bool) -> "re.Pattern":
+    """Compile a LIKE pattern; % and * match anything, _ one character, backslash escapes"""
+    regex, escaped = [], False
+    for char in pattern:
+        if escaped:
+            regex.append(re.escape(char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char in "%*":
+            regex.append(".*")
+        elif char == "_":
+            regex.append(".")
+        else:
+            regex.append(re.escape(char))
+    return re.compile("".join(regex), re.DOTALL | (re.IGNORECASE if case_insensitive else 0))
+
+
+def _in_matcher(values: List[Any]) -> Callable[[Any], bool]:
+    """Membership test for in_; the values are coerced once per row value type, not once per row"""
+    coerced: Dict[type, Any] = {}
+
+    def matches(row_value: Any) -> bool:
+        if row_value is None:
+            return False
+        kind = type(row_value)
+        if kind not in coerced:
+            candidates = [_coerce(row_value, v) for v in values]
+            try:
+                coerced[kind] = set(candidates)
+            except TypeError:
+                coerced[kind] = candidates
+        return row_value in coerced[kind]
+    return matches
+
+
+def _compare(op: str, row_value: Any, value: Any) -> bool:
+    if op == "is":
+        if value in (None, "null"):
+            return row_value is None
+        return row_value is _coerce(True, value)
+    if op == "in":
+        return row_value is not None and row_value in [_coerce(row_value, v) for v in value]
+    if row_value is None:
+        return False
+    value = _coerce(row_value, value)
+    if op == "eq":
+        return row_value == value
+    if op == "neq":
+        return row_value != value
+    if op in ("like", "ilike"):
+        return _like_pattern(str(value), op == "ilike").fullmatch(str(row_value)) is not None
+    try:
+        if op == "gt":
+            return row_value > value
+        if op == "gte":
+            return row_value >= value
+        if op == "lt":
+            return row_value < value
+        if op == "lte":
+            return row_value <= value
+    except TypeError:
+        return False
+    raise LocalAPIError(f"Unsupported filter operator: {op}")
+
+
+def _parse_condition(text: str) -> Tuple[str, str, Any]:
+    """'col.op.value' from an or= filter into (column, op, value)"""
+    column, op, value = text.split(".", 2)
+    if value.startswith('"') and value.endswith('"'):
+        value = value[1:-1]
+    if op == "in":
+        value = [v.strip().strip('"') for v in _split_top_level(value.strip("()"))]
+    return column, op, value
+
+
+def _parse_logic(text: str) -> Callable[[Dict[str, Any]], bool]:
+    """Compile an or= / and() filter tree into a row predicate"""
+    predicates = []
+    for item in _split_top_level(text):
+        if item.startswith(("and(", "or(")):
+            combine = all if item.startswith("and(") else any
+            inner = _parse_logic(item[item.index("(") + 1:-1])
+            predicates.append(lambda row, inner=inner, combine=combine: inner(row, combine))
+        else:
+            column, op, value = _parse_condition(item)
+            predicates.append(lambda row, c=column, o=op, v=value: _compare(o, row.get(c), v))
+    return lambda row, combine=any: combine(predicate(row) for predicate in predicates)
+
+
+# ============================================================================
+# DATABASE
+# ============================================================================
+
+class LocalDatabase:
+    """In-memory tables with the app's schema, guarded by one lock"""
+
+    def __init__(self, schema: Dict[str, Dict[str, Any]] = SCHEMA):
+        self.schema = schema
+        self.tables: Dict[str, List[Dict[str, Any]]] = {name: [] for name in schema}
+        self.versions: Dict[str, int] = {name: 0 for name in schema}
+        self._indexes: Dict[Tuple[str, str], Tuple[int, Dict[Any, List[Dict[str, Any]]]]] = {}
+        self.lock = threading.RLock()
+
+    def touch(self, table: str):
+        """Record a write so indexes on the table are rebuilt on next use"""
+        self.versions[table] += 1
+
+    def index(self, table: str, column: str) -> Dict[Any, List[Dict[str, Any]]]:
+        """Rows of table grouped by column value, rebuilt only after writes; keeps embeds linear"""
+        cached = self._indexes.get((table, column))
+        if cached and cached[0] == self.versions[table]:
+            return cached[1]
+        grouped: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in self.rows(table):
+            grouped.setdefault(row.get(column), []).append(row)
+        self._indexes[(table, column)] = (self.versions[table], grouped)
+        return grouped
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        if table not in self.tables:
+            raise LocalAPIError(f'relation "public.{table}" does not exist')
+        return self.tables[table]
+
+    def relationship(self, table: str, embed: str) -> Tuple[str, str, str, bool]:
+        """(direction, local column, remote column, is_list) for embedding `embed` in `table`"""
+        for column, target in self.schema[table]["foreign_keys"].items():
+            if target == embed:
+                return "forward", column, self.schema[embed]["primary_key"], False
+        embed_schema = self.schema.get(embed)
+        if embed_schema:
+            for column, target in embed_schema["foreign_keys"].items():
+                if target == table:
+                    is_list = column not in embed_schema.get("unique", [])
+                    return "reverse", self.schema[table]["primary_key"], column, is_list
+        raise LocalAPIError(f"Could not find a relationship between '{table}' and '{embed}'")
+
+    def compute(self, table: str, row: Dict[str, Any]):
+        for column, expression in self.schema[table].get("computed", {}).items():
+            row[column] = expression(row)
+
+    def prepare_insert(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        table_schema = self.schema[table]
+        prepared = {
+            column: (_now() if default is NOW else default)
+            for column, default in table_schema["defaults"].items()
+        }
+        prepared.update(row)
+        self.compute(table, prepared)
+        primary_key = table_schema["primary_key"]
+        if prepared.get(primary_key) is None:
+            prepared[primary_key] = str(uuid.uuid4())
+        for column in [primary_key] + table_schema.get("unique", []):
+            if prepared.get(column) is not None and self.index(table, column).get(prepared[column]):
+                raise _duplicate_key(table, column)
+        return prepared
+
+    def insert_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert rows as one statement: all or none are written, and cached indexes
+        are extended in place rather than rebuilt, so bulk inserts stay linear.
+        """
+        with self.lock:
+            table_schema = self.schema[table]
+            unique_columns = [table_schema["primary_key"]] + table_schema.get("unique", [])
+            batch_keys: Dict[str, set] = {column: set() for column in unique_columns}
+            inserted = []
+            for row in rows:
+                prepared = self.prepare_insert(table, dict(row))
+                for column in unique_columns:
+                    value = prepared.get(column)
+                    if value is None:
+                        continue
+                    if value in batch_keys[column]:
+                        raise _duplicate_key(table, column)
+                    batch_keys[column].add(value)
+                inserted.append(prepared)
+
+            self.rows(table).extend(inserted)
+            previous_version = self.versions[table]
+            self.touch(table)
+            for (indexed_table, column), (version, grouped) in list(self._indexes.items()):
+                if indexed_table == table and version == previous_version:
+                    for row in inserted:
+                        grouped.setdefault(row.get(column), []).append(row)
+                    self._indexes[(table, column)] = (self.versions[table], grouped)
+            return inserted
+
+    def load_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bulk insert with defaults filled in; used for seeding and synthetic data"""
+        return self.insert_rows(table, rows)
+
+
+# ============================================================================
+# QUERY BUILDER - the subset of postgrest-py the app uses
+# ============================================================================
+
+class LocalQuery:
+    """Chainable query with the postgrest-py method names; execute() runs it in memory"""
+
+    def __init__(self, db: LocalDatabase, table: str):
+        self.db = db
+        self.table = table
+        self.action = "select"
+        self.select_tree = parse_select("*")
+        self.count_mode = None
+        self.payload = None
+        self.filters: Dict[Tuple[str, ...], List[Callable[[Dict[str, Any]], bool]]] = {}
+        self.orders: Dict[Tuple[str, ...], List[Tuple[str, bool, Optional[bool]]]] = {}
+        self.ranges: Dict[Tuple[str, ...], Tuple[int, Optional[int]]] = {}
+        self.lookup: Optional[Tuple[str, List[Any]]] = None  # first top-level eq/in_ filter
+
+    # Actions
+    def select(self, *columns: str, count: Optional[str] = None, head: Optional[bool] = None):
+        self.select_tree = parse_select(",".join(columns) or "*")
+        self.count_mode = count
+        return self
+
+    def insert(self, json: Any, *, count: Optional[str] = None, returning: str = "representation",
+               upsert: bool = False, default_to_null: bool = True):
+        self.action, self.payload, self.count_mode = "insert", json, count
+        return self
+
+    def update(self, json: Dict[str, Any], *, count: Optional[str] = None, returning: str = "representation"):
+        self.action, self.payload, self.count_mode = "update", json, count
+        return self
+
+    def delete(self, *, count: Optional[str] = None, returning: str = "representation"):
+        self.action, self.count_mode = "delete", count
+        return self
+
+    # Filters
+    def _add_filter(self, column: str, predicate: Callable[[Any], bool], lookup_values: Optional[List[Any]] = None):
+        *path, name = column.split(".")
+        if lookup_values is not None and not path and self.lookup is None:
+            self.lookup = (name, lookup_values)
+        self.filters.setdefault(tuple(path), []).append(lambda row: predicate(row.get(name)))
+        return self
+
+    def eq(self, column: str, value: Any):
+        return self._add_filter(column, lambda v: _compare("eq", v, value), [value])
+
+    def neq(self, column: str, value: Any):
+        return self._add_filter(column, lambda v: _compare("neq", v, value))
+
+    def gt(self, column: str, value: Any):
+        return self._add_filter(column, lambda v: _compare("gt", v, value))
+
+    def gte(self, column: str, value: Any):
+        return self._add_filter(column, lambda v: _compare("gte", v, value))
+
+    def lt(self, column: str, value: Any):
+        return self._add_filter(column, lambda v: _compare("lt", v, value))
+
+    def lte(self, column: str, value: Any):
+        return self._add_filter(column, lambda v: _compare("lte", v, value))
+
+    def like(self, column: str, pattern: str):
+        return self._add_filter(column, lambda v: _compare("like", v, pattern))
+
+    def ilike(self, column: str, pattern: str):
+        return self._add_filter(column, lambda v: _compare("ilike", v, pattern))
+
+    def is_(self, column: str, value: Any):
+        return self._add_filter(column, lambda v: _compare("is", v, value))
+
+    def in_(self, column: str, values: Iterable[Any]):
+        values = list(values)
+        return self._add_filter(column, _in_matcher(values), values)
+
+    def match(self, query: Dict[str, Any]):
+        for column, value in query.items():
+            self.eq(column, value)
+        return self
+
+    def or_(self, filters: str, reference_table: Optional[str] = None):
+        path = tuple(reference_table.split(".")) if reference_table else ()
+        self.filters.setdefault(path, []).append(_parse_logic(filters))
+        return self
+
+    # Modifiers
+    def order(self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None,
+              foreign_table: Optional[str] = None):
+        path = tuple(foreign_table.split(".")) if foreign_table else ()
+        self.orders.setdefault(path, []).append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, *, foreign_table: Optional[str] = None):
+        path = tuple(foreign_table.split(".")) if foreign_table else ()
+        offset, _ = self.ranges.get(path, (0, None))
+        self.ranges[path] = (offset, size)
+        return self
+
+    def range(self, start: int, end: int, foreign_table: Optional[str] = None):
+        path = tuple(foreign_table.split(".")) if foreign_table else ()
+        self.ranges[path] = (start, end - start + 1)
+        return self
+
+    # Execution
+    def _candidates(self, table_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rows that can match; an eq/in_ filter narrows the scan through the column index"""
+        if self.lookup is None:
+            return table_rows
+        column, values = self.lookup
+        sample = next((row[column] for row in table_rows if row.get(column) is not None), None)
+        if sample is None:
+            return []
+        index = self.db.index(self.table, column)
+        candidates, seen = [], set()
+        try:
+            for value in values:
+                key = _coerce(sample, value)
+                if key not in seen:
+                    seen.add(key)
+                    candidates.extend(index.get(key, []))
+        except TypeError:
+            return table_rows
+        return candidates
+
+    def _matches(self, row: Dict[str, Any], path: Tuple[str, ...]) -> bool:
+        return all(predicate(row) for predicate in self.filters.get(path, []))
+
+    def _sort(self, rows: List[Dict[str, Any]], path: Tuple[str, ...]) -> List[Dict[str, Any]]:
+        # Stable sorts applied last key first give multi-column ordering
+        for column, desc, nullsfirst in reversed(self.orders.get(path, [])):
+            # PostgreSQL puts NULLs last ascending and first descending unless told otherwise
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            present.sort(key=lambda row: row[column], reverse=desc)
+            rows = missing + present if nulls_first else present + missing
+        return rows
+
+    def _window(self, rows: List[Any], path: Tuple[str, ...]) -> List[Any]:
+        offset, size = self.ranges.get(path, (0, None))
+        return rows[offset:] if size is None else rows[offset:offset + size]
+
+    def _shape(self, table: str, row: Dict[str, Any], tree: List[Dict[str, Any]],
+               path: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """Project a row through the select tree; None when an !inner embed has no match"""
+        shaped: Dict[str, Any] = {}
+        for node in tree:
+            if "column" in node:
+                if node["column"] == "*":
+                    shaped.update(row)
+                else:
+                    shaped[node["alias"]] = row.get(node["column"])
+                continue
+
+            embed_path = path + (node["embed"],)
+            direction, local, remote, is_list = self.db.relationship(table, node["embed"])
+            key = row.get(local)
+            related = [
+                candidate for candidate in (self.db.index(node["embed"], remote).get(key, []) if key is not None else [])
+                if self._matches(candidate, embed_path)
+            ]
+            if is_list and [child.get("column") for child in node["children"]] == ["count"]:
+                # relation(count) aggregates the embedded rows, like PostgREST
+                shaped[node["alias"]] = [{node["children"][0]["alias"]: len(related)}]
+                continue
+            related = self._sort(related, embed_path)
+            children = [
+                child for child in (
+                    self._shape(node["embed"], candidate, node["children"], embed_path) for candidate in related
+                ) if child is not None
+            ]
+            if is_list:
+                children = self._window(children, embed_path)
+                if node["inner"] and not children:
+                    return None
+                shaped[node["alias"]] = children
+            else:
+                if node["inner"] and not children:
+                    return None
+                shaped[node["alias"]] = children[0] if children else None
+        return shaped
+
+    def _count(self, matched: int) -> Optional[int]:
+        return matched if self.count_mode else None
+
+    def execute(self) -> SimpleNamespace:
+        with self.db.lock:
+            table_rows = self.db.rows(self.table)
+
+            if self.action == "insert":
+                payload = self.payload if isinstance(self.payload, list) else [self.payload]
+                inserted = self.db.insert_rows(self.table, payload)
+                return SimpleNamespace(data=[dict(row) for row in inserted], count=self._count(len(inserted)))
+
+            matched = [row for row in self._candidates(table_rows) if self._matches(row, ())]
+
+            if self.action == "update":
+                for row in matched:
+                    row.update(self.payload)
+                    self.db.compute(self.table, row)
+                self.db.touch(self.table)
+                return SimpleNamespace(data=[dict(row) for row in matched], count=self._count(len(matched)))
+
+            if self.action == "delete":
+                matched_ids = {id(row) for row in matched}
+                table_rows[:] = [row for row in table_rows if id(row) not in matched_ids]
+                self.db.touch(self.table)
+                return SimpleNamespace(data=[dict(row) for row in matched], count=self._count(len(matched)))
+
+            shaped = []
+            for row in self._sort(matched, ()):
+                result = self._shape(self.table, row, self.select_tree, ())
+                if result is not None:
+                    shaped.append(result)
+            return SimpleNamespace(data=self._window(shaped, ()), count=self._count(len(shaped)))
+
+
+# ============================================================================
+# AUTH AND STORAGE
+# ============================================================================
+
+class LocalAuth:
+    """Email/password sign-in against seeded users"""
+
+    def __init__(self):
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.tokens: Dict[str, str] = {}
+
+    def add_user(self, email: str, password: str = LOCAL_PASSWORD):
+        self.users[email.lower()] = {"id": str(uuid.uuid4()), "email": email, "password": password}
+
+    def sign_in_with_password(self, credentials: Dict[str, str]) -> SimpleNamespace:
+        user = self.users.get(credentials["email"].lower())
+        if not user or user["password"] != credentials["password"]:
+            raise LocalAPIError("Invalid login credentials")
+        token = uuid.uuid4().hex
+        self.tokens[token] = user["email"].lower()
+        auth_user = SimpleNamespace(id=user["id"], email=user["email"])
+        return SimpleNamespace(user=auth_user, session=SimpleNamespace(access_token=token))
+
+    def get_user(self, token: str) -> Optional[SimpleNamespace]:
+        email = self.tokens.get(token)
+        if not email:
+            raise LocalAPIError("Invalid JWT")
+        user = self.users[email]
+        return SimpleNamespace(user=SimpleNamespace(id=user["id"], email=user["email"]))
+
+    def sign_out(self):
+        pass
+
+
+class LocalBucket:
+    def __init__(self, name: str, objects: Dict[str, bytes]):
+        self.name = name
+        self.objects = objects
+
+    def upload(self, path: str, file: Any, file_options: Optional[Dict[str, str]] = None):
+        if path in self.objects and str((file_options or {}).get("upsert", "false")).lower() != "true":
+            raise LocalAPIError("Duplicate: The resource already exists")
+        self.objects[path] = file if isinstance(file, bytes) else file.read()
+        return SimpleNamespace(path=path)
+
+    def exists(self, path: str) -> bool:
+        return path in self.objects
+
+    def download(self, path: str) -> bytes:
+        if path not in self.objects:
+            raise LocalAPIError("Object not found")
+        return self.objects[path]
+
+    def get_public_url(self, path: str, options: Optional[Dict[str, Any]] = None) -> str:
+        return f"http://localhost/storage/v1/object/public/{self.name}/{path}?"
+
+
+class LocalStorageClient:
+    def __init__(self):
+        self.buckets: Dict[str, Dict[str, bytes]] = {}
+
+    def from_(self, bucket: str) -> LocalBucket:
+        return LocalBucket(bucket, self.buckets.setdefault(bucket, {}))
+
+
+class LocalSupabaseClient:
+    """Drop-in for supabase.Client: table()/from_(), auth and storage, all in memory"""
+
+    def __init__(self, db: Optional[LocalDatabase] = None):
+        self.db = db or LocalDatabase()
+        self.auth = LocalAuth()
+        self.storage = LocalStorageClient()
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self.db, name)
+
+    def from_(self, name: str) -> LocalQuery:
+        return self.table(name)
+
+
+def seed_local_client(client: LocalSupabaseClient) -> LocalSupabaseClient:
+    """Partner organizations with one admin each; admin-<org>@datara.local signs in with LOCAL_PASSWORD"""
+    orgs = client.db.load_rows("partner_organizations", [
+        {"display_name": name} for name in SEED_PARTNER_ORGS
+    ])
+    for org in orgs:
+        slug = org["display_name"].lower()
+        email = f"admin-{slug}@datara.local"
+        client.db.load_rows("admins", [{
+            "partner_org_id": org["partner_org_id"],
+            "email": email,
+            "first_name": org["display_name"],
+            "last_name": "Admin",
+        }])
+        client.auth.add_user(email)
+    return client
+
+
+def create_local_client(seed: bool = True) -> LocalSupabaseClient:
+    """A fresh in-memory client, seeded with partner organizations and admins unless seed=False"""
+    client = LocalSupabaseClient()
+    return seed_local_client(client) if seed else client
@@ -0,0 +1,278 @@
+# utils/profiling.py - Opt-in per-page render profiler with a time breakdown, flame summary and profile files
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from utils.instrumentation import REPO_ROOT
+
+SAMPLE_INTERVAL = 0.002
+DEFAULT_PROFILE_DIR = os.path.join(REPO_ROOT, "profiles")
+# Profiled renders kept per page; older files are deleted as new ones are written
+MAX_PROFILES_PER_PAGE = 20
+
+# Repo files that are plumbing around backend calls, counted as backend I/O rather than app code
+_BACKEND_FILES = {
+    os.path.join(REPO_ROOT, "utils", "instrumentation.py"),
+    os.path.join(REPO_ROOT, "utils", "local_backend.py"),
+}
+
+# Library the app called into -> category; the first matching package wins
+CATEGORIES = [
+    ("Backend I/O", ("postgrest", "supabase", "httpx", "httpcore", "gotrue", "storage3", "h2", "ssl", "socket")),
+    ("DataFrame construction", ("pandas", "numpy", "pyarrow")),
+    ("Plotly figures", ("plotly",)),
+    ("Widget emission", ("streamlit",)),
+    # Pages import their modules on first visit
+    ("Module imports", ("importlib",)),
+]
+
+
+def _profile_setting() -> Optional[str]:
+    """'sample' or 'full' from [debug] page_profiling in secrets or PAGE_PROFILING; None when unset"""
+    try:
+        setting = st.secrets.get("debug", {}).get("page_profiling")
+    except Exception:
+        setting = None
+    setting = setting if setting is not None else os.environ.get("PAGE_PROFILING")
+    if setting in (None, False, "", "0", "false", "off"):
+        return None
+    return "full" if str(setting).lower() == "full" else "sample"
+
+
+def profiling_mode(role: Optional[str]) -> Optional[str]:
+    """
+    How to profile this rerun: None, 'sample' (sampling only) or 'full'
+    (sampling plus cProfile, slower but with exact call counts).
+
+    The secret profiles every session. The ?profile=1 / ?profile=full query
+    param is honoured for admins only, so visitors cannot switch it on.
+    """
+    setting = _profile_setting()
+    if setting:
+        return setting
+    if role == 'admin':
+        value = st.query_params.get("profile")
+        if value:
+            return "full" if value == "full" else "sample"
+    return None
+
+
+def _package(filename: str) -> Optional[str]:
+    """Top-level package of a library file, None for app code"""
+    if filename in _BACKEND_FILES:
+        return "postgrest"
+    if filename.startswith(REPO_ROOT) and "site-packages" not in filename:
+        return None
+    if filename.startswith("<frozen importlib"):
+        return "importlib"
+    match = (re.search(r"site-packages[/\\]([A-Za-z0-9_]+)", filename)
+             or re.search(r"python3\.\d+[/\\]([A-Za-z0-9_]+)", filename))
+    return match.group(1) if match else os.path.basename(filename)
+
+
+def _category(package: Optional[str]) -> str:
+    if package is None:
+        return "App code"
+    for name, packages in CATEGORIES:
+        if package in packages:
+            return name
+    return "Other libraries"
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's stack every few milliseconds, keeping identical stacks as one weighted entry"""
+
+    def __init__(self, target_ident: int, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="page-profiler", daemon=True)
+        self.target_ident = target_ident
+        self.interval = interval
+        self.frames: List[Dict[str, Any]] = []
+        self.stacks: Dict[Tuple[int, ...], float] = defaultdict(float)
+        self._frame_index: Dict[Any, int] = {}
+        self._stop_event = threading.Event()
+
+    def _index(self, code) -> int:
+        index = self._frame_index.get(code)
+        if index is None:
+            index = self._frame_index[code] = len(self.frames)
+            self.frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+        return index
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            now = time.perf_counter()
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                stack.append(self._index(frame.f_code))
+                frame = frame.f_back
+            # Root first, like a flame graph; the weight is the wall time since the previous sample
+            self.stacks[tuple(reversed(stack))] += (now - last) * 1000
+            last = now
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class PageProfile:
+    """One profiled page render: sampled stacks, optionally a cProfile run, and the files written"""
+
+    def __init__(self, page: str, mode: str = "sample"):
+        self.page = page
+        self.mode = mode
+        self.elapsed_ms = 0.0
+        self.files: List[str] = []
+        self._sampler: Optional[_Sampler] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._start = 0.0
+
+    def start(self):
+        self._sampler = _Sampler(threading.get_ident())
+        self._sampler.start()
+        if self.mode == "full":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self.elapsed_ms = (time.perf_counter() - self._start) * 1000
+        if self._profiler:
+            self._profiler.disable()
+        self._sampler.stop()
+        try:
+            self.files = self._write_files()
+        except OSError as e:
+            st.warning(f"Could not write profile files: {e}")
+
+    def _app_path(self, stack: Tuple[int, ...]) -> Tuple[List[int], str]:
+        """App frames of a sample, root first, and the category of whatever the innermost one called"""
+        frames = self._sampler.frames
+        path, category = [], "App code"
+        for index in stack:
+            package = _package(frames[index]["file"])
+            if package is None:
+                path.append(index)
+                category = "App code"
+            elif path and category == "App code":
+                # The first library frame below app code decides where the time went
+                category = _category(package)
+        return path, category
+
+    def breakdown(self) -> Dict[str, float]:
+        """Sampled milliseconds per category"""
+        totals: Dict[str, float] = defaultdict(float)
+        for stack, ms in self._sampler.stacks.items():
+            totals[self._app_path(stack)[1]] += ms
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def flame_summary(self, min_share: float = 0.03, max_depth: int = 10) -> str:
+        """Indented call tree of app functions with inclusive time; branches under min_share are left out"""
+        frames = self._sampler.frames
+        tree: Dict[Any, Any] = {"ms": 0.0, "children": {}}
+        for stack, ms in self._sampler.stacks.items():
+            path, category = self._app_path(stack)
+            node = tree
+            node["ms"] += ms
+            labels = [
+                f"{os.path.relpath(frames[i]['file'], REPO_ROOT)}:{frames[i]['line']} {frames[i]['name']}" for i in path
+            ]
+            if category != "App code":
+                labels.append(f"[{category}]")
+            for label in labels[:max_depth]:
+                node = node["children"].setdefault(label, {"ms": 0.0, "children": {}})
+                node["ms"] += ms
+
+        total = tree["ms"] or 1.0
+        lines = [f"{tree['ms']:8.0f} ms  100%  {self.page}"]
+
+        def walk(node, depth):
+            for label, child in sorted(node["children"].items(), key=lambda item: item[1]["ms"], reverse=True):
+                if child["ms"] / total < min_share:
+                    continue
+                lines.append(f"{child['ms']:8.0f} ms {child['ms'] / total:4.0%}  {'  ' * depth}{label}")
+                walk(child, depth + 1)
+        walk(tree, 0)
+        return "\n".join(lines)
+
+    def speedscope(self) -> Dict[str, Any]:
+        """Sampled stacks in speedscope's file format"""
+        stacks = list(self._sampler.stacks.items())
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.page,
+            "exporter": "datara utils.profiling",
+            "shared": {"frames": self._sampler.frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.page,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(ms for _, ms in stacks),
+                "samples": [list(stack) for stack, _ in stacks],
+                "weights": [ms for _, ms in stacks],
+            }],
+        }
+
+    def _write_files(self) -> List[str]:
+        try:
+            out_dir = st.secrets.get("debug", {}).get("profile_dir") or DEFAULT_PROFILE_DIR
+        except Exception:
+            out_dir = DEFAULT_PROFILE_DIR
+        os.makedirs(out_dir, exist_ok=True)
+        page_slug = re.sub(r'[^A-Za-z0-9]+', '_', self.page).strip('_')
+        stem = os.path.join(out_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{page_slug}")
+        files = [f"{stem}.speedscope.json"]
+        with open(files[0], "w") as f:
+            json.dump(self.speedscope(), f)
+        if self._profiler:
+            files.append(f"{stem}.pstats")
+            self._profiler.dump_stats(files[1])
+        _remove_old_profiles(out_dir, page_slug)
+        return files
+
+
+def _remove_old_profiles(out_dir: str, page_slug: str, keep: int = MAX_PROFILES_PER_PAGE):
+    """Delete all but the newest `keep` renders of a page; names start with a sortable timestamp"""
+    pattern = re.compile(rf"^(\d{{8}}-\d{{6}}-\d{{6}})_{re.escape(page_slug)}\.(speedscope\.json|pstats)$")
+    renders: Dict[str, List[str]] = defaultdict(list)
+    for name in os.listdir(out_dir):
+        match = pattern.match(name)
+        if match:
+            renders[match.group(1)].append(name)
+    for timestamp in sorted(renders)[:-keep]:
+        for name in renders[timestamp]:
+            try:
+                os.remove(os.path.join(out_dir, name))
+            except OSError:
+                pass
+
+
+def display_profile_summary(profile: PageProfile):
+    """Expander with the time breakdown, the flame summary and where the profile files went"""
+    import pandas as pd
+
+    with st.expander(f"Page profile: {profile.page} ({profile.elapsed_ms:.0f} ms)"):
+        breakdown = profile.breakdown()
+        total = sum(breakdown.values()) or 1.0
+        st.dataframe(pd.DataFrame([
+            {"category": category, "ms": round(ms, 1), "share": f"{ms / total:.0%}"}
+            for category, ms in breakdown.items()
+        ]), hide_index=True, use_container_width=True)
+        if profile.mode == "full":
+            st.caption("cProfile was on for this render, which inflates call-heavy code; compare shares, not totals.")
+        st.code(profile.flame_summary(), language=None)
+        for path in profile.files:
+            st.caption(f"Written: {path}")
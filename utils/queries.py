@@ -4,110 +4,214 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, date
 import uuid
 import random
-from utils.db import get_supabase_client
+from utils.db import get_supabase_client, iter_query_pages
+from utils.rate_limit import allow_request
 from services.email_service import send_approval_email, send_scholar_activation_email
+from services.certification_feed import get_certification_feed
 
+# Partner organizations change rarely; admins can force a refresh with invalidate_partner_org_registry()
+PARTNER_ORG_TTL_SECONDS = 300
 
-def check_email_in_scholars(email: str, partner_org: str) -> bool:
-    """Check if email already exists as an active scholar for the given partner org"""
+
+@st.cache_data(ttl=PARTNER_ORG_TTL_SECONDS, show_spinner=False)
+def load_partner_org_registry() -> Dict[str, Dict[str, Any]]:
+    """Load all partner organizations once per TTL, indexed by display name and by id"""
     supabase = get_supabase_client()
-    try:
-        org_response = supabase.table("partner_organizations").select("partner_org_id").eq("display_name", partner_org).execute()
-        if not org_response.data:
-            return False
-        
-        partner_org_id = org_response.data[0]["partner_org_id"]
-        
-        scholar_response = supabase.table("scholars").select(
-            "scholar_id, applications!inner(email)"
-        ).eq("partner_org_id", partner_org_id).eq("is_active", True).execute()
-        
-        if scholar_response.data:
-            for scholar in scholar_response.data:
-                if scholar["applications"]["email"].lower() == email.lower():
-                    return True
-        return False
-    except Exception as e:
-        st.error(f"Error checking scholar email: {e}")
-        return False
+    response = supabase.table("partner_organizations").select(
+        "partner_org_id, display_name, is_active, is_accepting"
+    ).execute()
+    
+    return {
+        "by_name": {org["display_name"]: org for org in response.data},
+        "by_id": {org["partner_org_id"]: org for org in response.data}
+    }
+
+
+def invalidate_partner_org_registry():
+    """Drop the cached partner organizations so the next lookup reloads them"""
+    load_partner_org_registry.clear()
+
+
+def get_partner_org_id(display_name: str) -> Optional[str]:
+    """Resolve a partner organization display name to its id"""
+    org = load_partner_org_registry()["by_name"].get(display_name)
+    return org["partner_org_id"] if org else None
+
+
+def get_partner_org_name(partner_org_id: str) -> Optional[str]:
+    """Resolve a partner organization id to its display name"""
+    org = load_partner_org_registry()["by_id"].get(partner_org_id)
+    return org["display_name"] if org else None
+
+
+# Eligibility answers are reused briefly so reruns and repeated clicks don't re-query
+ELIGIBILITY_TTL_SECONDS = 60
+ELIGIBILITY_CHECKS_PER_MINUTE = 10
+
+
+def normalize_email(email: str) -> str:
+    """Email as matched against applications.email_lower; also the eligibility cache key"""
+    return email.strip().lower()
 
 
-def check_email_in_applications(email: str, partner_org: str) -> Optional[str]:
-    """Check if email already has an application for the given partner org"""
+@st.cache_data(ttl=ELIGIBILITY_TTL_SECONDS, show_spinner=False)
+def _fetch_application_eligibility(email: str, partner_org_id: str) -> Dict[str, Any]:
+    """
+    One applications query with the linked scholar embedded. `email` must be
+    normalized; email_lower is a computed column served by the lower(email)
+    index (supabase/migrations).
+    """
     supabase = get_supabase_client()
+    response = supabase.table("applications").select(
+        "status, applied_at, scholars(scholar_id, is_active)"
+    ).eq("partner_org_id", partner_org_id).eq(
+        "email_lower", email
+    ).order("applied_at", desc=True).execute()
+    
+    is_scholar = False
+    for application in response.data:
+        scholars = application.get("scholars") or []
+        # A one-to-one relation is embedded as an object, one-to-many as a list
+        if isinstance(scholars, dict):
+            scholars = [scholars]
+        if any(scholar.get("is_active") for scholar in scholars):
+            is_scholar = True
+    
+    return {
+        "is_scholar": is_scholar,
+        "application_status": response.data[0]["status"] if response.data else None
+    }
+
+
+def check_application_eligibility(email: str, partner_org: str) -> Dict[str, Any]:
+    """
+    Check whether an email is already an active scholar or applicant for a partner org.
+    
+    Returns is_scholar, application_status (latest application, or None) and
+    rate_limited, which is True when this session has made too many checks.
+    """
+    result = {"is_scholar": False, "application_status": None, "rate_limited": False}
+    
+    if not allow_request("eligibility_check", ELIGIBILITY_CHECKS_PER_MINUTE, 60):
+        result["rate_limited"] = True
+        return result
+    
     try:
-        org_response = supabase.table("partner_organizations").select("partner_org_id").eq("display_name", partner_org).execute()
-        if not org_response.data:
-            return None
-        
-        partner_org_id = org_response.data[0]["partner_org_id"]
-        
-        app_response = supabase.table("applications").select("status").eq("email", email).eq("partner_org_id", partner_org_id).execute()
-        
-        if app_response.data:
-            return app_response.data[0]["status"]
-        return None
+        partner_org_id = get_partner_org_id(partner_org)
+        if not partner_org_id:
+            return result
+        result.update(_fetch_application_eligibility(normalize_email(email), partner_org_id))
     except Exception as e:
-        st.error(f"Error checking application email: {e}")
-        return None
+        st.error(f"Error checking application eligibility: {e}")
+    return result
 
 
 def get_active_partner_organizations() -> List[str]:
     """Get list of active partner organizations accepting applications"""
-    supabase = get_supabase_client()
     try:
-        response = supabase.table("partner_organizations").select("display_name").eq("is_active", True).eq("is_accepting", True).execute()
-        return [org["display_name"] for org in response.data]
+        return [
+            name for name, org in load_partner_org_registry()["by_name"].items()
+            if org["is_active"] and org["is_accepting"]
+        ]
     except Exception as e:
         st.error(f"Error fetching partner organizations: {e}")
         return ["DataCamp", "Coursera", "Udacity", "edX"]
 
 
+# Demographic groups embedded in application queries; see extract_demographics()
+DEMOGRAPHICS_EMBED = "application_demographics(demographic_group)"
+
+# Certification count and one published job embedded in scholar queries; see with_scholar_activity()
+SCHOLAR_ACTIVITY_EMBEDS = "certifications(count), jobs(scholar_id)"
+
+
+def with_scholar_activity(query):
+    """Narrow the jobs embed of SCHOLAR_ACTIVITY_EMBEDS to one published job per scholar"""
+    return query.eq("jobs.is_published", True).limit(1, foreign_table="jobs")
+
+
+def extract_scholar_activity(scholars: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Turn the embedded activity into certifications_count and employment_status on each scholar"""
+    for scholar in scholars:
+        counts = scholar.pop("certifications", None) or [{"count": 0}]
+        scholar["certifications_count"] = counts[0]["count"]
+        scholar["employment_status"] = "Employed" if scholar.pop("jobs", None) else "Seeking"
+    return scholars
+
+
+# Row builders shared by the write paths below and benchmarks/synthetic_data.py,
+# so generated data has exactly the columns the app writes
+def build_application_record(form_data: Dict[str, Any], partner_org_id: str) -> Dict[str, Any]:
+    """applications row from the multi-step application form data"""
+    step_data = form_data
+    basic_info = step_data["Basic Information"]
+    geo_details = step_data["Geographic Details"]
+    edu_details = step_data["Education Details"]
+    interest_details = step_data["Interest Details"]
+    
+    return {
+        "partner_org_id": partner_org_id,
+        "email": step_data["Partner Organization & Data Privacy"]["email"],
+        "first_name": basic_info["first_name"],
+        "middle_name": basic_info.get("middle_name"),
+        "last_name": basic_info["last_name"],
+        "birthdate": str(basic_info["birthdate"]),
+        "gender": basic_info["gender"],
+        "country": geo_details["country"],
+        "state_region_province": geo_details["state"],
+        "city": geo_details["city"],
+        "postal_code": str(geo_details["postal"]),
+        "education_status": edu_details["education_status"],
+        "institution_country": edu_details["institution_country"],
+        "institution_name": edu_details["institution_name"],
+        "programming_experience": interest_details["programming_experience"],
+        "data_science_experience": interest_details["data_science_experience"],
+        "weekly_time_commitment": interest_details["time_commitment"],
+        "scholarship_reason": interest_details["why_scholarship"],
+        "career_goals": interest_details["career_goals"],
+        "status": "PENDING"
+    }
+
+
+def build_application_detail_records(application_id: str, form_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Demographic, device and connectivity rows for an application, by table"""
+    demo_details = form_data["Demographic and Connectivity"]
+    return {
+        "application_demographics": [
+            {"application_id": application_id, "demographic_group": demo} for demo in demo_details["demographic"]
+        ],
+        "application_devices": [
+            {"application_id": application_id, "device_type": device} for device in demo_details["devices"]
+        ],
+        "application_connectivity": [
+            {"application_id": application_id, "connectivity_type": conn} for conn in demo_details["connectivity"]
+        ]
+    }
+
+
+def build_scholar_record(scholar_id: str, moa_id: str, application_id: str, partner_org_id: str) -> Dict[str, Any]:
+    """scholars row created when an MoA is approved"""
+    return {
+        "scholar_id": scholar_id,
+        "moa_id": moa_id,
+        "application_id": application_id,
+        "partner_org_id": partner_org_id,
+        "is_active": True
+    }
+
+
 def save_application_to_database(form_data: Dict[str, Any]) -> bool:
     """Save complete application to database"""
     supabase = get_supabase_client()
     
     try:
-        org_response = supabase.table("partner_organizations").select("partner_org_id").eq(
-            "display_name", form_data["Partner Organization & Data Privacy"]["partner_org"]
-        ).execute()
+        partner_org_id = get_partner_org_id(form_data["Partner Organization & Data Privacy"]["partner_org"])
         
-        if not org_response.data:
+        if not partner_org_id:
             st.error("Partner organization not found")
             return False
         
-        partner_org_id = org_response.data[0]["partner_org_id"]
-        
-        step_data = form_data
-        basic_info = step_data["Basic Information"]
-        geo_details = step_data["Geographic Details"]
-        edu_details = step_data["Education Details"]
-        interest_details = step_data["Interest Details"]
-        demo_details = step_data["Demographic and Connectivity"]
-        
-        application_data = {
-            "partner_org_id": partner_org_id,
-            "email": step_data["Partner Organization & Data Privacy"]["email"],
-            "first_name": basic_info["first_name"],
-            "middle_name": basic_info.get("middle_name"),
-            "last_name": basic_info["last_name"],
-            "birthdate": str(basic_info["birthdate"]),
-            "gender": basic_info["gender"],
-            "country": geo_details["country"],
-            "state_region_province": geo_details["state"],
-            "city": geo_details["city"],
-            "postal_code": str(geo_details["postal"]),
-            "education_status": edu_details["education_status"],
-            "institution_country": edu_details["institution_country"],
-            "institution_name": edu_details["institution_name"],
-            "programming_experience": interest_details["programming_experience"],
-            "data_science_experience": interest_details["data_science_experience"],
-            "weekly_time_commitment": interest_details["time_commitment"],
-            "scholarship_reason": interest_details["why_scholarship"],
-            "career_goals": interest_details["career_goals"],
-            "status": "PENDING"
-        }
-        
+        application_data = build_application_record(form_data, partner_org_id)
         app_response = supabase.table("applications").insert(application_data).execute()
         
         if not app_response.data:
@@ -115,27 +219,13 @@ def save_application_to_database(form_data: Dict[str, Any]) -> bool:
         
         application_id = app_response.data[0]["application_id"]
         
-        # Insert demographics
-        for demo in demo_details["demographic"]:
-            supabase.table("application_demographics").insert({
-                "application_id": application_id,
-                "demographic_group": demo
-            }).execute()
-        
-        # Insert devices
-        for device in demo_details["devices"]:
-            supabase.table("application_devices").insert({
-                "application_id": application_id,
-                "device_type": device
-            }).execute()
-        
-        # Insert connectivity
-        for conn in demo_details["connectivity"]:
-            supabase.table("application_connectivity").insert({
-                "application_id": application_id,
-                "connectivity_type": conn
-            }).execute()
+        # Insert demographics, devices and connectivity, one request per table
+        for table, rows in build_application_detail_records(application_id, form_data).items():
+            if rows:
+                supabase.table(table).insert(rows).execute()
         
+        # The applicant now has an application; don't serve a cached "eligible" answer
+        _fetch_application_eligibility.clear(normalize_email(application_data["email"]), partner_org_id)
         return True
         
     except Exception as e:
@@ -150,7 +240,7 @@ def get_applications_for_admin(partner_org_id: str, status_filter: Optional[str]
         query = supabase.table("applications").select(
             "application_id, email, first_name, last_name, status, applied_at, "
             "country, education_status, programming_experience, data_science_experience, "
-            "state_region_province, city, institution_name"
+            f"state_region_province, city, institution_name, {DEMOGRAPHICS_EMBED}"
         ).eq("partner_org_id", partner_org_id)
         
         if status_filter:
@@ -301,16 +391,16 @@ def get_admin_dashboard_metrics(partner_org_id: str) -> Dict[str, int]:
 
 
 def get_scholars_for_admin(partner_org_id: str) -> List[Dict[str, Any]]:
-    """Get scholars list for admin with enhanced data"""
+    """Get scholars list for admin with certification counts and employment, in one query"""
     supabase = get_supabase_client()
     try:
-        response = supabase.table("scholars").select(
+        response = with_scholar_activity(supabase.table("scholars").select(
             "scholar_id, created_at, is_active, "
-            "applications!inner(application_id, first_name, last_name, email, country), "
-            "partner_organizations!inner(display_name)"
-        ).eq("partner_org_id", partner_org_id).order("created_at", desc=True).execute()
+            f"applications!inner(application_id, first_name, last_name, email, country, {DEMOGRAPHICS_EMBED}), "
+            f"partner_organizations!inner(display_name), {SCHOLAR_ACTIVITY_EMBEDS}"
+        )).eq("partner_org_id", partner_org_id).order("created_at", desc=True).execute()
         
-        return response.data
+        return extract_scholar_activity(response.data)
     except Exception as e:
         st.error(f"Error fetching scholars: {e}")
         return []
@@ -364,13 +454,9 @@ def approve_moa_submission(moa_id: str, admin_id: str = None, reason: str = None
             # Generate scholar ID and create scholar record
             scholar_id = generate_scholar_id()
             
-            supabase.table("scholars").insert({
-                "scholar_id": scholar_id,
-                "moa_id": moa_id,
-                "application_id": moa_data['approved_applicants']['application_id'],
-                "partner_org_id": application['partner_org_id'],
-                "is_active": True
-            }).execute()
+            supabase.table("scholars").insert(build_scholar_record(
+                scholar_id, moa_id, moa_data['approved_applicants']['application_id'], application['partner_org_id']
+            )).execute()
         else:
             # Update existing scholar to active
             scholar_id = existing_scholar.data[0]['scholar_id']
@@ -389,8 +475,7 @@ def approve_moa_submission(moa_id: str, admin_id: str = None, reason: str = None
             }).execute()
         
         # Get partner organization name
-        partner_response = supabase.table("partner_organizations").select("display_name").eq("partner_org_id", application['partner_org_id']).execute()
-        partner_org_name = partner_response.data[0]['display_name'] if partner_response.data else "Partner Organization"
+        partner_org_name = get_partner_org_name(application['partner_org_id']) or "Partner Organization"
         
         # Send scholar activation email
         scholar_name = f"{application['first_name']} {application['last_name']}"
@@ -453,34 +538,38 @@ def get_moa_review_history(moa_id: str) -> List[Dict[str, Any]]:
         return []
 
 
-def generate_approved_applicant_id() -> str:
-    """Generate unique approved applicant ID in format APP12345678"""
+ID_CANDIDATES_PER_QUERY = 5
+
+
+def _generate_unique_id(table: str, column: str, prefix: str) -> str:
+    """
+    Random PREFIX12345678 ID not yet used in table.column.
+    
+    Several candidates are checked in one query, so a collision does not
+    cost another round trip.
+    """
     supabase = get_supabase_client()
     
     while True:
-        applicant_id = f"APP{random.randint(10000000, 99999999)}"
+        candidates = [f"{prefix}{random.randint(10000000, 99999999)}" for _ in range(ID_CANDIDATES_PER_QUERY)]
         try:
-            # Check if ID already exists
-            existing = supabase.table("approved_applicants").select("approved_applicant_id").eq("approved_applicant_id", applicant_id).execute()
-            if not existing.data:
-                return applicant_id
+            existing = supabase.table(table).select(column).in_(column, candidates).execute()
         except:
-            return applicant_id
+            return candidates[0]
+        taken = {row[column] for row in existing.data}
+        for candidate in candidates:
+            if candidate not in taken:
+                return candidate
+
+
+def generate_approved_applicant_id() -> str:
+    """Generate unique approved applicant ID in format APP12345678"""
+    return _generate_unique_id("approved_applicants", "approved_applicant_id", "APP")
 
 
 def generate_scholar_id() -> str:
     """Generate unique scholar ID in format SCH12345678"""
-    supabase = get_supabase_client()
-    
-    while True:
-        scholar_id = f"SCH{random.randint(10000000, 99999999)}"
-        try:
-            # Check if ID already exists
-            existing = supabase.table("scholars").select("scholar_id").eq("scholar_id", scholar_id).execute()
-            if not existing.data:
-                return scholar_id
-        except:
-            return scholar_id
+    return _generate_unique_id("scholars", "scholar_id", "SCH")
 
 
 def toggle_scholar_status(scholar_id: str, is_active: bool) -> bool:
@@ -696,18 +785,18 @@ def search_applications(partner_org_id: str, search_query: str, filters: Dict[st
 def bulk_update_applications(application_ids: List[str], new_status: str, admin_id: str, reason: str = None) -> bool:
     """Bulk update multiple applications"""
     supabase = get_supabase_client()
+    if not application_ids:
+        return True
     try:
-        for app_id in application_ids:
-            # Update application
-            supabase.table("applications").update({"status": new_status}).eq("application_id", app_id).execute()
-            
-            # Create review record
-            supabase.table("application_reviews").insert({
-                "application_id": app_id,
-                "admin_id": admin_id,
-                "action": new_status,
-                "action_reason": reason
-            }).execute()
+        # One update and one insert for the whole selection
+        supabase.table("applications").update({"status": new_status}).in_("application_id", application_ids).execute()
+        
+        supabase.table("application_reviews").insert([{
+            "application_id": app_id,
+            "admin_id": admin_id,
+            "action": new_status,
+            "action_reason": reason
+        } for app_id in application_ids]).execute()
         
         return True
     except Exception as e:
@@ -745,12 +834,67 @@ def get_scholar_detailed_info(scholar_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+# Everything the scholar profile page shows, fetched in one request
+PROFILE_BUNDLE_KEY = "_profile_bundle"
+PROFILE_CERTIFICATION_COLUMNS = (
+    "certification_id, name, issuing_organization, issue_month, issue_year, "
+    "expiration_month, expiration_year, credential_url, created_at, "
+    "certificate_file_url, certificate_mime_type, certificate_sha256"
+)
+PROFILE_BUNDLE_COLUMNS = (
+    "scholar_id, application_id, partner_org_id, is_active, created_at, "
+    "partner_organizations(display_name), "
+    "applications(application_id, email, birthdate, first_name, last_name, gender, country, "
+    "state_region_province, city, postal_code, education_status, institution_name, institution_country), "
+    f"certifications({PROFILE_CERTIFICATION_COLUMNS})"
+)
+
+
+def get_scholar_profile_bundle(scholar_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch the scholar, their application and certifications (newest first) in one query"""
+    supabase = get_supabase_client()
+    try:
+        response = supabase.table("scholars").select(PROFILE_BUNDLE_COLUMNS).eq(
+            "scholar_id", scholar_id
+        ).order("created_at", desc=True, foreign_table="certifications").limit(1).execute()
+
+        if not response.data:
+            return None
+
+        scholar = response.data[0]
+        return {
+            "application": _first_embedded(scholar.pop("applications")) or {},
+            "certifications": scholar.pop("certifications") or [],
+            "scholar": scholar
+        }
+    except Exception as e:
+        st.error(f"Error loading profile: {e}")
+        return None
+
+
+def get_profile_bundle(scholar_id: str) -> Optional[Dict[str, Any]]:
+    """Profile bundle for the logged-in scholar, fetched once and kept in session state"""
+    bundle = st.session_state.get(PROFILE_BUNDLE_KEY)
+    if bundle is None or bundle["scholar"]["scholar_id"] != scholar_id:
+        bundle = get_scholar_profile_bundle(scholar_id)
+        st.session_state[PROFILE_BUNDLE_KEY] = bundle
+    return bundle
+
+
+def add_certification_to_profile_bundle(certification: Dict[str, Any]):
+    """Put a newly inserted certification at the top of the cached bundle, if one is loaded"""
+    bundle = st.session_state.get(PROFILE_BUNDLE_KEY)
+    if bundle and bundle["scholar"]["scholar_id"] == certification.get("scholar_id"):
+        bundle["certifications"].insert(0, certification)
+
+
 def create_certification(scholar_id: str, certification_data: Dict[str, Any]) -> bool:
     """Create a new certification for a scholar"""
     supabase = get_supabase_client()
     try:
         certification_data["scholar_id"] = scholar_id
         supabase.table("certifications").insert(certification_data).execute()
+        get_certification_feed().invalidate()
         return True
     except Exception as e:
         st.error(f"Error creating certification: {e}")
@@ -763,6 +907,7 @@ def update_certification(certification_id: str, certification_data: Dict[str, An
     try:
         certification_data["updated_at"] = datetime.now().isoformat()
         supabase.table("certifications").update(certification_data).eq("certification_id", certification_id).execute()
+        get_certification_feed().clear()
         return True
     except Exception as e:
         st.error(f"Error updating certification: {e}")
@@ -774,6 +919,7 @@ def delete_certification(certification_id: str) -> bool:
     supabase = get_supabase_client()
     try:
         supabase.table("certifications").delete().eq("certification_id", certification_id).execute()
+        get_certification_feed().remove(certification_id)
         return True
     except Exception as e:
         st.error(f"Error deleting certification: {e}")
@@ -874,60 +1020,72 @@ def check_scholar_exists_for_application(application_id: str) -> Optional[str]:
         return None
 
 
+# Credential lookups match email and birthdate in the database, so a wrong
+# guess returns no row at all instead of the applicant's details. The email is
+# compared with eq on email_lower, never a pattern, so wildcards match nothing.
+SCHOLAR_LOGIN_COLUMNS = (
+    "scholar_id, partner_org_id, is_active, created_at, "
+    "applications!inner(email, birthdate, first_name, last_name, country, education_status, "
+    "programming_experience, data_science_experience, institution_name, institution_country, "
+    "state_region_province, city, postal_code), "
+    "partner_organizations!inner(display_name)"
+)
+
+APPROVED_APPLICANT_LOGIN_COLUMNS = (
+    "approved_applicant_id, application_id, created_at, "
+    "applications!inner(email, birthdate, first_name, last_name, country, education_status, "
+    "institution_name, institution_country, state_region_province, city, postal_code, partner_org_id, "
+    "partner_organizations!inner(display_name), "
+    "scholars(scholar_id))"
+)
+
+
+def _first_embedded(value) -> Optional[Dict[str, Any]]:
+    """An embedded relation comes back as an object, a list or null; return its first row"""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
 def get_scholar_by_credentials(scholar_id: str, email: str, birthdate: str) -> Optional[Dict[str, Any]]:
     """Get scholar by credentials for authentication"""
     supabase = get_supabase_client()
     try:
-        response = supabase.table("scholars").select(
-            "scholar_id, partner_org_id, is_active, created_at, "
-            "applications!inner(email, birthdate, first_name, last_name, country, education_status, programming_experience, data_science_experience, institution_name), "
-            "partner_organizations!inner(display_name)"
-        ).eq("scholar_id", scholar_id).eq("is_active", True).execute()
+        response = supabase.table("scholars").select(SCHOLAR_LOGIN_COLUMNS).eq(
+            "scholar_id", scholar_id
+        ).eq("is_active", True).eq(
+            "applications.email_lower", normalize_email(email)
+        ).eq("applications.birthdate", str(birthdate)).limit(1).execute()
         
-        if response.data:
-            scholar_data = response.data[0]
-            application_data = scholar_data['applications']
-            
-            # Verify email and birth date
-            if (application_data['email'].lower() == email.lower() and 
-                str(application_data['birthdate']) == str(birthdate)):
-                return scholar_data
-        
-        return None
+        return response.data[0] if response.data else None
     except Exception as e:
         st.error(f"Error fetching scholar credentials: {e}")
         return None
 
 
 def get_approved_applicant_by_credentials(approved_applicant_id: str, email: str, birthdate: str) -> Optional[Dict[str, Any]]:
-    """Get approved applicant by credentials for authentication - FIXED"""
+    """
+    Get approved applicant by credentials for authentication.
+    
+    The linked scholar (if the applicant was already promoted) comes back in
+    the same query; in that case an already_scholar marker is returned.
+    """
     supabase = get_supabase_client()
     try:
-        # Fixed query with correct table relationships
-        response = supabase.table("approved_applicants").select(
-            "approved_applicant_id, application_id, created_at, "
-            "applications!inner(email, birthdate, first_name, last_name, partner_org_id, "
-            "partner_organizations!inner(display_name))"
-        ).eq("approved_applicant_id", approved_applicant_id).execute()
+        response = supabase.table("approved_applicants").select(APPROVED_APPLICANT_LOGIN_COLUMNS).eq(
+            "approved_applicant_id", approved_applicant_id
+        ).eq(
+            "applications.email_lower", normalize_email(email)
+        ).eq("applications.birthdate", str(birthdate)).limit(1).execute()
         
-        if response.data:
-            applicant_data = response.data[0]
-            application_data = applicant_data['applications']
-            
-            # Verify email and birth date
-            if (application_data['email'].lower() == email.lower() and 
-                str(application_data['birthdate']) == str(birthdate)):
-                
-                # Check if they haven't become a scholar yet
-                scholar_check = supabase.table("scholars").select("scholar_id").eq("application_id", applicant_data['application_id']).execute()
-                
-                if not scholar_check.data:
-                    return applicant_data
-                else:
-                    # They're already a scholar
-                    return {"error": "already_scholar", "scholar_id": scholar_check.data[0]['scholar_id']}
+        if not response.data:
+            return None
         
-        return None
+        applicant_data = response.data[0]
+        scholar = _first_embedded(applicant_data['applications'].pop('scholars', None))
+        if scholar:
+            return {"error": "already_scholar", "scholar_id": scholar['scholar_id']}
+        return applicant_data
     except Exception as e:
         st.error(f"Error fetching approved applicant credentials: {e}")
         return None
@@ -957,7 +1115,7 @@ def get_moa_submissions_for_admin(partner_org_id: str) -> List[Dict[str, Any]]:
     try:
         # Fixed query with correct table relationships
         response = supabase.table("moa_submissions").select(
-            "moa_id, submitted_at, status, digital_signature, "
+            "moa_id, submitted_at, status, digital_signature, document_url, document_sha256, "
             "approved_applicants!inner(approved_applicant_id, "
             "applications!inner(application_id, first_name, last_name, email, partner_org_id, country))"
         ).execute()
@@ -1002,13 +1160,9 @@ def approve_moa_submission(moa_id: str, admin_id: str = None, reason: str = None
             # Generate scholar ID and create scholar record
             scholar_id = generate_scholar_id()
             
-            supabase.table("scholars").insert({
-                "scholar_id": scholar_id,
-                "moa_id": moa_id,
-                "application_id": moa_data['approved_applicants']['application_id'],
-                "partner_org_id": application['partner_org_id'],
-                "is_active": True
-            }).execute()
+            supabase.table("scholars").insert(build_scholar_record(
+                scholar_id, moa_id, moa_data['approved_applicants']['application_id'], application['partner_org_id']
+            )).execute()
         else:
             # Update existing scholar to active
             scholar_id = existing_scholar.data[0]['scholar_id']
@@ -1027,8 +1181,7 @@ def approve_moa_submission(moa_id: str, admin_id: str = None, reason: str = None
             }).execute()
         
         # Get partner organization name
-        partner_response = supabase.table("partner_organizations").select("display_name").eq("partner_org_id", application['partner_org_id']).execute()
-        partner_org_name = partner_response.data[0]['display_name'] if partner_response.data else "Partner Organization"
+        partner_org_name = get_partner_org_name(application['partner_org_id']) or "Partner Organization"
         
         # Send scholar activation email
         scholar_name = f"{application['first_name']} {application['last_name']}"
@@ -1147,15 +1300,80 @@ def get_recent_activities(partner_org_id: str, limit: int = 10) -> Dict[str, Lis
             "recent_moas": []
         }
 
-def batch_fetch_demographics(supabase, application_ids, batch_size=100):
-    """Batch query demographics for a list of application_ids."""
-    demographics_lookup = {}
-    for i in range(0, len(application_ids), batch_size):
-        batch_ids = application_ids[i:i+batch_size]
-        demographics_data = supabase.table("application_demographics") \
-            .select("application_id, demographic_group") \
-            .in_("application_id", batch_ids) \
-            .execute().data
-        for row in demographics_data:
-            demographics_lookup.setdefault(row['application_id'], []).append(row['demographic_group'])
-    return demographics_lookup
\ No newline at end of file
+def extract_demographics(applications: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Move embedded application_demographics rows into an application_id -> groups lookup.
+    
+    Queries embed DEMOGRAPHICS_EMBED instead of fetching demographics in batches
+    afterwards, so a list of any size costs one round trip.
+    """
+    lookup = {}
+    for application in applications:
+        embedded = application.pop("application_demographics", None) or []
+        lookup[application["application_id"]] = [row["demographic_group"] for row in embedded]
+    return lookup
+
+
+# ============================================================================
+# EXPORT QUERIES - paged so a full history export never loads every row at once
+# ============================================================================
+
+EXPORT_PAGE_SIZE = 1000
+# Ids per in_() lookup; a page's worth of ids would make the PostgREST URL too long
+
+
+def iter_applications_for_export(partner_org_id: str, status_filter: Optional[str] = None,
+                                 page_size: int = EXPORT_PAGE_SIZE):
+    """Yield pages of an organization's applications with their demographic groups attached"""
+    supabase = get_supabase_client()
+    
+    def build_query():
+        query = supabase.table("applications").select(
+            "application_id, email, first_name, last_name, status, applied_at, "
+            f"country, education_status, programming_experience, data_science_experience, {DEMOGRAPHICS_EMBED}"
+        ).eq("partner_org_id", partner_org_id)
+        if status_filter:
+            query = query.eq("status", status_filter)
+        return query.order("applied_at", desc=True).order("application_id")
+    
+    for page in iter_query_pages(build_query, page_size):
+        demographics_lookup = extract_demographics(page)
+        for app in page:
+            app['demographics'] = demographics_lookup.get(app['application_id'], [])
+        yield page
+
+
+def iter_scholars_for_export(partner_org_id: str, page_size: int = EXPORT_PAGE_SIZE):
+    """Yield pages of an organization's scholars with certification counts and employment"""
+    supabase = get_supabase_client()
+    
+    def build_query():
+        return with_scholar_activity(supabase.table("scholars").select(
+            "scholar_id, created_at, is_active, "
+            f"applications!inner(application_id, first_name, last_name, email, country, {DEMOGRAPHICS_EMBED}), "
+            f"{SCHOLAR_ACTIVITY_EMBEDS}"
+        )).eq("partner_org_id", partner_org_id).order("created_at", desc=True).order("scholar_id")
+    
+    for page in iter_query_pages(build_query, page_size):
+        extract_scholar_activity(page)
+        demographics_lookup = extract_demographics([scholar['applications'] for scholar in page])
+        
+        for scholar in page:
+            scholar['demographics'] = demographics_lookup.get(scholar['applications']['application_id'], [])
+        yield page
+
+
+def iter_moa_submissions_for_export(partner_org_id: str, page_size: int = EXPORT_PAGE_SIZE):
+    """Yield pages of an organization's MoA submissions, filtered by organization in the database"""
+    supabase = get_supabase_client()
+    
+    def build_query():
+        return supabase.table("moa_submissions").select(
+            "moa_id, submitted_at, status, digital_signature, "
+            "approved_applicants!inner(approved_applicant_id, "
+            "applications!inner(application_id, first_name, last_name, email, partner_org_id, country))"
+        ).eq(
+            "approved_applicants.applications.partner_org_id", partner_org_id
+        ).order("submitted_at", desc=True).order("moa_id")
+    
+    yield from iter_query_pages(build_query, page_size)
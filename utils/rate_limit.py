@@ -0,0 +1,283 @@
+# utils/rate_limit.py - Token-bucket rate limiting for public endpoints and logins
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Buckets that have refilled completely are dropped once the in-memory store tracks this many
+# keys; SQLite stores drop them on a small share of writes
+MAX_TRACKED_BUCKETS = 10000
+PRUNE_PROBABILITY = 0.01
+
+# Login attempts allowed per scope: (burst capacity, seconds to refill the whole bucket).
+# The IP bucket is wider because campus and office networks share one address. "target" is
+# per account and IP; "account" caps an account across all addresses, loose enough that a
+# guesser can only delay the owner briefly rather than lock them out.
+LOGIN_LIMITS = {
+    "session": (5, 60),
+    "ip": (20, 60),
+    "target": (5, 900),
+    "account": (30, 900),
+}
+
+# Scopes a successful login refills; the shared ip and account counts keep running
+RESET_ON_SUCCESS = ("session", "target")
+
+
+class _BucketStore:
+    """
+    Where bucket state lives: SQLite when a path is configured, otherwise a process-local
+    dict. Every limiter on the same path shares one store, so a login attempt can check
+    and charge several buckets inside a single transaction.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.lock = threading.RLock()
+        self._depth = 0
+        self._buckets: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._db = None
+        if db_path:
+            # Autocommit mode, so transactions are only the explicit BEGIN IMMEDIATE below
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=5)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "limiter TEXT NOT NULL, bucket_key TEXT NOT NULL, tokens REAL NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (limiter, bucket_key))"
+            )
+
+    @contextmanager
+    def transaction(self):
+        """
+        Hold the store for a read-modify-write. With SQLite the outermost block is one
+        BEGIN IMMEDIATE transaction, which also locks out other processes until it ends.
+        """
+        with self.lock:
+            outer = self._depth == 0 and self._db is not None
+            if outer:
+                self._db.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if outer:
+                    self._db.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if outer:
+                self._db.execute("COMMIT")
+
+    def load(self, limiter: str, key: str) -> Optional[Tuple[float, float]]:
+        if self._db is None:
+            return self._buckets.get((limiter, key))
+        row = self._db.execute(
+            "SELECT tokens, updated_at FROM rate_limit_buckets WHERE limiter = ? AND bucket_key = ?",
+            (limiter, key)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def save(self, limiter: str, key: str, tokens: float, now: float):
+        if self._db is None:
+            self._buckets[(limiter, key)] = (tokens, now)
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO rate_limit_buckets (limiter, bucket_key, tokens, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            (limiter, key, tokens, now)
+        )
+
+    def delete(self, limiter: str, key: str):
+        if self._db is None:
+            self._buckets.pop((limiter, key), None)
+            return
+        self._db.execute(
+            "DELETE FROM rate_limit_buckets WHERE limiter = ? AND bucket_key = ?",
+            (limiter, key)
+        )
+
+    def prune(self, limiter: str, capacity: float, refill_rate: float, now: float):
+        """Forget buckets that are full again; they behave exactly like unseen keys"""
+        if self._db is None:
+            if len(self._buckets) > MAX_TRACKED_BUCKETS:
+                for (name, key), (tokens, updated_at) in list(self._buckets.items()):
+                    if name == limiter and tokens + (now - updated_at) * refill_rate >= capacity:
+                        del self._buckets[(name, key)]
+            return
+        self._db.execute(
+            "DELETE FROM rate_limit_buckets WHERE limiter = ? AND tokens + (? - updated_at) * ? >= ?",
+            (limiter, now, refill_rate, capacity)
+        )
+
+
+class TokenBucketLimiter:
+    """
+    Thread-safe token buckets keyed by string, shared by every session in the process.
+
+    Each key starts with `capacity` tokens and regains them at capacity / period_seconds
+    per second. With db_path set, SQLite is the only copy of the bucket state, so limits
+    survive restarts and hold across processes on the same host.
+    """
+
+    def __init__(self, name: str, capacity: int, period_seconds: float, db_path: Optional[str] = None,
+                 store: Optional[_BucketStore] = None):
+        self.name = name
+        self.capacity = float(capacity)
+        self.refill_rate = capacity / period_seconds
+        self.store = store or _BucketStore(db_path)
+
+    def _tokens(self, key: str, now: float) -> float:
+        tokens, updated_at = self.store.load(self.name, key) or (self.capacity, now)
+        return min(self.capacity, tokens + max(0.0, now - updated_at) * self.refill_rate)
+
+    def peek(self, key: str, cost: float = 1) -> bool:
+        """Whether `cost` tokens are available, without taking them"""
+        with self.store.transaction():
+            return self._tokens(key, time.time()) >= cost
+
+    def consume(self, key: str, cost: float = 1) -> bool:
+        """Take `cost` tokens if available and return whether they were taken"""
+        with self.store.transaction():
+            now = time.time()
+            tokens = self._tokens(key, now)
+            if tokens < cost:
+                return False
+            self.store.save(self.name, key, tokens - cost, now)
+            # Only now and then, so pruning stays off the hot path
+            if random.random() < PRUNE_PROBABILITY:
+                self.store.prune(self.name, self.capacity, self.refill_rate, now)
+            return True
+
+    def retry_after(self, key: str, cost: float = 1) -> float:
+        """Seconds until `cost` tokens are available for key"""
+        with self.store.transaction():
+            missing = cost - self._tokens(key, time.time())
+            return max(0.0, missing / self.refill_rate)
+
+    def reset(self, key: str):
+        """Refill a bucket completely"""
+        with self.store.transaction():
+            self.store.delete(self.name, key)
+
+
+def _rate_limit_db_path() -> Optional[str]:
+    """SQLite file for bucket persistence, from [rate_limit] sqlite_path in secrets or RATE_LIMIT_DB"""
+    try:
+        path = st.secrets.get("rate_limit", {}).get("sqlite_path")
+    except Exception:
+        path = None
+    return path or os.environ.get("RATE_LIMIT_DB") or None
+
+
+@st.cache_resource(show_spinner=False)
+def _get_bucket_store(db_path: Optional[str]) -> _BucketStore:
+    """Process-wide bucket store, one per SQLite path"""
+    return _BucketStore(db_path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_limiter(name: str, capacity: int, period_seconds: float) -> TokenBucketLimiter:
+    """Process-wide limiter, one per name and limit"""
+    return TokenBucketLimiter(name, capacity, period_seconds, store=_get_bucket_store(_rate_limit_db_path()))
+
+
+def session_key() -> str:
+    """Id of the current browser session"""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "no-session"
+
+
+def _trusted_proxy_count() -> int:
+    """Reverse proxies in front of the app, from [rate_limit] trusted_proxies in secrets or TRUSTED_PROXIES"""
+    try:
+        count = st.secrets.get("rate_limit", {}).get("trusted_proxies")
+    except Exception:
+        count = None
+    try:
+        return max(0, int(count if count is not None else os.environ.get("TRUSTED_PROXIES", 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def client_ip() -> str:
+    """
+    Client address for rate limiting.
+
+    Clients can put anything in X-Forwarded-For, so only the hops appended by our own
+    proxies are believed: with N trusted proxies the client is the N-th entry from the
+    right. With none configured, or a header too short to have passed through all of
+    them, the socket address is used.
+    """
+    try:
+        proxies = _trusted_proxy_count()
+        hops = [hop.strip() for hop in (st.context.headers.get("X-Forwarded-For") or "").split(",") if hop.strip()]
+        if proxies and len(hops) >= proxies:
+            return hops[-proxies]
+        return st.context.ip_address or "local"
+    except Exception:
+        return "unknown"
+
+
+def allow_request(action: str, max_calls: int, period_seconds: float) -> bool:
+    """Take one token from this session's bucket for `action` and return whether it was available"""
+    return get_limiter(action, max_calls, period_seconds).consume(f"session:{session_key()}")
+
+
+def _login_buckets(kind: str, target_id: str):
+    """
+    (limiter, key) for every scope a login attempt is charged to. The target bucket is
+    per account and IP, so guessing from one address can't lock the owner out elsewhere;
+    the account bucket bounds guesses spread over many addresses.
+    """
+    ip = client_ip()
+    account = (target_id or '').strip().lower()
+    keys = {
+        "session": session_key(),
+        "ip": ip,
+        "target": f"{account}|{ip}",
+        "account": account,
+    }
+    return [
+        (get_limiter(f"{kind}_login_{scope}", *LOGIN_LIMITS[scope]), f"{scope}:{keys[scope]}")
+        for scope in LOGIN_LIMITS
+    ]
+
+
+def acquire_login_attempt(kind: str, target_id: str) -> float:
+    """
+    Charge a login attempt to the session, client IP, account from this IP and account overall.
+
+    Returns 0 when the attempt may go ahead, otherwise the number of seconds to wait.
+    Nothing is charged when any bucket is empty, so a blocked attempt costs no tokens
+    and no network call. The check and the charge are one transaction on the shared
+    store, so concurrent attempts can't both pass on the last token.
+    """
+    buckets = _login_buckets(kind, target_id)
+    with buckets[0][0].store.transaction():
+        wait = max(limiter.retry_after(key) for limiter, key in buckets)
+        if wait > 0:
+            return wait
+        for limiter, key in buckets:
+            limiter.consume(key)
+    return 0.0
+
+
+def record_login_success(kind: str, target_id: str):
+    """Refill the session and per-(account, IP) buckets after a successful login"""
+    for limiter, key in _login_buckets(kind, target_id):
+        if key.split(":", 1)[0] in RESET_ON_SUCCESS:
+            limiter.reset(key)
+
+
+def format_retry_after(seconds: float) -> str:
+    """Human readable wait, e.g. '45 seconds' or '3 minutes'"""
+    seconds = int(seconds) + 1
+    if seconds < 60:
+        return f"{seconds} seconds"
+    minutes = -(-seconds // 60)
+    return f"{minutes} minute{'s' if minutes != 1 else ''}"
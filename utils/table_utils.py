@@ -1,10 +1,20 @@
 # utils/table_utils.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Callable
-import uuid
+from typing import List, Dict, Any, Optional, Callable, Hashable, Union
+import hashlib
+import io
+from collections import OrderedDict
+from utils.exports import write_export
+
+
+# Filter states whose results are memoized per table; typing a search term adds one per prefix
+MAX_FILTER_RESULTS = 64
+
+
+def _field_value(item: Dict[str, Any], field: Union[str, Callable]) -> Any:
+    """A filter field is a row key or a function of the row, for nested or derived values"""
+    return field(item) if callable(field) else item.get(field)
 
 
 class DataTable:
@@ -16,6 +26,11 @@ class DataTable:
         self.data = data
         self.config = table_config
         self.filtered_data = data.copy()
+        # Column indexes are built lazily on first use and reused for every filter change
+        self._value_indexes: Dict[str, Dict[Hashable, set]] = {}
+        self._search_indexes: Dict[str, List[str]] = {}
+        self._filter_results: "OrderedDict[tuple, List[int]]" = OrderedDict()
+        self.fingerprint: Optional[int] = None
         
     def render_filters(self) -> Dict[str, Any]:
         """Render filter controls and return filter values"""
@@ -52,41 +67,113 @@ class DataTable:
         return filters
     
     def apply_filters(self, filters: Dict[str, Any]):
-        """Apply filters to the data"""
-        self.filtered_data = self.data.copy()
+        """Apply filters to the data using the prebuilt column indexes"""
+        active = self._active_filters(filters)
+        if not active:
+            self.filtered_data = self.data.copy()
+            return
         
+        state_key = tuple(active)
+        if state_key in self._filter_results:
+            self._filter_results.move_to_end(state_key)
+        else:
+            self._filter_results[state_key] = self._match_positions(active)
+            if len(self._filter_results) > MAX_FILTER_RESULTS:
+                self._filter_results.popitem(last=False)
+        self.filtered_data = [self.data[pos] for pos in self._filter_results[state_key]]
+    
+    def _active_filters(self, filters: Dict[str, Any]) -> List[tuple]:
+        """Normalize filter values into a hashable, ordered filter state"""
+        configs = {f['key']: f for f in self.config.get('filters', [])}
+        active = []
         for filter_key, filter_value in filters.items():
-            if not filter_value:
-                continue
-                
-            filter_config = next((f for f in self.config.get('filters', []) if f['key'] == filter_key), None)
-            if not filter_config:
+            filter_config = configs.get(filter_key)
+            if not filter_value or not filter_config:
                 continue
             
-            field = filter_config.get('field', filter_key)
             filter_type = filter_config['type']
-            
             if filter_type == 'selectbox' and filter_value != 'All':
-                self.filtered_data = [item for item in self.filtered_data if item.get(field) == filter_value]
-            
+                active.append((filter_key, filter_type, filter_value))
             elif filter_type == 'text_input':
-                search_term = filter_value.lower()
-                if filter_config.get('search_fields'):
-                    # Search across multiple fields
-                    self.filtered_data = [
-                        item for item in self.filtered_data
-                        if any(search_term in str(item.get(search_field, '')).lower() 
-                              for search_field in filter_config['search_fields'])
-                    ]
-                else:
-                    # Search single field
-                    self.filtered_data = [
-                        item for item in self.filtered_data
-                        if search_term in str(item.get(field, '')).lower()
-                    ]
-            
+                active.append((filter_key, filter_type, filter_value.lower()))
             elif filter_type == 'multiselect':
-                self.filtered_data = [item for item in self.filtered_data if item.get(field) in filter_value]
+                active.append((filter_key, filter_type, frozenset(filter_value)))
+        return sorted(active, key=lambda f: f[0])
+    
+    def _match_positions(self, active: List[tuple]) -> List[int]:
+        """Intersect value indexes, then scan search blobs only for the remaining candidates"""
+        candidate_sets = []
+        text_filters = []
+        for filter_key, filter_type, value in active:
+            if filter_type == 'text_input':
+                text_filters.append((filter_key, value))
+                continue
+            
+            value_index = self._value_index(filter_key)
+            values = [value] if filter_type == 'selectbox' else value
+            matches = set()
+            for v in values:
+                matches |= value_index.get(v, set())
+            candidate_sets.append(matches)
+        
+        if candidate_sets:
+            candidate_sets.sort(key=len)
+            candidates = candidate_sets[0].intersection(*candidate_sets[1:])
+        else:
+            candidates = None
+        
+        for filter_key, term in text_filters:
+            if candidates is not None and not candidates:
+                break
+            # A longer search term only narrows an earlier result, so reuse it when cached
+            prefix_hit = self._cached_prefix_result(active, filter_key, term)
+            if prefix_hit is not None:
+                candidates = prefix_hit if candidates is None else candidates & prefix_hit
+            blobs = self._search_blobs(filter_key)
+            scan = range(len(blobs)) if candidates is None else candidates
+            candidates = {pos for pos in scan if term in blobs[pos]}
+        
+        return sorted(candidates)
+    
+    def _cached_prefix_result(self, active: List[tuple], filter_key: str, term: str) -> Optional[set]:
+        """Find a memoized result for the same filter state with a shorter search term"""
+        for length in range(len(term) - 1, 0, -1):
+            shorter = tuple(
+                (key, ftype, term[:length] if key == filter_key else value)
+                for key, ftype, value in active
+            )
+            if shorter in self._filter_results:
+                return set(self._filter_results[shorter])
+        return None
+    
+    def _filter_config(self, filter_key: str) -> Dict[str, Any]:
+        return next(f for f in self.config.get('filters', []) if f['key'] == filter_key)
+    
+    def _value_index(self, filter_key: str) -> Dict[Hashable, set]:
+        """Hash index of field value -> row positions, built once per filter"""
+        if filter_key not in self._value_indexes:
+            field = self._filter_config(filter_key).get('field', filter_key)
+            index = {}
+            for pos, item in enumerate(self.data):
+                value = _field_value(item, field)
+                # List and dict cells cannot be hash keys; those rows never match a value filter
+                if isinstance(value, (list, dict, set)):
+                    continue
+                index.setdefault(value, set()).add(pos)
+            self._value_indexes[filter_key] = index
+        return self._value_indexes[filter_key]
+    
+    def _search_blobs(self, filter_key: str) -> List[str]:
+        """Lowercased search text per row, built once per text filter"""
+        if filter_key not in self._search_indexes:
+            filter_config = self._filter_config(filter_key)
+            fields = filter_config.get('search_fields') or [filter_config.get('field', filter_key)]
+            # Fields are joined with a separator that cannot appear in a typed search term
+            self._search_indexes[filter_key] = [
+                "\x1f".join(str(_field_value(item, field) or '').lower() for field in fields)
+                for item in self.data
+            ]
+        return self._search_indexes[filter_key]
     
     def render_table(self) -> Optional[Dict[str, Any]]:
         """Render the data table and return selected item"""
@@ -115,42 +202,54 @@ class DataTable:
         
         df = pd.DataFrame(display_data)
         
-        # Apply styling if configured
+        # Badge columns are mapped once per category, no per-cell callback
         styled_df = df.drop(columns=['_raw_data'])
+        for badge_config in self.config.get('badges', []):
+            column = badge_config['column']
+            styled_df[column] = status_badge_series(styled_df[column], badge_config['badges'])
+        
+        # Legacy CSS styling: evaluate each rule once per distinct value in a single Styler pass
         if self.config.get('styling'):
-            for style_config in self.config['styling']:
-                column = style_config['column']
-                style_func = style_config['function']
-                styled_df = styled_df.style.applymap(style_func, subset=[column])
+            styled_df = styled_df.style.apply(
+                _build_category_styler(self.config['styling']), axis=None
+            )
         
         # Display table
         st.write(f"Showing {len(self.filtered_data)} records")
-        st.dataframe(
+        
+        if not self.config.get('enable_selection'):
+            st.dataframe(
+                styled_df,
+                use_container_width=True,
+                hide_index=True,
+                height=self.config.get('height', 400)
+            )
+            return None
+        
+        # Selection is keyed by row id (or position) so lookup is O(1) and
+        # rows with identical display values never collide
+        id_field = self.config.get('selection_id_field')
+        if id_field:
+            row_ids = [item.get(id_field) for item in self.filtered_data]
+            rows_by_id = index_rows_by_id(self.filtered_data, id_field)
+        else:
+            row_ids = list(range(len(self.filtered_data)))
+            rows_by_id = dict(enumerate(self.filtered_data))
+        
+        selected_id = render_selectable_dataframe(
             styled_df,
-            use_container_width=True,
-            hide_index=True,
+            row_ids,
+            key=f"table_selection_{self.config.get('table_id', 'default')}",
             height=self.config.get('height', 400)
         )
         
-        # Selection for actions
-        if self.config.get('enable_selection'):
-            selection_options = ["None"] + [
-                self.config['selection_display'](item) for item in self.filtered_data
-            ]
-            
-            selected_display = st.selectbox(
-                "Select record for actions",
-                options=selection_options,
-                key=f"table_selection_{self.config.get('table_id', 'default')}"
-            )
-            
-            if selected_display != "None":
-                # Find the selected item
-                for item in self.filtered_data:
-                    if self.config['selection_display'](item) == selected_display:
-                        return item
+        if selected_id is None:
+            return None
         
-        return None
+        selected_item = rows_by_id[selected_id]
+        if self.config.get('selection_display'):
+            st.caption(f"Selected: {self.config['selection_display'](selected_item)}")
+        return selected_item
     
     def render_actions(self, selected_item: Optional[Dict[str, Any]] = None):
         """Render action buttons"""
@@ -197,77 +296,145 @@ class DataTable:
                         if action.get('callback'):
                             action['callback'](selected_item)
     
-    def export_data(self, format_type: str = 'csv') -> str:
-        """Export filtered data"""
+    def export_data(self, format_type: str = 'csv') -> Union[str, bytes]:
+        """Export filtered data as CSV text, or Excel/Parquet bytes"""
         if not self.filtered_data:
             return ""
         
-        # Prepare export data
-        export_data = []
-        for item in self.filtered_data:
-            row = {}
-            for col_config in self.config['columns']:
-                key = col_config['key']
-                label = col_config['label']
-                value = item.get(key, '')
-                
-                # Apply export formatting if specified
-                if col_config.get('export_format'):
-                    value = col_config['export_format'](value)
-                
-                row[label] = value
-            export_data.append(row)
-        
-        df = pd.DataFrame(export_data)
+        columns = []
+        for col_config in self.config['columns']:
+            key = col_config['key']
+            export_format = col_config.get('export_format')
+            # Bind key and formatter now; the getters run while streaming rows
+            if export_format:
+                columns.append((col_config['label'], lambda item, k=key, f=export_format: f(item.get(k, ''))))
+            else:
+                columns.append((col_config['label'], lambda item, k=key: item.get(k, '')))
         
+        buffer = io.BytesIO()
+        write_export([self.filtered_data], columns, format_type, buffer)
         if format_type == 'csv':
-            return df.to_csv(index=False)
-        elif format_type == 'excel':
-            # For Excel export, you'd need to implement Excel writing
-            return df.to_csv(index=False)  # Fallback to CSV for now
-        
-        return ""
+            return buffer.getvalue().decode('utf-8')
+        return buffer.getvalue()
 
 
-def create_status_styler(status_colors: Dict[str, str]):
-    """Create a status styling function for table cells"""
-    def style_status(val):
-        return f"background-color: {status_colors.get(val, '#f8f9fa')}"
-    return style_status
+def _filter_fingerprint(data: List[Dict[str, Any]], table_config: Dict[str, Any]) -> int:
+    """Hash of every value the filter indexes read, in row order"""
+    fields = []
+    for filter_config in table_config.get('filters', []):
+        if filter_config['type'] == 'text_input':
+            fields.extend(filter_config.get('search_fields') or [filter_config.get('field', filter_config['key'])])
+        else:
+            fields.append(filter_config.get('field', filter_config['key']))
+    return hash(tuple(
+        tuple(_hashable(_field_value(item, field)) for field in fields) for item in data
+    ))
+
+
+def _hashable(value: Any) -> Hashable:
+    return repr(value) if isinstance(value, (list, dict, set)) else value
 
 
-def format_datetime(dt_string: str, format_string: str = "%Y-%m-%d %H:%M") -> str:
-    """Format datetime string for display"""
-    try:
-        if not dt_string:
-            return "N/A"
-        dt = datetime.fromisoformat(dt_string.replace('Z', '+00:00'))
-        return dt.strftime(format_string)
-    except:
-        return dt_string
+def get_data_table(data: List[Dict[str, Any]], table_config: Dict[str, Any]) -> DataTable:
+    """
+    The DataTable for table_config['table_id'], kept in session_state across reruns.
+
+    Its indexes and memoized filter results are reused while the filtered values are
+    unchanged, checked by fingerprinting them on each call. The rows themselves are
+    swapped in every time, so edits to other columns always show up.
+    """
+    key = f"_data_table_{table_config.get('table_id', 'default')}"
+    fingerprint = _filter_fingerprint(data, table_config)
+    table = st.session_state.get(key)
+    if table is None or table.fingerprint != fingerprint:
+        table = DataTable(data, table_config)
+        table.fingerprint = fingerprint
+        st.session_state[key] = table
+    else:
+        # Same filter values in the same order, so cached positions still point at the right rows
+        table.data = data
+        table.config = table_config
+    return table
 
 
-def format_date(date_string: str) -> str:
-    """Format date string for display"""
-    return format_datetime(date_string, "%Y-%m-%d")
+def index_rows_by_id(rows: List[Dict[str, Any]], id_key: str) -> Dict[Hashable, Dict[str, Any]]:
+    """Build an id -> row lookup so selected rows resolve in constant time"""
+    return {row[id_key]: row for row in rows}
 
 
-def format_days_ago(dt_string: str) -> str:
-    """Calculate and format days ago"""
-    try:
-        if not dt_string:
-            return "N/A"
-        dt = datetime.fromisoformat(dt_string.replace('Z', '+00:00'))
-        days = (datetime.now().replace(tzinfo=dt.tzinfo) - dt).days
-        
-        if days == 0:
-            return "Today"
-        elif days == 1:
-            return "Yesterday"
-        else:
-            return f"{days} days ago"
-    except:
-        return "Unknown"
+def render_selectable_dataframe(df, row_ids: List[Hashable], key: str, height: int = 400) -> Optional[Hashable]:
+    """
+    Render a single-row selectable dataframe and return the id of the selected row.
+    
+    Streamlit reports selections by row position, so positions are mapped back
+    through ``row_ids``. The widget key includes a fingerprint of the row ids,
+    which resets the selection whenever the underlying rows change instead of
+    letting a stale position point at a different record.
+    """
+    fingerprint = hashlib.md5("\x1f".join(map(str, row_ids)).encode()).hexdigest()[:12]
+    event = st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        height=height,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"{key}_{fingerprint}"
+    )
+    
+    selected_rows = event.selection.rows
+    if selected_rows and selected_rows[0] < len(row_ids):
+        return row_ids[selected_rows[0]]
+    return None
+
+
+def open_detail_panel(panel: str, row_id: str):
+    """Mark a detail panel as open for the given row"""
+    # A dict keeps the panels in the order they were opened, so they do not reshuffle between reruns
+    st.session_state.setdefault(f"open_{panel}", {})[row_id] = None
+
+
+def close_detail_panel(panel: str, row_id: str):
+    """Close the detail panel for the given row"""
+    st.session_state.setdefault(f"open_{panel}", {}).pop(row_id, None)
+
+
+def get_open_detail_panels(panel: str) -> List[str]:
+    """Return the row ids whose detail panel is currently open, in the order they were opened"""
+    return list(dict.fromkeys(st.session_state.get(f"open_{panel}", ())))
+
+
+def status_badge_series(series: pd.Series, badges: Dict[str, str]) -> pd.Series:
+    """
+    Render a status column as coloured badges without a per-cell callback.
+    
+    The column is converted to a categorical and only its categories are
+    renamed, so the work is proportional to the number of distinct statuses
+    rather than the number of rows, and the result serializes to Arrow as a
+    compact dictionary column.
+    """
+    categories = series.astype('category')
+    return categories.cat.rename_categories(lambda status: badges.get(status, status))
+
+
+def _build_category_styler(styling: List[Dict[str, Any]]) -> Callable:
+    """Build a table-wise Styler function that calls each style rule once per distinct value"""
+    def style_table(frame: pd.DataFrame) -> pd.DataFrame:
+        css = pd.DataFrame('', index=frame.index, columns=frame.columns)
+        for style_config in styling:
+            column = style_config['column']
+            values = frame[column]
+            css_by_value = {value: style_config['function'](value) for value in values.unique()}
+            css[column] = values.map(css_by_value)
+        return css
+    return style_table
+
+
+def create_status_styler(status_colors: Dict[str, str]):
+    """Create a status styling function for table cells"""
+    def style_status(val):
+        return f"background-color: {status_colors.get(val, '#f8f9fa')}"
+    return style_status
 
 
 def truncate_text(text: str, max_length: int = 50) -> str:
@@ -292,6 +459,8 @@ def create_metric_card(title: str, value: Any, delta: str = None, delta_color: s
 
 def render_chart_from_data(data: List[Dict[str, Any]], chart_config: Dict[str, Any]):
     """Render a chart from data using configuration"""
+    import plotly.express as px
+    
     if not data:
         st.info("No data available for chart")
         return
@@ -412,7 +581,8 @@ class TableBuilder:
             'columns': [],
             'filters': [],
             'actions': [],
-            'styling': []
+            'styling': [],
+            'badges': []
         }
     
     def add_column(self, key: str, label: str, format_func: Callable = None, export_format: Callable = None):
@@ -455,11 +625,20 @@ class TableBuilder:
         })
         return self
     
-    def enable_selection(self, display_function: Callable, info_fields: Dict[str, str] = None):
+    def add_status_badges(self, column: str, badges: Dict[str, str]):
+        """Render a column's values as badges (e.g. {'APPROVED': '🟢 APPROVED'})"""
+        self.config['badges'].append({
+            'column': column,
+            'badges': badges
+        })
+        return self
+    
+    def enable_selection(self, display_function: Callable, info_fields: Dict[str, str] = None, id_field: str = None):
         """Enable row selection"""
         self.config['enable_selection'] = True
         self.config['selection_display'] = display_function
         self.config['selection_info'] = info_fields or {}
+        self.config['selection_id_field'] = id_field
         return self
     
     def set_height(self, height: int):